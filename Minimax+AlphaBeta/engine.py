@@ -0,0 +1,398 @@
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+PLAYER = "X"
+AI = "O"  # The maximizing side
+
+ROWS, COLS = 5, 5
+WIN_LENGTH = 4
+TIME_LIMIT = 1.0  # Seconds the AI may think per move
+TT_SIZE = 1 << 18  # Transposition table slots
+WORKERS = 4
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+def build_windows(rows, cols, length):
+    """Every row, column and diagonal run of `length` cells, as tuples of (row, col)."""
+    windows = []
+    for row in range(rows):
+        for col in range(cols):
+            for d_row, d_col in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                end_row, end_col = row + d_row * (length - 1), col + d_col * (length - 1)
+                if 0 <= end_row < rows and 0 <= end_col < cols:
+                    windows.append(tuple((row + d_row * i, col + d_col * i) for i in range(length)))
+    return windows
+
+
+class AlphaBetaEngine:
+    """
+    Alpha-beta search for k-in-a-row on a rows x cols board, without any UI.
+
+    The engine owns its position: marks go on and off the board through
+    place_mark() and remove_mark(), which keep a Zobrist hash and, for every
+    window of win_length and win_length - 1 cells, how many cells each side
+    holds. Evaluation and win detection read those counts, so a node costs
+    O(windows through the last move) rather than a board scan.
+
+    search() deepens iteratively under a time limit, ordering moves by the
+    transposition table (PV move first), killer moves, history scores and
+    distance from the centre. The tables survive between moves of a game;
+    set_board() starts a new one.
+    """
+
+    def __init__(self, rows=ROWS, cols=COLS, win_length=WIN_LENGTH, tt_size=TT_SIZE):
+        self.rows = rows
+        self.cols = cols
+        self.win_length = win_length
+        self.tt_size = tt_size
+
+        self.windows = build_windows(rows, cols, win_length) + build_windows(rows, cols, win_length - 1)
+        self.cell_windows = [[[(index, len(window)) for index, window in enumerate(self.windows) if (row, col) in window]
+                              for col in range(cols)] for row in range(rows)]
+        # Larger than any evaluate() value, with room for the plies-left bonus
+        self.win_score = max(1000, 20 * len(self.windows))
+
+        # Zobrist hashing: one random key per (mark, cell), XOR-ed in and out as marks are placed and removed
+        rng = random.Random(0)
+        self.zobrist = {mark: [[rng.getrandbits(64) for _ in range(cols)] for _ in range(rows)] for mark in (PLAYER, AI)}
+        self.zobrist_ai_to_move = rng.getrandbits(64)
+
+        self.center_order = sorted(((row, col) for row in range(rows) for col in range(cols)),
+                                   key=lambda cell: abs(cell[0] - (rows - 1) / 2) + abs(cell[1] - (cols - 1) / 2))
+
+        self.board = [["" for _ in range(cols)] for _ in range(rows)]
+        self.deadline = float('inf')
+        self.nodes = 0
+        self.set_board()
+
+    # Position
+
+    def set_board(self, board=None, keep_tables=False):
+        """
+        Load a position (rows of "", PLAYER or AI; empty if None). The board
+        list is updated in place, so references to engine.board stay valid.
+        Unless keep_tables, the search tables are cleared for a new game.
+        """
+        marks = [row[:] for row in board] if board is not None else None
+        self.hash = 0
+        self.empty_count = self.rows * self.cols
+        self.window_counts = {mark: [0] * len(self.windows) for mark in (PLAYER, AI)}
+        self.full_windows = {mark: {self.win_length: 0, self.win_length - 1: 0} for mark in (PLAYER, AI)}
+        for row in self.board:
+            row[:] = [""] * self.cols
+        if marks is not None:
+            for row in range(self.rows):
+                for col in range(self.cols):
+                    if marks[row][col] != "":
+                        self.place_mark(row, col, marks[row][col])
+        if keep_tables:
+            self.search_age += 1
+        else:
+            self.clear_search_tables()
+
+    def clear_search_tables(self):
+        self.transposition_table = [None] * self.tt_size
+        self.search_age = 0
+        self.killers = {}  # Empty cell count (i.e. the ply) -> up to two moves that caused a cutoff there
+        self.history = {mark: [[0] * self.cols for _ in range(self.rows)] for mark in (PLAYER, AI)}
+
+    def place_mark(self, row, col, mark):
+        self.board[row][col] = mark
+        self.hash ^= self.zobrist[mark][row][col]
+        self.empty_count -= 1
+        counts = self.window_counts[mark]
+        full = self.full_windows[mark]
+        for index, length in self.cell_windows[row][col]:
+            counts[index] += 1
+            if counts[index] == length:
+                full[length] += 1
+
+    def remove_mark(self, row, col):
+        mark = self.board[row][col]
+        self.hash ^= self.zobrist[mark][row][col]
+        self.board[row][col] = ""
+        self.empty_count += 1
+        counts = self.window_counts[mark]
+        full = self.full_windows[mark]
+        for index, length in self.cell_windows[row][col]:
+            if counts[index] == length:
+                full[length] -= 1
+            counts[index] -= 1
+
+    def empty_cells(self):
+        return [(row, col) for row in range(self.rows) for col in range(self.cols) if self.board[row][col] == ""]
+
+    def is_winner(self, player):
+        return self.full_windows[player][self.win_length] > 0
+
+    def is_full(self):
+        return self.empty_count == 0
+
+    def evaluate(self):
+        """Full windows of win_length (10 each) and win_length - 1 (5 each) cells, AI minus PLAYER."""
+        ai, player = self.full_windows[AI], self.full_windows[PLAYER]
+        return ((ai[self.win_length] - player[self.win_length]) * 10
+                + (ai[self.win_length - 1] - player[self.win_length - 1]) * 5)
+
+    # Search tables
+
+    def position_key(self, is_maximizing):
+        return self.hash ^ self.zobrist_ai_to_move if is_maximizing else self.hash
+
+    def tt_probe(self, key):
+        entry = self.transposition_table[key % self.tt_size]
+        if entry is not None and entry[0] == key:
+            return entry
+        return None
+
+    def tt_store(self, key, depth, flag, value, best_move):
+        """Keep the deeper search of a slot, unless the stored one is left over from an earlier move."""
+        index = key % self.tt_size
+        entry = self.transposition_table[index]
+        if entry is None or entry[0] == key or entry[5] != self.search_age or depth >= entry[1]:
+            self.transposition_table[index] = (key, depth, flag, value, best_move, self.search_age)
+
+    def to_tt_score(self, value, depth):
+        # Win scores count the plies left at the win; store them relative to this node instead
+        if value > self.win_score // 2:
+            return value - depth
+        if value < -self.win_score // 2:
+            return value + depth
+        return value
+
+    def from_tt_score(self, value, depth):
+        if value > self.win_score // 2:
+            return value + depth
+        if value < -self.win_score // 2:
+            return value - depth
+        return value
+
+    def ordered_moves(self, mark, hash_move=None):
+        """Empty cells, best first: the hash (PV) move, the killers, then by history score, centre first on ties."""
+        board = self.board
+        moves = [cell for cell in self.center_order if board[cell[0]][cell[1]] == ""]
+        scores = self.history[mark]
+        moves.sort(key=lambda cell: scores[cell[0]][cell[1]], reverse=True)
+        for move in reversed([hash_move] + self.killers.get(len(moves), [])):
+            if move in moves:
+                moves.remove(move)
+                moves.insert(0, move)
+        return moves
+
+    def record_cutoff(self, move, mark, depth, empty_cells):
+        ply_killers = self.killers.setdefault(empty_cells, [])
+        if move not in ply_killers:
+            ply_killers.insert(0, move)
+            del ply_killers[2:]
+        self.history[mark][move[0]][move[1]] += depth * depth
+
+    # Search
+
+    def minimax(self, depth, alpha, beta, is_maximizing):
+        """Alpha-beta value of the current position, `depth` plies deep, from the AI's point of view."""
+        self.nodes += 1
+        if self.nodes & 255 == 0 and time.perf_counter() > self.deadline:
+            raise SearchTimeout
+
+        if self.is_winner(AI):
+            return self.win_score + depth  # Faster wins score higher
+        if self.is_winner(PLAYER):
+            return -self.win_score - depth
+        if self.empty_count == 0 or depth == 0:
+            return self.evaluate()
+
+        key = self.position_key(is_maximizing)
+        alpha_original = alpha
+        entry = self.tt_probe(key)
+        hash_move = None
+        if entry is not None:
+            hash_move = entry[4]
+            if entry[1] >= depth:
+                value = self.from_tt_score(entry[3], depth)
+                if entry[2] == EXACT:
+                    return value
+                if entry[2] == LOWER:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if beta <= alpha:
+                    return value
+
+        best_move = None
+        if is_maximizing:
+            best_eval = float('-inf')
+            moves = self.ordered_moves(AI, hash_move)
+            for row, col in moves:
+                self.place_mark(row, col, AI)
+                evaluation = self.minimax(depth - 1, alpha, beta, False)
+                self.remove_mark(row, col)
+                if evaluation > best_eval:
+                    best_eval, best_move = evaluation, (row, col)
+                alpha = max(alpha, evaluation)
+                if beta <= alpha:
+                    self.record_cutoff((row, col), AI, depth, len(moves))
+                    break
+        else:
+            best_eval = float('inf')
+            moves = self.ordered_moves(PLAYER, hash_move)
+            for row, col in moves:
+                self.place_mark(row, col, PLAYER)
+                evaluation = self.minimax(depth - 1, alpha, beta, True)
+                self.remove_mark(row, col)
+                if evaluation < best_eval:
+                    best_eval, best_move = evaluation, (row, col)
+                beta = min(beta, evaluation)
+                if beta <= alpha:
+                    self.record_cutoff((row, col), PLAYER, depth, len(moves))
+                    break
+
+        if best_eval <= alpha_original:
+            flag = UPPER
+        elif best_eval >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.tt_store(key, depth, flag, self.to_tt_score(best_eval, depth), best_move)
+        return best_eval
+
+    def search_root(self, depth, moves=None):
+        """
+        One fixed-depth search of the AI's moves (all of them, or `moves`);
+        returns (best score, best move).
+        """
+        best_score = float('-inf')
+        best_move = None
+
+        key = self.position_key(True)
+        if moves is None:
+            entry = self.tt_probe(key)
+            moves = self.ordered_moves(AI, entry[4] if entry else None)
+        for row, col in moves:
+            self.place_mark(row, col, AI)
+            # Moves that cannot beat the best so far only need to be proven worse
+            score = self.minimax(depth - 1, best_score, float('inf'), False)
+            self.remove_mark(row, col)
+            if score > best_score:
+                best_score = score
+                best_move = (row, col)
+        return best_score, best_move
+
+    def _iterate(self, depth, deadline):
+        """One iteration of search(): (score, move), or None if the deadline passed first."""
+        snapshot = [row[:] for row in self.board]  # A timeout leaves the trial moves on the board
+        self.deadline = deadline
+        try:
+            score, move = self.search_root(depth)
+        except SearchTimeout:
+            for row in range(self.rows):
+                for col in range(self.cols):
+                    if snapshot[row][col] == "" and self.board[row][col] != "":
+                        self.remove_mark(row, col)
+            return None
+        finally:
+            self.deadline = float('inf')
+        self.tt_store(self.position_key(True), depth, EXACT, self.to_tt_score(score, depth), move)
+        return score, move
+
+    def search(self, time_limit=TIME_LIMIT, max_depth=None):
+        """
+        Iterative deepening from the current board with the AI to move.
+
+        Searches depth 1, 2, ... until time_limit seconds have passed (None
+        for no limit), max_depth (None for the whole game) is reached or the
+        result is a forced win or loss. Each iteration orders moves by what
+        the previous ones left in the transposition, killer and history
+        tables. Returns (best move, score, depth) of the deepest completed
+        iteration; an interrupted iteration is thrown away.
+        """
+        self.search_age += 1  # The table is kept between moves; older entries become replaceable
+        self.killers.clear()
+        for scores in self.history.values():
+            for row in scores:
+                row[:] = [score // 2 for score in row]
+
+        start = time.perf_counter()
+        best_move, best_score, completed = None, None, 0
+        self.nodes = 0
+        last_depth = self.empty_count if max_depth is None else min(max_depth, self.empty_count)
+        for depth in range(1, last_depth + 1):
+            # The first iteration always completes, so there is always a move to play
+            deadline = start + time_limit if time_limit is not None and depth > 1 else float('inf')
+            result = self._iterate(depth, deadline)
+            if result is None:
+                break
+            best_score, best_move = result
+            completed = depth
+            if abs(best_score) > self.win_score // 2:
+                break  # Forced result: searching deeper cannot change it
+        return best_move, best_score, completed
+
+
+_worker_engines = {}
+
+
+def search_moves(shape, board, moves, depth, time_limit):
+    """
+    (score, move, nodes) of the best of `moves` searched `depth` plies deep
+    from board, or None if time_limit seconds ran out (a process pool task).
+    Each worker keeps one engine per board shape, so its tables carry over
+    between iterations and moves.
+    """
+    engine = _worker_engines.get(shape)
+    if engine is None:
+        engine = _worker_engines[shape] = AlphaBetaEngine(*shape)
+    engine.set_board(board, keep_tables=True)
+    engine.nodes = 0
+    engine.deadline = time.perf_counter() + time_limit if time_limit is not None else float('inf')
+    try:
+        score, move = engine.search_root(depth, moves)
+    except SearchTimeout:
+        return None
+    finally:
+        engine.deadline = float('inf')
+    return score, move, engine.nodes
+
+
+class ParallelAlphaBetaEngine(AlphaBetaEngine):
+    """
+    AlphaBetaEngine whose iterations split the root moves over a process pool.
+
+    The root moves, in this engine's order, are dealt round-robin to the
+    workers, so each gets a share of the promising ones; every worker
+    searches its share with its own alpha bound and its own tables, and
+    the best reply over all shares is the move. An iteration counts only
+    if every worker finished it in time.
+    """
+
+    def __init__(self, rows=ROWS, cols=COLS, win_length=WIN_LENGTH, tt_size=TT_SIZE, workers=WORKERS):
+        super(ParallelAlphaBetaEngine, self).__init__(rows, cols, win_length, tt_size)
+        self.workers = workers
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+
+    def _iterate(self, depth, deadline):
+        key = self.position_key(True)
+        entry = self.tt_probe(key)
+        moves = self.ordered_moves(AI, entry[4] if entry else None)
+        time_limit = None if deadline == float('inf') else deadline - time.perf_counter()
+        if time_limit is not None and time_limit <= 0:
+            return None
+        shape = (self.rows, self.cols, self.win_length, self.tt_size)
+        futures = [self.pool.submit(search_moves, shape, self.board, moves[i::self.workers], depth, time_limit)
+                   for i in range(min(self.workers, len(moves)))]
+        results = [future.result() for future in futures]
+        if None in results:
+            return None
+        self.nodes += sum(nodes for _, _, nodes in results)
+        # Ties go to the move that comes first in `moves`, as in the serial search
+        score, move, _ = max(results, key=lambda result: (result[0], -moves.index(result[1])))
+        self.tt_store(key, depth, EXACT, self.to_tt_score(score, depth), move)
+        return score, move
+
+    def close(self):
+        self.pool.shutdown()
@@ -1,8 +1,8 @@
 import pygame
 import sys
-import math
+import time
 
-pygame.init()
+from engine import AI, PLAYER, TIME_LIMIT, AlphaBetaEngine, ParallelAlphaBetaEngine
 
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -15,20 +15,30 @@ WIDTH = CELL_SIZE * COLS
 HEIGHT = CELL_SIZE * ROWS + 100  # Extra space for scoreboard
 LINE_WIDTH = 5
 MARKER_WIDTH = 15
-SCREEN = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("5x5 Tic-Tac-Toe with AI")
-SCREEN.fill(WHITE)
 
-board = [["" for _ in range(COLS)] for _ in range(ROWS)]
-FONT = pygame.font.Font(None, 80)
-BUTTON_FONT = pygame.font.Font(None, 40)
+# The window, fonts and engine are created by main(), so importing this file (as process
+# pool workers do under the spawn start method) opens no window
+SCREEN = None
+FONT = None
+BUTTON_FONT = None
 
-PLAYER = "X"
-AI = "O"
 player_score = 0
 ai_score = 0
 
 WIN_LENGTH = 4  # Change to 3 if needed
+engine = None  # Owns the board; this file only draws it
+time_limit = TIME_LIMIT
+
+
+def init_display():
+    global SCREEN, FONT, BUTTON_FONT
+    pygame.init()
+    SCREEN = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("5x5 Tic-Tac-Toe with AI")
+    SCREEN.fill(WHITE)
+    FONT = pygame.font.Font(None, 80)
+    BUTTON_FONT = pygame.font.Font(None, 40)
+
 
 def draw_lines():
     for row in range(1, ROWS):
@@ -54,137 +64,43 @@ def display_score():
                                 feedback_y_start + (feedback_height - feedback_text.get_height()) // 2))
 
 
-def count_sequences(player, length):
-    count = 0
-    for row in range(ROWS):
-        for col in range(COLS - length + 1):
-            if all(board[row][col + i] == player for i in range(length)):
-                count += 1
-    for col in range(COLS):
-        for row in range(ROWS - length + 1):
-            if all(board[row + i][col] == player for i in range(length)):
-                count += 1
-    for row in range(ROWS - length + 1):
-        for col in range(COLS - length + 1):
-            if all(board[row + i][col + i] == player for i in range(length)):
-                count += 1
-        for col in range(length - 1, COLS):
-            if all(board[row + i][col - i] == player for i in range(length)):
-                count += 1
-    return count
-
-
 def draw_board():
     for row in range(ROWS):
         for col in range(COLS):
-            if board[row][col] == PLAYER:
+            if engine.board[row][col] == PLAYER:
                 pygame.draw.line(SCREEN, RED,
                                  (col * CELL_SIZE + MARKER_WIDTH, row * CELL_SIZE + MARKER_WIDTH),
                                  ((col + 1) * CELL_SIZE - MARKER_WIDTH, (row + 1) * CELL_SIZE - MARKER_WIDTH), LINE_WIDTH)
                 pygame.draw.line(SCREEN, RED,
                                  (col * CELL_SIZE + MARKER_WIDTH, (row + 1) * CELL_SIZE - MARKER_WIDTH),
                                  ((col + 1) * CELL_SIZE - MARKER_WIDTH, row * CELL_SIZE + MARKER_WIDTH), LINE_WIDTH)
-            elif board[row][col] == AI:
+            elif engine.board[row][col] == AI:
                 pygame.draw.circle(SCREEN, BLUE,
                                    (col * CELL_SIZE + CELL_SIZE // 2, row * CELL_SIZE + CELL_SIZE // 2),
                                    CELL_SIZE // 3, LINE_WIDTH)
 
 
 def is_winner(player):
-    for row in range(ROWS):
-        for col in range(COLS - WIN_LENGTH + 1):
-            if all(board[row][col + i] == player for i in range(WIN_LENGTH)):
-                return True
-    for col in range(COLS):
-        for row in range(ROWS - WIN_LENGTH + 1):
-            if all(board[row + i][col] == player for i in range(WIN_LENGTH)):
-                return True
-    for row in range(ROWS - WIN_LENGTH + 1):
-        for col in range(COLS - WIN_LENGTH + 1):
-            if all(board[row + i][col + i] == player for i in range(WIN_LENGTH)):
-                return True
-        for col in range(WIN_LENGTH - 1, COLS):
-            if all(board[row + i][col - i] == player for i in range(WIN_LENGTH)):
-                return True
-    return False
-
-
-def is_full():
-    return all(cell != "" for row in board for cell in row)
+    return engine.is_winner(player)
 
 
 def reset_board():
-    global board
-    board = [["" for _ in range(COLS)] for _ in range(ROWS)]
+    engine.set_board()
     print("Board reset. Starting new game.")
 
 
-def evaluate_board():
-    ai_score = count_sequences(AI, WIN_LENGTH) * 10 + count_sequences(AI, WIN_LENGTH - 1) * 5
-    player_score = count_sequences(PLAYER, WIN_LENGTH) * 10 + count_sequences(PLAYER, WIN_LENGTH - 1) * 5
-    return ai_score - player_score
-
-
-def minimax(board, depth, alpha, beta, is_maximizing):
-    if is_winner(AI):
-        return 100 - depth  # Daha hızlı kazanmak daha iyidir
-    if is_winner(PLAYER):
-        return -100 + depth  # Daha hızlı kaybetmek daha kötüdür
-    if is_full() or depth == 0:  # Derinlik sınırı veya beraberlik
-        return evaluate_board()
-
-    # Maximizing AI
-    if is_maximizing:
-        max_eval = float('-inf')
-        for row in range(ROWS):
-            for col in range(COLS):
-                if board[row][col] == "":
-                    board[row][col] = AI
-                    evaluation = minimax(board, depth - 1, alpha, beta, False)
-                    board[row][col] = ""  # Hamleyi geri al
-                    max_eval = max(max_eval, evaluation)
-                    alpha = max(alpha, evaluation)
-                    if beta <= alpha:
-                        break  # Budama
-        return max_eval
-
-    else:
-        min_eval = float('inf')
-        for row in range(ROWS):
-            for col in range(COLS):
-                if board[row][col] == "":
-                    board[row][col] = PLAYER
-                    evaluation = minimax(board, depth - 1, alpha, beta, True)
-                    board[row][col] = ""  # Hamleyi geri al
-                    min_eval = min(min_eval, evaluation)
-                    beta = min(beta, evaluation)
-                    if beta <= alpha:
-                        break  # Budama
-        return min_eval
-
-
 def ai_move():
 
     print("AI is thinking...")
-    best_score = float('-inf')
-    best_move = None
-
-    for row in range(ROWS):
-        for col in range(COLS):
-            if board[row][col] == "":
-                board[row][col] = AI  # Deneme hamlesi
-                score = minimax(board, depth=3, alpha=float('-inf'), beta=float('inf'), is_maximizing=False)
-                board[row][col] = ""  # Hamleyi geri al
-                if score > best_score:
-                    best_score = score
-                    best_move = (row, col)
+    start = time.perf_counter()
+    best_move, best_score, depth = engine.search(time_limit)
 
     if best_move:
-        board[best_move[0]][best_move[1]] = AI
-        print(f"AI places at {best_move}. Best score: {best_score}")
+        engine.place_mark(best_move[0], best_move[1], AI)
+        print(f"AI places at {best_move}. Best score: {best_score} "
+              f"(depth {depth}, {engine.nodes} nodes, {time.perf_counter() - start:.2f}s)")
     else:
         print("No valid moves for AI!")
-    print(f"AI places at {best_move}. Best score: {best_score}")
 
 
 
@@ -237,7 +153,22 @@ def game_over():
 
 
 
-def main():
+def main(workers=0, search_time=TIME_LIMIT):
+    global engine, time_limit
+    time_limit = search_time
+    if workers > 0:
+        engine = ParallelAlphaBetaEngine(ROWS, COLS, WIN_LENGTH, workers=workers)
+    else:
+        engine = AlphaBetaEngine(ROWS, COLS, WIN_LENGTH)
+    init_display()
+    try:
+        play()
+    finally:
+        if workers > 0:
+            engine.close()
+
+
+def play():
     global player_score, ai_score, feedback_message
     game_over_flag = False
 
@@ -253,8 +184,8 @@ def main():
                     clicked_row = mouse_y // CELL_SIZE
                     clicked_col = mouse_x // CELL_SIZE
 
-                    if clicked_row < ROWS and board[clicked_row][clicked_col] == "":
-                        board[clicked_row][clicked_col] = PLAYER
+                    if clicked_row < ROWS and engine.board[clicked_row][clicked_col] == "":
+                        engine.place_mark(clicked_row, clicked_col, PLAYER)
                         feedback_message = "AI is thinking..."
                         if is_winner(PLAYER):
                             player_score += 1
@@ -282,4 +213,10 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="5x5 four-in-a-row against alpha-beta search.")
+    parser.add_argument("--workers", type=int, default=0, help="Search processes (0 searches in this process)")
+    parser.add_argument("--time-limit", type=float, default=TIME_LIMIT, help="AI thinking time per move (seconds)")
+    args = parser.parse_args()
+    main(args.workers, args.time_limit)
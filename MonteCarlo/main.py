@@ -1,125 +1,584 @@
+import math
+import queue
 import random
-import copy
+import threading
+import time
 import tkinter as tk
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor
 
 
 BOARD_SIZE = 5
 WINNING_LENGTH = 4
-SIMULATIONS = 300 
+PLAYOUTS = 2000     # UCT playouts per AI move (the old flat search used 300 per legal move)
+EXPLORATION = 1.4   # UCT exploration constant; sqrt(2) is the textbook value for 0..1 rewards
+WORKERS = 4         # Processes for ParallelMonteCarloTreeSearch
+ROLLOUT_CHUNK = 16  # Rollouts per leaf-parallel task (amortizes inter-process overhead)
+THINK_TIME_MS = 1000     # Default AI thinking time per move in the GUI
+THINK_SLICE = 64         # Playouts between budget checks and best-move-so-far updates
+PONDER_LIMIT = 200000    # Root visits beyond which pondering stops growing the tree
+POLL_MS = 30             # How often the Tk loop picks up search progress
+
+PLAYERS = ("X", "O")
+
+
+def build_lines(board_size, length):
+    """Bitmask (bit row * board_size + col) of every run of `length` cells in a row, column or diagonal."""
+    lines = []
+    for row in range(board_size):
+        for col in range(board_size):
+            for d_row, d_col in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                end_row, end_col = row + (length - 1) * d_row, col + (length - 1) * d_col
+                if 0 <= end_row < board_size and 0 <= end_col < board_size:
+                    lines.append(sum(1 << (row + i * d_row) * board_size + col + i * d_col for i in range(length)))
+    return lines
+
+
+LINES = build_lines(BOARD_SIZE, WINNING_LENGTH)
+LINES_THROUGH = [tuple(line for line in LINES if line >> cell & 1) for cell in range(BOARD_SIZE * BOARD_SIZE)]
+
 
 class GameState:
+    """
+    Position as one bitboard per player, the list of empty cells and the
+    winner, all kept up to date move by move.
+
+    A new win can only be on a line through the last move, so play() tests
+    just the precomputed LINES_THROUGH that cell. clone() copies two ints
+    and a list of at most 25 cells.
+    """
+
+    __slots__ = ('bits', 'empty', 'player', 'winner')
+
     def __init__(self):
-        self.board = [["" for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
-        self.current_player = "X"
+        self.bits = [0, 0]
+        self.empty = list(range(BOARD_SIZE * BOARD_SIZE))
+        self.player = 0  # Index in PLAYERS of the side to move
+        self.winner = None
+
+    @classmethod
+    def from_board(cls, board, current_player="X"):
+        """State for a grid of "X", "O" and anything else for empty (e.g. "" or ".")."""
+        state = cls()
+        for row, line in enumerate(board):
+            for col, mark in enumerate(line):
+                if mark in PLAYERS:
+                    state.player = PLAYERS.index(mark)
+                    state.play(row * BOARD_SIZE + col)
+        state.current_player = current_player
+        return state
+
+    @property
+    def current_player(self):
+        return PLAYERS[self.player]
+
+    @current_player.setter
+    def current_player(self, mark):
+        self.player = PLAYERS.index(mark)
+
+    @property
+    def board(self):
+        """The position as nested lists of "X", "O" and "" (a fresh copy)."""
+        return [[self.mark(row * BOARD_SIZE + col) for col in range(BOARD_SIZE)] for row in range(BOARD_SIZE)]
+
+    def mark(self, cell):
+        for player, bits in zip(PLAYERS, self.bits):
+            if bits >> cell & 1:
+                return player
+        return ""
+
+    def key(self):
+        return self.bits[0], self.bits[1], self.player
 
     def is_valid_move(self, row, col):
-        return 0 <= row < BOARD_SIZE and 0 <= col < BOARD_SIZE and self.board[row][col] == ""
+        return 0 <= row < BOARD_SIZE and 0 <= col < BOARD_SIZE and \
+            not (self.bits[0] | self.bits[1]) >> (row * BOARD_SIZE + col) & 1
 
     def make_move(self, row, col):
         if self.is_valid_move(row, col):
-            self.board[row][col] = self.current_player
-            self.current_player = "O" if self.current_player == "X" else "X"
+            self.play(row * BOARD_SIZE + col)
             return True
         return False
 
-    def check_winner(self):
-    
-        for row in range(BOARD_SIZE):
-            for col in range(BOARD_SIZE):
-                if self.check_line(row, col, 1, 0) or self.check_line(row, col, 0, 1) or \
-                   self.check_line(row, col, 1, 1) or self.check_line(row, col, 1, -1):
-                    return self.board[row][col]
-        return None
+    def play(self, cell):
+        """Play an empty cell (row * BOARD_SIZE + col) for the side to move."""
+        self.play_index(self.empty.index(cell))
 
-    def check_line(self, row, col, d_row, d_col):
-        start = self.board[row][col]
-        if start == "":
-            return False
-        for i in range(1, WINNING_LENGTH):
-            r, c = row + i * d_row, col + i * d_col
-            if r < 0 or r >= BOARD_SIZE or c < 0 or c >= BOARD_SIZE or self.board[r][c] != start:
-                return False
-        return True
+    def play_index(self, index):
+        """Play self.empty[index]; the fast path for random playouts."""
+        empty = self.empty
+        cell = empty[index]
+        empty[index] = empty[-1]
+        empty.pop()
+        bits = self.bits[self.player] | 1 << cell
+        self.bits[self.player] = bits
+        if self.winner is None:
+            for line in LINES_THROUGH[cell]:
+                if bits & line == line:
+                    self.winner = PLAYERS[self.player]
+                    break
+        self.player ^= 1
+
+    def check_winner(self):
+        return self.winner
 
     def get_available_moves(self):
-        return [(r, c) for r in range(BOARD_SIZE) for c in range(BOARD_SIZE) if self.is_valid_move(r, c)]
+        return [divmod(cell, BOARD_SIZE) for cell in sorted(self.empty)]
 
     def clone(self):
-        new_state = GameState()
-        new_state.board = copy.deepcopy(self.board)
-        new_state.current_player = self.current_player
+        new_state = GameState.__new__(GameState)
+        new_state.bits = self.bits[:]
+        new_state.empty = self.empty[:]
+        new_state.player = self.player
+        new_state.winner = self.winner
         return new_state
 
 def simulate_game(state):
     current_state = state.clone()
     depth = 0
-    while not current_state.check_winner() and current_state.get_available_moves() and depth < 20:
-        move = random.choice(current_state.get_available_moves())
-        current_state.make_move(*move)
+    while current_state.winner is None and current_state.empty and depth < 20:
+        current_state.play_index(random.randrange(len(current_state.empty)))
         depth += 1
-    return 1 if current_state.check_winner() == "O" else 0
+    return 1 if current_state.winner == "O" else 0
+
+class Node:
+    """A position in the search tree, reached by `player` playing `move`."""
+
+    __slots__ = ('move', 'parent', 'player', 'children', 'untried', 'visits', 'score')
+
+    def __init__(self, move, parent, player, moves):
+        self.move = move
+        self.parent = parent
+        self.player = player
+        self.children = []
+        self.untried = moves
+        self.visits = 0
+        self.score = 0.0  # Playout results from `player`'s point of view: win 1, draw 0.5
+
+    def select_child(self, exploration):
+        log_visits = math.log(self.visits)
+        return max(self.children,
+                   key=lambda child: child.score / child.visits + exploration * math.sqrt(log_visits / child.visits))
+
+
+class MonteCarloTreeSearch:
+    """
+    UCT search: selection by UCB1, one node expanded per playout, a random
+    playout to the end of the game and backpropagation of the result.
+
+    The tree is kept between moves: advance() moves the root to the child of
+    the move that was actually played, so a search continues from the
+    statistics gathered on earlier turns.
+    """
+
+    def __init__(self, exploration=EXPLORATION, seed=None):
+        self.exploration = exploration
+        self.random = random.Random(seed)
+        self.think_slice = THINK_SLICE
+        self.root = None
+        self.root_state = None
+
+    def reset(self):
+        """Forget the tree, e.g. for a new game."""
+        self.root = None
+        self.root_state = None
+
+    def _new_root(self, state):
+        self.root_state = state.clone()
+        moves = [] if state.check_winner() else state.get_available_moves()
+        self.root = Node(None, None, None, moves)
+
+    def advance(self, move):
+        """Move the root to the subtree of a played move, dropping the rest of the tree."""
+        if self.root is None:
+            return
+        self.root_state.make_move(*move)
+        for child in self.root.children:
+            if child.move == move:
+                child.parent = None
+                self.root = child
+                return
+        self._new_root(self.root_state)
+
+    def _sync_root(self, state):
+        """Keep the tree if it is rooted at state, otherwise start a new one there."""
+        if self.root is None or self.root_state.key() != state.key():
+            self._new_root(state)
+
+    def search(self, state, playouts=PLAYOUTS):
+        """Best move for state.current_player after `playouts` more playouts."""
+        self._sync_root(state)
+        self._run_playouts(playouts)
+        return self.best_move()
+
+    def think(self, state, time_ms=None, playouts=None, on_progress=None, should_stop=None):
+        """
+        Anytime search: run playouts in slices of think_slice until time_ms
+        milliseconds have passed or `playouts` playouts were run (whichever
+        comes first), or should_stop() returns True. After every slice
+        on_progress(best_move, playouts_so_far, elapsed_ms) is called.
+        Returns the best move found.
+        """
+        if time_ms is None and playouts is None and should_stop is None:
+            raise ValueError("think() needs a time budget, a playout budget or should_stop")
+        self._sync_root(state)
+        start = time.perf_counter()
+        done = 0
+        while self.root.untried or self.root.children:
+            count = self.think_slice if playouts is None else min(self.think_slice, playouts - done)
+            if count <= 0:
+                break
+            self._run_playouts(count)
+            done += count
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if on_progress is not None:
+                on_progress(self.best_move(), done, elapsed_ms)
+            if time_ms is not None and elapsed_ms >= time_ms:
+                break
+            if should_stop is not None and should_stop():
+                break
+        return self.best_move()
+
+    def _run_playouts(self, playouts):
+        for _ in range(playouts):
+            self.playout()
+
+    def best_move(self):
+        if not self.root.children:
+            return None
+        return max(self.root.children, key=lambda child: child.visits).move
+
+    def playout(self):
+        node, state = self.select_and_expand()
+        self.backpropagate(node, {rollout(state, self.random): 1})
+
+    def select_and_expand(self, virtual_visits=0):
+        """
+        Descend by UCB1 and expand one untried move; returns the new leaf and its position.
+
+        virtual_visits are added along the path right away (a virtual loss),
+        steering the next selections of a leaf-parallel wave to other leaves.
+        """
+        node, state = self.root, self.root_state.clone()
+        node.visits += virtual_visits
 
-def monte_carlo_tree_search(state):
-    moves = state.get_available_moves()
-    if not moves:
+        # Selection: descend through fully expanded nodes
+        while not node.untried and node.children:
+            node = node.select_child(self.exploration)
+            state.make_move(*node.move)
+            node.visits += virtual_visits
+
+        # Expansion: add one untried move
+        if node.untried:
+            move = node.untried.pop(self.random.randrange(len(node.untried)))
+            player = state.current_player
+            state.make_move(*move)
+            moves = [] if state.check_winner() else state.get_available_moves()
+            child = Node(move, node, player, moves)
+            child.visits = virtual_visits
+            node.children.append(child)
+            node = child
+        return node, state
+
+    def backpropagate(self, node, winners, counted=False):
+        """Add playout results ({winner or None: count}) from node up to the root."""
+        playouts = sum(winners.values())
+        while node is not None:
+            if not counted:
+                node.visits += playouts
+            node.score += winners.get(node.player, 0) + 0.5 * winners.get(None, 0)
+            node = node.parent
+
+
+def rollout(state, rng=random):
+    """Play random moves to the end of the game; returns the winner or None for a draw."""
+    empty = state.empty
+    while state.winner is None and empty:
+        state.play_index(rng.randrange(len(empty)))
+    return state.winner
+
+
+def rollout_batch(state, count, seed):
+    """{winner or None: count} over `count` seeded playouts from state (a process pool task)."""
+    rng = random.Random(seed)
+    winners = {}
+    for _ in range(count):
+        winner = rollout(state.clone(), rng)
+        winners[winner] = winners.get(winner, 0) + 1
+    return winners
+
+
+def root_search(state, playouts, seed, exploration):
+    """
+    An independent UCT search (a process pool task); returns
+    {move: (visits, score, {reply: (visits, score)})} at the root.
+    """
+    engine = MonteCarloTreeSearch(exploration, seed)
+    engine.search(state, playouts)
+    return {child.move: (child.visits, child.score,
+                         {reply.move: (reply.visits, reply.score) for reply in child.children})
+            for child in engine.root.children}
+
+
+def add_totals(totals, move, visits, score):
+    total_visits, total_score = totals.get(move, (0, 0.0))
+    totals[move] = (total_visits + visits, total_score + score)
+
+
+class ParallelMonteCarloTreeSearch(MonteCarloTreeSearch):
+    """
+    UCT search with rollouts spread over a process pool.
+
+    'root' parallelism: every worker grows its own tree from the current
+    position with its own seed, and the root visit counts are summed to pick
+    the move. The workers' counts one ply further down are summed too, so
+    advance() keeps the statistics of the move played. 'leaf' parallelism: this process keeps a single tree (reused
+    between moves like the serial search) and selects one leaf per worker
+    per wave, using virtual losses, and each worker plays a chunk of
+    `chunk` rollouts from its leaf.
+
+    Processes avoid the GIL, so playouts per second scale with cores. Worker
+    seeds come from the search seed and a task counter, and results are
+    applied in submission order, so a seeded search is reproducible
+    whatever the timing.
+    """
+
+    def __init__(self, workers=WORKERS, mode='root', chunk=ROLLOUT_CHUNK, exploration=EXPLORATION, seed=None):
+        if mode not in ('root', 'leaf'):
+            raise ValueError(f"Unknown parallel mode: {mode!r}")
+        super(ParallelMonteCarloTreeSearch, self).__init__(exploration, seed)
+        self.workers = workers
+        self.mode = mode
+        self.chunk = chunk
+        self.seed = self.random.randrange(2 ** 32) if seed is None else seed
+        self.tasks = 0
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+        if mode == 'root':
+            # Every slice grows fresh worker trees, which must not be too small to be useful
+            self.think_slice = 8 * THINK_SLICE * workers
+
+    def _task_seed(self):
+        self.tasks += 1
+        return self.seed * 1000003 + self.tasks
+
+    def _new_root(self, state):
+        super(ParallelMonteCarloTreeSearch, self)._new_root(state)
+        self.root_totals = {}  # Root parallelism: {move: (visits, score)} summed over the worker trees
+        self.reply_totals = {}  # {move: {reply: (visits, score)}}, likewise
+
+    def advance(self, move):
+        if self.mode == 'leaf' or self.root is None:
+            super(ParallelMonteCarloTreeSearch, self).advance(move)
+            return
+        visits = self.root_totals.get(move, (0, 0.0))[0]
+        replies = self.reply_totals.get(move, {})
+        self.root_state.make_move(*move)
+        self._new_root(self.root_state)
+        self.root_totals = replies
+        self.root.visits = visits
+
+    def best_move(self):
+        if self.mode == 'leaf':
+            return super(ParallelMonteCarloTreeSearch, self).best_move()
+        if not self.root_totals:
+            return None
+        return max(self.root_totals, key=lambda move: self.root_totals[move][0])
+
+    def _run_playouts(self, playouts):
+        if self.mode == 'root':
+            shares = [playouts // self.workers + (i < playouts % self.workers) for i in range(self.workers)]
+            futures = [self.pool.submit(root_search, self.root_state, share, self._task_seed(), self.exploration)
+                       for share in shares if share]
+            for future in futures:
+                for move, (visits, score, replies) in future.result().items():
+                    add_totals(self.root_totals, move, visits, score)
+                    reply_totals = self.reply_totals.setdefault(move, {})
+                    for reply, (reply_visits, reply_score) in replies.items():
+                        add_totals(reply_totals, reply, reply_visits, reply_score)
+            self.root.visits += playouts
+            return
+
+        # Leaf parallelism: waves of one chunk per worker
+        while playouts > 0:
+            wave = []
+            for _ in range(self.workers):
+                if playouts <= 0:
+                    break
+                count = min(self.chunk, playouts)
+                playouts -= count
+                node, state = self.select_and_expand(virtual_visits=count)
+                if state.winner is not None or not state.empty:
+                    wave.append((node, {state.winner: count}))  # Terminal leaf: no rollouts needed
+                else:
+                    wave.append((node, self.pool.submit(rollout_batch, state, count, self._task_seed())))
+            for node, result in wave:
+                winners = result if isinstance(result, dict) else result.result()
+                self.backpropagate(node, winners, counted=True)
+
+    def close(self):
+        self.pool.shutdown()
+
+
+def monte_carlo_tree_search(state, engine=None, playouts=PLAYOUTS):
+    """Best move for state.current_player, searched with engine (a fresh tree if None)."""
+    if not state.get_available_moves():
         return None
-    move_scores = {move: 0 for move in moves}
+    if engine is None:
+        engine = MonteCarloTreeSearch()
+    return engine.search(state, playouts)
+
+class SearchThread(threading.Thread):
+    """
+    Runs a search engine off the UI thread.
+
+    think() starts an anytime search and returns at once; progress and the
+    final move arrive on the `results` queue as ("progress", request_id,
+    best_move, playouts, elapsed_ms) and ("done", request_id, move) for the
+    UI to poll, e.g. with root.after. Every command goes through this thread,
+    so the tree is only ever touched by it. A new command cuts a running
+    search short.
+
+    With ponder, the thread keeps searching while it has nothing to do, on
+    the position where the human is to move. When the human's move arrives,
+    advance() keeps that move's subtree, so the next think() starts with
+    the playouts gathered on the human's time (in root-parallel mode, the
+    worker statistics of that move).
+    """
+
+    def __init__(self, engine, ponder=True):
+        super(SearchThread, self).__init__(daemon=True)
+        self.engine = engine
+        self.ponder = ponder
+        self.commands = queue.Queue()
+        self.results = queue.Queue()
+
+    def think(self, state, request_id, time_ms=THINK_TIME_MS, playouts=None):
+        self.commands.put(('think', (state.clone(), request_id, time_ms, playouts)))
+
+    def advance(self, move):
+        self.commands.put(('advance', (move,)))
 
+    def reset(self):
+        self.commands.put(('reset', ()))
 
-    with ThreadPoolExecutor(max_workers=4) as executor:
-        for move in moves:
-            simulations = [executor.submit(simulate_move, state, move) for _ in range(SIMULATIONS)]
-            results = [sim.result() for sim in simulations]
-            move_scores[move] = sum(results)
+    def stop(self):
+        self.commands.put(('stop', ()))
+        self.join()
 
+    def _can_ponder(self):
+        root = self.engine.root
+        return self.ponder and root is not None and (root.untried or root.children) and root.visits < PONDER_LIMIT
 
-    best_move = max(move_scores, key=move_scores.get)
-    return best_move
+    def run(self):
+        while True:
+            if self._can_ponder():
+                try:
+                    command, args = self.commands.get_nowait()
+                except queue.Empty:
+                    self.engine._run_playouts(self.engine.think_slice)
+                    continue
+            else:
+                command, args = self.commands.get()
 
-def simulate_move(state, move):
-    simulated_state = state.clone()
-    simulated_state.make_move(*move)
-    return simulate_game(simulated_state)
+            if command == 'stop':
+                break
+            if command == 'advance':
+                self.engine.advance(*args)
+            elif command == 'reset':
+                self.engine.reset()
+            elif command == 'think':
+                state, request_id, time_ms, playouts = args
 
-def play_game():
+                def report(move, done, elapsed_ms):
+                    self.results.put(('progress', request_id, move, done, elapsed_ms))
+
+                move = self.engine.think(state, time_ms, playouts, report, should_stop=lambda: not self.commands.empty())
+                self.results.put(('done', request_id, move))
+
+
+def play_game(workers=0, mode='root', time_ms=THINK_TIME_MS, playouts=None, ponder=True):
     root = tk.Tk()
     root.title("5x5 XOX - Monte Carlo Arama Ağacı")
     game_state = GameState()
+    if workers > 0:
+        engine = ParallelMonteCarloTreeSearch(workers, mode)
+    else:
+        engine = MonteCarloTreeSearch()
+    searcher = SearchThread(engine, ponder)
+    searcher.start()
+    game_id = 0
+    thinking = False
 
     buttons = [[None for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
     result_label = tk.Label(root, text="", font=("Arial", 20))
     result_label.pack()
+    status_label = tk.Label(root, text="", font=("Arial", 12))
+    status_label.pack()
 
     def reset_game():
-        nonlocal game_state
+        nonlocal game_state, game_id, thinking
         game_state = GameState()
+        game_id += 1  # Results of a search still running for the old game are ignored
+        thinking = False
+        searcher.reset()
         for row in range(BOARD_SIZE):
             for col in range(BOARD_SIZE):
                 buttons[row][col]["text"] = ""
                 buttons[row][col]["state"] = "normal"
         result_label.config(text="")
+        status_label.config(text="")
 
     def handle_click(row, col):
+        nonlocal thinking
+        if thinking:
+            return
         if game_state.make_move(row, col):
+            searcher.advance((row, col))
             buttons[row][col]["text"] = "X"
             buttons[row][col]["state"] = "disabled"
             if game_state.check_winner() == "X":
                 result_label.config(text="Kazandın!", fg="red")
                 disable_all_buttons()
                 return
-            ai_move = monte_carlo_tree_search(game_state)
-            if ai_move:
-                game_state.make_move(*ai_move)
-                r, c = ai_move
-                buttons[r][c]["text"] = "O"
-                buttons[r][c]["state"] = "disabled"
-                if game_state.check_winner() == "O":
-                    result_label.config(text="Kaybettin!", fg="blue")
-                    disable_all_buttons()
-                    return
             if not game_state.get_available_moves():
                 result_label.config(text="Berabere!", fg="black")
+                return
+            thinking = True
+            status_label.config(text="Düşünüyor...")
+            searcher.think(game_state, game_id, time_ms, playouts)
+            root.after(POLL_MS, poll_search)
+
+    def poll_search():
+        while True:
+            try:
+                message = searcher.results.get_nowait()
+            except queue.Empty:
+                break
+            if message[1] != game_id:
+                continue
+            if message[0] == 'progress':
+                _, _, move, done, elapsed_ms = message
+                status_label.config(text=f"Düşünüyor... {done} simülasyon, {elapsed_ms:.0f} ms, en iyi hamle {move}")
+            else:
+                apply_ai_move(message[2])
+                return
+        if thinking:
+            root.after(POLL_MS, poll_search)
+
+    def apply_ai_move(ai_move):
+        nonlocal thinking
+        thinking = False
+        if ai_move:
+            game_state.make_move(*ai_move)
+            searcher.advance(ai_move)
+            r, c = ai_move
+            buttons[r][c]["text"] = "O"
+            buttons[r][c]["state"] = "disabled"
+            if game_state.check_winner() == "O":
+                result_label.config(text="Kaybettin!", fg="blue")
+                disable_all_buttons()
+                return
+        if not game_state.get_available_moves():
+            result_label.config(text="Berabere!", fg="black")
 
     def disable_all_buttons():
         for row in range(BOARD_SIZE):
@@ -138,6 +597,18 @@ def play_game():
     tk.Button(root, text="Tekrar Oyna", command=reset_game, font=("Arial", 14)).pack()
 
     root.mainloop()
+    searcher.stop()
+    if workers > 0:
+        engine.close()
 
 if __name__ == "__main__":
-    play_game()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="5x5 four-in-a-row against Monte Carlo tree search.")
+    parser.add_argument("--workers", type=int, default=0, help="Rollout processes (0 searches in this process)")
+    parser.add_argument("--parallel", choices=("root", "leaf"), default="root", help="Parallel search mode")
+    parser.add_argument("--time-ms", type=float, default=THINK_TIME_MS, help="AI thinking time per move")
+    parser.add_argument("--playouts", type=int, help="Also stop after this many playouts per move")
+    parser.add_argument("--no-ponder", action="store_true", help="Do not search while the human is thinking")
+    args = parser.parse_args()
+    play_game(args.workers, args.parallel, args.time_ms, args.playouts, not args.no_ponder)
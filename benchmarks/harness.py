@@ -0,0 +1,117 @@
+# benchmarks/harness.py
+
+import importlib.util
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+import torch
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_script(relative_path, module_name):
+    """
+    Import one of the standalone game scripts (e.g. 'Minimax+AlphaBeta/main.py')
+    by path. Their directories are not importable packages, and the pygame
+    ones open a window at import time, so SDL is pointed at its dummy drivers.
+    """
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(module_name, os.path.join(REPO_ROOT, relative_path))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def time_case(run, ops=1, repeats=7, min_time=0.05):
+    """
+    Time run() and return per-operation statistics in microseconds.
+
+    run performs `ops` operations per call. The number of calls per repeat is
+    calibrated once so a repeat lasts at least min_time seconds; the median
+    over `repeats` repeats is the headline number, the minimum a noise floor.
+    """
+    run()  # Warm-up (caches, lazy allocation, TorchScript/oneDNN first-call work)
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            run()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed == 0 else max(2, min(10, int(min_time / elapsed) + 1))
+
+    timings = [elapsed]
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            run()
+        timings.append(time.perf_counter() - start)
+    per_op = np.array(timings) / (number * ops) * 1e6
+    return {
+        'median_us': float(np.median(per_op)),
+        'min_us': float(per_op.min()),
+        'calls_per_repeat': number,
+        'ops_per_call': ops,
+        'repeats': repeats,
+    }
+
+
+def environment_info():
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'torch': torch.__version__,
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'torch_threads': torch.get_num_threads(),
+    }
+
+
+def save_results(results, path):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump({'environment': environment_info(), 'results': results}, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)['results']
+
+
+def compare(results, baseline, threshold):
+    """
+    Compare median timings against a baseline.
+
+    Returns one (name, baseline_us, current_us, ratio, status) row per case,
+    where status is 'regression' when current/baseline exceeds 1 + threshold,
+    'improvement' when it is below 1 / (1 + threshold), 'new' for cases the
+    baseline does not have and 'ok' otherwise.
+    """
+    rows = []
+    for name in sorted(results):
+        current = results[name]['median_us']
+        if name not in baseline:
+            rows.append((name, None, current, None, 'new'))
+            continue
+        reference = baseline[name]['median_us']
+        ratio = current / reference
+        if ratio > 1 + threshold:
+            status = 'regression'
+        elif ratio < 1 / (1 + threshold):
+            status = 'improvement'
+        else:
+            status = 'ok'
+        rows.append((name, reference, current, ratio, status))
+    return rows
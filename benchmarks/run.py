@@ -0,0 +1,326 @@
+# benchmarks/run.py
+
+"""
+Micro-benchmarks for the game engines and training primitives.
+
+    python -m benchmarks.run                       # run all, compare to baseline.json
+    python -m benchmarks.run -k minimax            # only cases whose name contains 'minimax'
+    python -m benchmarks.run --update-baseline     # store this run as the new baseline
+
+Every case runs on fixed positions with fixed seeds, so two runs do the
+same work and only the timings differ. Results are written as JSON to
+outputs/benchmarks/latest.json; the exit status is 1 when a case is slower
+than the baseline by more than --threshold.
+"""
+
+import argparse
+import fnmatch
+import os
+import random
+
+import numpy as np
+import torch
+import torch.nn as nn
+import torch.optim as optim
+
+from benchmarks.harness import compare, load_results, load_script, save_results, time_case
+from config.game_config import BATCH_SIZE, BOARD_SIZE, LEARNING_RATE
+from game.utils import make_env
+from game.vector_env import SOSVectorEnv
+from models.dq_network import DQNetworkCNN
+from models.export import random_positions
+from training.replay_buffer import ReplayBuffer
+from training.train import decode_action, train_batch
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(BENCHMARK_DIR, 'baseline.json')
+RESULTS_PATH = 'outputs/benchmarks/latest.json'
+
+CASES = {}
+
+
+def case(name):
+    """Register a benchmark factory; it returns (run, ops_per_call)."""
+    def register(factory):
+        CASES[name] = factory
+        return factory
+    return register
+
+
+# Fixed positions -----------------------------------------------------------
+
+def fixed_game(board_size=BOARD_SIZE, seed=0):
+    """A full SOS game as a fixed list of (row, col, letter) actions."""
+    rng = np.random.default_rng(seed)
+    cells = rng.permutation(board_size * board_size)
+    letters = rng.integers(0, 2, size=len(cells))
+    return [decode_action(int(cell) * 2 + int(letter), board_size) for cell, letter in zip(cells, letters)]
+
+
+def sos_midgame(backend, moves=12):
+    """Environment after the first `moves` moves of fixed_game()."""
+    env = make_env(backend)
+    env.reset()
+    for action in fixed_game()[:moves]:
+        env.step(action)
+    return env
+
+
+# Four-in-a-row grids for the MonteCarlo and alpha-beta players ('X' human, 'O' AI);
+# both positions have 'O' (the AI, maximizing) to move and no winner yet
+GRID_OPENING = [
+    ".....",
+    ".X...",
+    ".....",
+    ".....",
+    ".....",
+]
+GRID_MIDGAME = [
+    "X....",
+    ".OX..",
+    ".XO..",
+    "...X.",
+    "O....",
+]
+
+
+def grid(rows):
+    return [["" if cell == '.' else cell for cell in row] for row in rows]
+
+
+# Cases ---------------------------------------------------------------------
+
+def env_cases(backend):
+    @case(f'env.step[{backend}]')
+    def step():
+        env = make_env(backend)
+        game = fixed_game()
+
+        def run():
+            env.reset()
+            for action in game:
+                env.step(action)
+        return run, len(game)
+
+    @case(f'env.check_sos[{backend}]')
+    def check_sos():
+        env = sos_midgame(backend)
+        placed = [(row, col, letter) for row, col, letter in fixed_game()[:12]]
+
+        def run():
+            for row, col, letter in placed:
+                env.check_sos(row, col, letter)
+        return run, len(placed)
+
+    @case(f'env.available_actions[{backend}]')
+    def available_actions():
+        env = sos_midgame(backend)
+        return env.available_actions, 1
+
+
+for _backend in ('numpy', 'bitboard'):
+    env_cases(_backend)
+
+
+@case('vector_env.step[64]')
+def vector_env_step():
+    num_envs = 64
+    env = SOSVectorEnv(num_envs)
+    cells = env.board_size * env.board_size
+    rng = np.random.default_rng(0)
+    # One fixed full game per environment; all finish (and auto-reset) on the last step
+    games = np.stack([rng.permutation(cells) * 2 + rng.integers(0, 2, size=cells) for _ in range(num_envs)], axis=1)
+
+    def run():
+        env.reset()
+        for actions in games:
+            env.step(actions)
+    return run, cells * num_envs
+
+
+def filled_buffer(size=10000, seed=0):
+    rng = np.random.default_rng(seed)
+    buffer = ReplayBuffer(size)
+    shape = (size, BOARD_SIZE, BOARD_SIZE)
+    buffer.push_batch(rng.integers(0, 3, size=shape), rng.integers(0, BOARD_SIZE * BOARD_SIZE * 2, size=size),
+                      rng.standard_normal(size), rng.integers(0, 3, size=shape), rng.random(size) < 0.04)
+    return buffer
+
+
+@case('replay.push')
+def replay_push():
+    buffer = filled_buffer()
+    state = np.zeros((BOARD_SIZE, BOARD_SIZE), dtype=np.float32)
+
+    def run():
+        for _ in range(1000):
+            buffer.push(state, 3, -0.1, state, False)
+    return run, 1000
+
+
+@case('replay.push_batch[8]')
+def replay_push_batch():
+    buffer = filled_buffer()
+    states = np.zeros((8, BOARD_SIZE, BOARD_SIZE), dtype=np.float32)
+    actions, rewards, dones = np.arange(8), np.full(8, -0.1, dtype=np.float32), np.zeros(8, dtype=bool)
+    return lambda: buffer.push_batch(states, actions, rewards, states, dones), 1
+
+
+@case(f'replay.sample[{BATCH_SIZE}]')
+def replay_sample():
+    buffer = filled_buffer()
+    np.random.seed(0)
+    return lambda: buffer.sample(BATCH_SIZE), 1
+
+
+@case(f'train_batch[{BATCH_SIZE}]')
+def train_batch_case():
+    torch.manual_seed(0)
+    action_size = BOARD_SIZE * BOARD_SIZE * 2
+    policy_net, target_net = DQNetworkCNN(action_size), DQNetworkCNN(action_size)
+    target_net.load_state_dict(policy_net.state_dict())
+    optimizer = optim.Adam(policy_net.parameters(), lr=LEARNING_RATE)
+    criterion = nn.MSELoss()
+    np.random.seed(0)
+    batch = filled_buffer().sample(BATCH_SIZE)
+    return lambda: train_batch(policy_net, target_net, optimizer, criterion, batch), 1
+
+
+def inference_case(batch_size):
+    @case(f'dqn.inference[{batch_size}]')
+    def inference():
+        torch.manual_seed(0)
+        model = DQNetworkCNN(BOARD_SIZE * BOARD_SIZE * 2).eval()
+        states, _ = random_positions(batch_size)
+
+        def run():
+            with torch.no_grad():
+                model(states)
+        return run, 1
+
+
+for _batch_size in (1, 32, 1024):
+    inference_case(_batch_size)
+
+
+def monte_carlo_case(name, rows):
+    @case(f'montecarlo.simulate_game[{name}]')
+    def simulate_game():
+        monte_carlo = load_script(os.path.join('MonteCarlo', 'main.py'), 'montecarlo_main')
+        state = monte_carlo.GameState.from_board(grid(rows), "O")
+
+        def run():
+            random.seed(0)
+            for _ in range(20):
+                monte_carlo.simulate_game(state)
+        return run, 20
+
+    @case(f'montecarlo.uct_search[{name}]')
+    def uct_search():
+        monte_carlo = load_script(os.path.join('MonteCarlo', 'main.py'), 'montecarlo_main')
+        state = monte_carlo.GameState.from_board(grid(rows), "O")
+
+        def run():
+            monte_carlo.MonteCarloTreeSearch(seed=0).search(state, 200)
+        return run, 200
+
+
+def minimax_case(name, rows, depth):
+    @case(f'minimax.alphabeta[{name},depth={depth}]')
+    def alphabeta():
+        alphabeta_engine = load_script(os.path.join('Minimax+AlphaBeta', 'engine.py'), 'alphabeta_engine')
+        engine = alphabeta_engine.AlphaBetaEngine()
+
+        def run():
+            engine.set_board(grid(rows))  # Also empties the search tables
+            engine.minimax(depth, float('-inf'), float('inf'), True)
+        return run, 1
+
+
+def iterative_deepening_case(name, rows, depth):
+    @case(f'minimax.search[{name},depth={depth}]')
+    def search():
+        alphabeta_engine = load_script(os.path.join('Minimax+AlphaBeta', 'engine.py'), 'alphabeta_engine')
+        engine = alphabeta_engine.AlphaBetaEngine()
+
+        def run():
+            engine.set_board(grid(rows))
+            engine.search(time_limit=None, max_depth=depth)
+        return run, 1
+
+
+for _name, _rows in (('opening', GRID_OPENING), ('midgame', GRID_MIDGAME)):
+    monte_carlo_case(_name, _rows)
+    for _depth in (1, 2, 3):
+        minimax_case(_name, _rows, _depth)
+    iterative_deepening_case(_name, _rows, 5)
+
+
+@case('tictactoe.solve[3x3]')
+def tictactoe_solve():
+    solver = load_script(os.path.join('main', 'solver.py'), 'tictactoe_solver')
+    return solver.solve, 1
+
+
+@case('tictactoe.lookup[3x3]')
+def tictactoe_lookup():
+    solver = load_script(os.path.join('main', 'solver.py'), 'tictactoe_solver')
+    table = solver.solve()
+    board = [["X", "", ""], ["", "O", ""], ["", "", "X"]]
+
+    def run():
+        for _ in range(100):
+            table.lookup(board)
+    return run, 100
+
+
+def run_benchmarks(pattern=None, repeats=7, min_time=0.05):
+    results = {}
+    for name, factory in CASES.items():
+        if pattern and pattern not in name and not fnmatch.fnmatch(name, pattern):
+            continue
+        run, ops = factory()
+        results[name] = time_case(run, ops, repeats=repeats, min_time=min_time)
+        print(f"{name:45s} {results[name]['median_us']:12.2f} us/op")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the SOS benchmark suite.')
+    parser.add_argument('-k', dest='pattern', help='Only run cases whose name contains this (or matches a glob)')
+    parser.add_argument('--repeats', type=int, default=7)
+    parser.add_argument('--min-time', type=float, default=0.05, help='Minimum seconds per repeat')
+    parser.add_argument('--output', default=RESULTS_PATH)
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Relative slowdown reported as a regression (0.25 = 25%%)')
+    parser.add_argument('--update-baseline', action='store_true', help='Save the results as the new baseline')
+    args = parser.parse_args()
+
+    torch.set_num_threads(1)  # Single-threaded timings are far more repeatable
+    results = run_benchmarks(args.pattern, args.repeats, args.min_time)
+    save_results(results, args.output)
+
+    if args.update_baseline:
+        # Keep baseline entries for cases that were filtered out of this run
+        baseline = load_results(args.baseline) if os.path.exists(args.baseline) else {}
+        baseline.update(results)
+        save_results(baseline, args.baseline)
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one")
+        return 0
+
+    rows = compare(results, load_results(args.baseline), args.threshold)
+    print(f"\n{'case':45s} {'baseline':>12s} {'current':>12s} {'ratio':>7s}")
+    for name, reference, current, ratio, status in rows:
+        if reference is None:
+            print(f"{name:45s} {'-':>12s} {current:12.2f} {'-':>7s}  {status}")
+        else:
+            print(f"{name:45s} {reference:12.2f} {current:12.2f} {ratio:7.2f}  {status}")
+    return 1 if any(row[4] == 'regression' for row in rows) else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -1,6 +1,6 @@
 # config/game_config.py
 
-BOARD_SIZE = 5
+BOARD_SIZE = 5  # SOS line tables are built per size, so 9x9, 15x15, ... work too
 
 # DQL Hyperparameters
 GAMMA = 0.99            # Higher discount factor
@@ -13,3 +13,60 @@ MEMORY_SIZE = 20000     # Increase replay buffer size
 TARGET_UPDATE_FREQ = 5  # Update target network more frequently
 NUM_EPISODES = 5000     # Train for more episodes
 MAX_STEPS = BOARD_SIZE * BOARD_SIZE  # Maximum steps equal to the number of cells
+
+# Replay storage
+REPLAY_BACKEND = 'memory'       # 'memory' (RAM ring buffer) or 'memmap' (on-disk, survives restarts)
+REPLAY_DIR = 'outputs/replay'   # Where the memmap backend keeps its files
+REPLAY_DISK_SIZE = 20000000     # Capacity of the memmap backend (about 50 bytes per transition)
+AUGMENT_SYMMETRIES = None       # None, 'sample' (random rotation/reflection per sample) or 'push' (store all 8)
+
+# Prioritized experience replay
+PRIORITIZED_REPLAY = False  # Sample experiences in proportion to their TD error
+PER_ALPHA = 0.6             # How strongly priorities skew sampling (0 = uniform)
+PER_BETA_START = 0.4        # Initial importance-sampling correction, annealed to 1
+PER_BETA_INCREMENT = 1e-5   # Beta increase per sampled batch
+PER_EPSILON = 1e-5          # Keeps zero-error experiences sampleable
+
+# Checkpoints (python -m training.train --resume continues from CHECKPOINT_PATH)
+CHECKPOINT_PATH = 'outputs/checkpoints/checkpoint.pt'
+CHECKPOINT_EVERY = 100    # Episodes between checkpoints
+CHECKPOINT_REPLAY = True  # Include the replay buffer (memmap buffers only record their position)
+
+# Environment
+NUM_ENVS = 8              # Games stepped together by SOSVectorEnv during training
+
+# Actor/learner training (python -m training.train --actors N)
+NUM_ACTORS = 0            # Self-play worker processes; 0 keeps everything in one process
+ACTOR_NUM_ENVS = 8        # Games each actor steps together
+ACTOR_SEND_STEPS = 4      # Vector steps an actor batches into one message to the learner
+ACTOR_SYNC_INTERVAL = 50  # Learner updates between publishing fresh weights to the actors
+ACTOR_TRANSITIONS_PER_UPDATE = NUM_ENVS  # Replay ratio: one learner update per this many transitions, as in train()
+ACTOR_QUEUE_SIZE = 64     # Messages buffered between actors and learner
+ACTOR_EPSILON_BASE = 0.4  # Ape-X style per-actor exploration: base ** (1 + alpha * i / (N - 1))
+ACTOR_EPSILON_ALPHA = 7
+ACTOR_SEED = 0            # Actor i seeds its RNGs with ACTOR_SEED + i
+
+# Instrumentation (python -m training.train --profile torch|cprofile)
+METRICS_PATH = 'outputs/metrics/train_metrics.jsonl'  # JSON-lines throughput/phase-time records
+METRICS_INTERVAL = 10.0   # Seconds between metrics records
+PROFILE_MODE = None       # None, 'torch' (Chrome trace) or 'cprofile' (pstats dump)
+PROFILE_START = 200       # Training iterations to skip before profiling (warm-up)
+PROFILE_ITERATIONS = 50   # Training iterations covered by the profile
+PROFILE_DIR = 'outputs/profiles'
+
+# Background evaluation (a separate process plays the policy against fixed opponents)
+EVAL_EVERY = 250                       # Episodes between evaluations; 0 disables evaluation
+EVAL_GAMES = 256                       # Games per opponent, played in lockstep with batched inference
+EVAL_OPPONENTS = ('random', 'greedy')  # 'random' (uniform legal move) or 'greedy' (most SOS lines now)
+EVAL_SEED = 1234                       # Every evaluation replays the same opponent randomness
+EVAL_PATH = 'outputs/metrics/eval.jsonl'
+EARLY_STOP_OPPONENT = 'greedy'         # Early stopping watches the win rate against this opponent
+EARLY_STOP_PATIENCE = 8                # Evaluations without improvement before training stops; 0 disables
+EARLY_STOP_MIN_DELTA = 0.01            # Win-rate gain that counts as an improvement
+
+# Inference server (python -m models.inference_server)
+SERVER_MODEL = 'outputs/models/sos_dqn.pth'  # State dict or exported TorchScript model
+SERVER_HOST = '127.0.0.1'
+SERVER_PORT = 8765
+SERVER_MAX_BATCH = 256        # Boards per forward pass at most
+SERVER_MAX_LATENCY_MS = 2.0   # How long the first request of a batch waits for more
@@ -0,0 +1,132 @@
+# game/bitboard_env.py
+
+from functools import lru_cache
+
+import numpy as np
+from config.game_config import BOARD_SIZE
+from game.sos_lines import sos_triplets
+
+@lru_cache(maxsize=None)
+def build_line_masks(board_size):
+    """
+    The SOS triplet index for board_size, as integer bit masks.
+
+    Returns (s_lines, o_lines), both indexed by cell (row * board_size + col):
+    s_lines[cell] is a tuple of (o_bit, s_bit) pairs that an 'S' on the cell
+    completes, o_lines[cell] a tuple of masks whose two bits must both hold an
+    'S' for an 'O' on the cell to score.
+    """
+    s_lines = []
+    o_lines = []
+    for s_pairs, o_pairs in sos_triplets(board_size):
+        s_lines.append(tuple((1 << first, 1 << second) for first, second in s_pairs))
+        o_lines.append(tuple((1 << first) | (1 << second) for first, second in o_pairs))
+    return tuple(s_lines), tuple(o_lines)
+
+
+class BitboardSOSGameEnv:
+    """
+    Drop-in replacement for SOSGameEnv that keeps the board as two integer
+    bitboards (one for 'S', one for 'O') instead of an array of strings.
+
+    Rewards, scores and extra-turn behaviour are identical to SOSGameEnv;
+    only the board representation differs.
+    """
+
+    def __init__(self, board_size=BOARD_SIZE):
+        self.board_size = board_size
+        self.num_cells = board_size * board_size
+        self.full_mask = (1 << self.num_cells) - 1
+        self.s_lines, self.o_lines = build_line_masks(board_size)
+        # Numeric observation (0 empty, 1 S, 2 O) and legal-action mask kept
+        # in sync with the bitboards, allocated once like in SOSGameEnv
+        self.observation = np.zeros((board_size, board_size), dtype=np.float32)
+        self.flat_observation = self.observation.reshape(-1)
+        self.legal_mask = np.ones(self.num_cells * 2, dtype=bool)
+        self.reset()
+
+    def reset(self):
+        self.s_bits = 0
+        self.o_bits = 0
+        self.current_player = 'player1'
+        self.scores = {'player1': 0, 'player2': 0}
+        self.game_over = False
+        self.observation.fill(0)
+        self.legal_mask.fill(True)
+        self.empty_cells = self.num_cells
+        return self.get_state()
+
+    @property
+    def board(self):
+        """String view of the board, in the same format as SOSGameEnv.board."""
+        board = np.full(self.num_cells, '', dtype=str)
+        board[self.flat_observation == 1] = 'S'
+        board[self.flat_observation == 2] = 'O'
+        return board.reshape(self.board_size, self.board_size)
+
+    def get_state(self):
+        return self.observation.copy()
+
+    def available_actions(self):
+        actions = []
+        empty = ~(self.s_bits | self.o_bits) & self.full_mask
+        while empty:
+            low = empty & -empty
+            row, col = divmod(low.bit_length() - 1, self.board_size)
+            actions.append((row, col, 'S'))
+            actions.append((row, col, 'O'))
+            empty ^= low
+        return actions
+
+    def step(self, action):
+        row, col, letter = action
+        if letter not in ('S', 'O'):
+            raise ValueError(f"Letter must be 'S' or 'O', got {letter!r}")
+        if not self.is_valid_position(row, col):
+            return self.get_state(), -1, False, {'invalid_move': True}
+        cell = row * self.board_size + col
+        bit = 1 << cell
+        if (self.s_bits | self.o_bits) & bit:
+            return self.get_state(), -1, False, {'invalid_move': True}
+
+        points = self._score(cell, letter)
+        if letter == 'S':
+            self.s_bits |= bit
+            self.flat_observation[cell] = 1
+        else:
+            self.o_bits |= bit
+            self.flat_observation[cell] = 2
+        self.legal_mask[cell * 2:cell * 2 + 2] = False
+        self.empty_cells -= 1
+        self.scores[self.current_player] += points
+        reward = points * 10
+        if points == 0:
+            reward -= 0.1
+        self.game_over = self.empty_cells == 0
+        if points == 0:
+            self.switch_player()
+        return self.get_state(), reward, self.game_over, {'invalid_move': False}
+
+    def _score(self, cell, letter):
+        s_bits = self.s_bits
+        if letter == 'S':
+            o_bits = self.o_bits
+            return sum(1 for o_bit, s_bit in self.s_lines[cell] if o_bits & o_bit and s_bits & s_bit)
+        return sum(1 for mask in self.o_lines[cell] if s_bits & mask == mask)
+
+    def check_sos(self, row, col, letter):
+        return self._score(row * self.board_size + col, letter)
+
+    def switch_player(self):
+        self.current_player = 'player2' if self.current_player == 'player1' else 'player1'
+
+    def is_valid_position(self, row, col):
+        return 0 <= row < self.board_size and 0 <= col < self.board_size
+
+    def check_game_over(self):
+        if (self.s_bits | self.o_bits) == self.full_mask:
+            self.game_over = True
+
+    def render(self):
+        print('\n'.join([' '.join(cell or '.' for cell in row) for row in self.board]))
+        print(f"Scores: {self.scores}")
@@ -2,51 +2,66 @@
 
 import numpy as np
 from config.game_config import BOARD_SIZE
+from game.sos_lines import sos_triplets
+
+
+LETTER_VALUES = {'S': 1, 'O': 2}
 
 
 class SOSGameEnv:
-    def __init__(self):
-        self.board_size = BOARD_SIZE
+    def __init__(self, board_size=BOARD_SIZE):
+        self.board_size = board_size
+        self.triplets = sos_triplets(board_size)  # Shared, built once per board size
+        # Buffers are allocated once and updated in place by step(), so
+        # torch.from_numpy(env.observation) / env.legal_mask stay valid views
+        self.observation = np.zeros((self.board_size, self.board_size), dtype=np.float32)
+        self.legal_mask = np.ones(self.board_size * self.board_size * 2, dtype=bool)  # encode_action order
         self.reset()
 
     def reset(self):
         self.board = np.full((self.board_size, self.board_size), '', dtype=str)
+        self.flat_board = self.board.reshape(-1)  # View indexed like the triplet table
         self.current_player = 'player1'
         self.scores = {'player1': 0, 'player2': 0}
         self.game_over = False
+        self.observation.fill(0)
+        self.legal_mask.fill(True)
+        self.empty_cells = self.board_size * self.board_size
         return self.get_state()
 
     def get_state(self):
-        state = np.copy(self.board)
-        state[state == ''] = 0
-        state[state == 'S'] = 1
-        state[state == 'O'] = 2
-        return state.astype(np.float32)
+        # Copy, so stored states are not changed by later moves
+        return self.observation.copy()
 
     def available_actions(self):
         actions = []
-        for row in range(self.board_size):
-            for col in range(self.board_size):
-                if self.board[row, col] == '':
-                    actions.append((row, col, 'S'))
-                    actions.append((row, col, 'O'))
+        for action_index in np.flatnonzero(self.legal_mask):
+            row, col = divmod(int(action_index) // 2, self.board_size)
+            actions.append((row, col, 'S' if action_index % 2 == 0 else 'O'))
         return actions
 
     def step(self, action):
         row, col, letter = action
+        if letter not in LETTER_VALUES:
+            raise ValueError(f"Letter must be 'S' or 'O', got {letter!r}")
         if not self.is_valid_position(row, col) or self.board[row, col] != '':
             reward = -1  # Penalty for invalid move
             done = False
             info = {'invalid_move': True}
         else:
             self.board[row, col] = letter
+            self.observation[row, col] = LETTER_VALUES[letter]
+            cell = row * self.board_size + col
+            self.legal_mask[cell * 2:cell * 2 + 2] = False
+            self.empty_cells -= 1
             points = self.check_sos(row, col, letter)
             self.scores[self.current_player] += points
             # Enhanced reward function
             reward = points * 10  # Increase the reward magnitude
             if points == 0:
                 reward -= 0.1  # Small penalty for not forming an SOS
-            self.check_game_over()
+            if self.empty_cells == 0:
+                self.game_over = True
             done = self.game_over
             info = {'invalid_move': False}
             # Do not switch player if points were scored
@@ -58,32 +73,33 @@ class SOSGameEnv:
         self.current_player = 'player2' if self.current_player == 'player1' else 'player1'
 
     def check_sos(self, row, col, letter):
-        points = 0
-        directions = [(-1, -1), (-1, 0), (-1, 1),
-                      (0, -1), (0, 1),
-                      (1, -1), (1, 0), (1, 1)]
-        for dx, dy in directions:
-            if letter == 'S':
-                # Check for 'S' at the start of 'SOS'
-                x1, y1 = row + dx, col + dy
-                x2, y2 = row + 2 * dx, col + 2 * dy
-                if self.is_valid_position(x1, y1) and self.is_valid_position(x2, y2):
-                    if self.board[x1, y1] == 'O' and self.board[x2, y2] == 'S':
-                        points += 1
-            elif letter == 'O':
-                # Check for 'O' in the middle of 'SOS'
-                x1, y1 = row - dx, col - dy
-                x2, y2 = row + dx, col + dy
-                if self.is_valid_position(x1, y1) and self.is_valid_position(x2, y2):
-                    if self.board[x1, y1] == 'S' and self.board[x2, y2] == 'S':
-                        points += 1
-        return points
+        board = self.flat_board
+        s_pairs, o_pairs = self.triplets[row * self.board_size + col]
+        if letter == 'S':
+            # 'S' at the start of 'SOS'
+            return sum(1 for first, second in s_pairs if board[first] == 'O' and board[second] == 'S')
+        if letter == 'O':
+            # 'O' in the middle of 'SOS'
+            return sum(1 for first, second in o_pairs if board[first] == 'S' and board[second] == 'S')
+        return 0
 
     def is_valid_position(self, row, col):
         return 0 <= row < self.board_size and 0 <= col < self.board_size
 
+    def sync(self):
+        """Rebuild the observation, legal mask and empty-cell count from the board, in place."""
+        self.observation.fill(0)
+        for letter, value in LETTER_VALUES.items():
+            self.observation[self.board == letter] = value
+        empty = self.flat_board == ''
+        self.legal_mask[0::2] = empty
+        self.legal_mask[1::2] = empty
+        self.empty_cells = int(np.count_nonzero(empty))
+
     def check_game_over(self):
-        if not any(self.board.flatten() == ''):
+        """Resync from the board (e.g. after editing it directly) and end the game once it is full."""
+        self.sync()
+        if self.empty_cells == 0:
             self.game_over = True
 
     def render(self):
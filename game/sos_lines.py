@@ -0,0 +1,44 @@
+# game/sos_lines.py
+
+from functools import lru_cache
+
+DIRECTIONS = [(-1, -1), (-1, 0), (-1, 1),
+              (0, -1), (0, 1),
+              (1, -1), (1, 0), (1, 1)]
+
+LETTERS = ('S', 'O')
+
+
+@lru_cache(maxsize=None)
+def sos_triplets(board_size):
+    """
+    Precomputed index of the SOS triplets each move can complete.
+
+    triplets[cell][letter_index] (cell = row * board_size + col, letter_index
+    0 for 'S' and 1 for 'O', as in encode_action) is a tuple of (first,
+    second) cell pairs. An 'S' scores for every pair holding ('O', 'S'), an
+    'O' for every pair holding ('S', 'S').
+
+    The table walks the same 8 directions as the original scoring loop, so
+    each line through an 'O' appears once from each side and scores twice.
+    It is built once per board size and shared by every environment.
+    """
+    def inside(row, col):
+        return 0 <= row < board_size and 0 <= col < board_size
+
+    triplets = []
+    for row in range(board_size):
+        for col in range(board_size):
+            s_pairs = []
+            o_pairs = []
+            for dx, dy in DIRECTIONS:
+                # 'S' starts an SOS: O next to it, S beyond
+                x1, y1, x2, y2 = row + dx, col + dy, row + 2 * dx, col + 2 * dy
+                if inside(x1, y1) and inside(x2, y2):
+                    s_pairs.append((x1 * board_size + y1, x2 * board_size + y2))
+                # 'O' sits in the middle of an SOS: S on both sides
+                x1, y1, x2, y2 = row - dx, col - dy, row + dx, col + dy
+                if inside(x1, y1) and inside(x2, y2):
+                    o_pairs.append((x1 * board_size + y1, x2 * board_size + y2))
+            triplets.append((tuple(s_pairs), tuple(o_pairs)))
+    return tuple(triplets)
@@ -0,0 +1,18 @@
+# game/utils.py
+
+from config.game_config import BOARD_SIZE
+
+
+def make_env(backend='bitboard', board_size=BOARD_SIZE):
+    """
+    Create a single-game SOS environment with the requested board core,
+    'bitboard' (integer board) or 'numpy' (string board). The benchmarks
+    compare the two; training steps games through SOSVectorEnv instead.
+    """
+    if backend == 'bitboard':
+        from game.bitboard_env import BitboardSOSGameEnv
+        return BitboardSOSGameEnv(board_size)
+    if backend == 'numpy':
+        from game.game_env import SOSGameEnv
+        return SOSGameEnv(board_size)
+    raise ValueError(f"Unknown environment backend: {backend!r}")
@@ -0,0 +1,125 @@
+# game/vector_env.py
+
+from functools import lru_cache
+
+import numpy as np
+from config.game_config import BOARD_SIZE
+from game.sos_lines import DIRECTIONS, sos_triplets
+
+EMPTY, S, O = 0, 1, 2
+
+
+@lru_cache(maxsize=None)
+def build_triplet_table(board_size):
+    """
+    The SOS triplet index for board_size as padded NumPy arrays.
+
+    Returns (first, second, need_first, need_second), each of shape
+    (num_actions, 8) and indexed by encode_action: the two cells that must
+    hold the given letters for the move to complete an SOS. Unused slots
+    point at cell 0 and require -1, which never matches.
+    """
+    triplets = sos_triplets(board_size)
+    shape = (len(triplets) * 2, len(DIRECTIONS))
+    first = np.zeros(shape, dtype=np.int64)
+    second = np.zeros(shape, dtype=np.int64)
+    need_first = np.full(shape, -1, dtype=np.int8)
+    need_second = np.full(shape, -1, dtype=np.int8)
+
+    for cell, (s_pairs, o_pairs) in enumerate(triplets):
+        for letter_index, pairs, need in ((0, s_pairs, (O, S)), (1, o_pairs, (S, S))):
+            action_index = cell * 2 + letter_index
+            for k, (a, b) in enumerate(pairs):
+                first[action_index, k] = a
+                second[action_index, k] = b
+                need_first[action_index, k], need_second[action_index, k] = need
+    return first, second, need_first, need_second
+
+
+class SOSVectorEnv:
+    """
+    Steps N independent SOS games at once.
+
+    Actions are encode_action indices, one per game. Games that finish are
+    reset automatically; the observation they finished on is returned in
+    info['final_state'] so it can still be stored as a next state.
+    """
+
+    def __init__(self, num_envs, board_size=BOARD_SIZE):
+        self.num_envs = num_envs
+        self.board_size = board_size
+        self.num_cells = board_size * board_size
+        self.action_size = self.num_cells * 2
+        self.first, self.second, self.need_first, self.need_second = build_triplet_table(board_size)
+        self.env_indices = np.arange(num_envs)
+        self.boards = np.zeros((num_envs, self.num_cells), dtype=np.int8)
+        self.current_player = np.zeros(num_envs, dtype=np.int64)  # 0: player1, 1: player2
+        self.scores = np.zeros((num_envs, 2), dtype=np.int64)
+        self.empty_cells = np.zeros(num_envs, dtype=np.int64)
+        self.reset()
+
+    def reset(self):
+        self.reset_envs(np.ones(self.num_envs, dtype=bool))
+        return self.get_state()
+
+    def reset_envs(self, mask):
+        """Reset the games selected by a boolean mask."""
+        self.boards[mask] = EMPTY
+        self.current_player[mask] = 0
+        self.scores[mask] = 0
+        self.empty_cells[mask] = self.num_cells
+
+    def state_dict(self):
+        """Copy of the game positions, for checkpoints."""
+        return {'boards': self.boards.copy(), 'current_player': self.current_player.copy(),
+                'scores': self.scores.copy(), 'empty_cells': self.empty_cells.copy()}
+
+    def load_state_dict(self, state):
+        self.boards[:] = state['boards']
+        self.current_player[:] = state['current_player']
+        self.scores[:] = state['scores']
+        self.empty_cells[:] = state['empty_cells']
+
+    def get_state(self):
+        return self.boards.reshape(self.num_envs, self.board_size, self.board_size).astype(np.float32)
+
+    def legal_action_mask(self):
+        """Boolean mask of shape (num_envs, action_size), indexed like encode_action."""
+        return np.repeat(self.boards == EMPTY, 2, axis=1)
+
+    def action_points(self):
+        """SOS lines every action would complete, shape (num_envs, action_size); only legal actions are meaningful."""
+        hits = (self.boards[:, self.first] == self.need_first) & (self.boards[:, self.second] == self.need_second)
+        return hits.sum(axis=2)
+
+    def step(self, actions):
+        actions = np.asarray(actions, dtype=np.int64)
+        idx = self.env_indices
+        cells = actions // 2
+        letters = (actions % 2 + 1).astype(np.int8)
+        valid = self.boards[idx, cells] == EMPTY
+
+        rows = idx[:, None]
+        hits = (self.boards[rows, self.first[actions]] == self.need_first[actions]) & \
+               (self.boards[rows, self.second[actions]] == self.need_second[actions])
+        points = np.where(valid, hits.sum(axis=1), 0)
+
+        self.boards[idx[valid], cells[valid]] = letters[valid]
+        self.scores[idx, self.current_player] += points
+        self.empty_cells -= valid
+
+        rewards = np.where(points > 0, points * 10, -0.1)
+        rewards = np.where(valid, rewards, -1).astype(np.float32)
+        dones = valid & (self.empty_cells == 0)
+        # Scoring a point (or an invalid move) keeps the turn
+        switch = valid & (points == 0)
+        self.current_player[switch] ^= 1
+
+        final_state = self.get_state()
+        info = {'invalid_move': ~valid, 'final_state': final_state, 'final_scores': self.scores.copy()}
+        if dones.any():
+            self.reset_envs(dones)
+            states = self.get_state()
+        else:
+            states = final_state
+        return states, rewards, dones, info
@@ -1,6 +1,7 @@
 import pygame
 import sys
-import math
+
+from solver import TABLE_PATH, load_or_solve
 
 pygame.init()
 
@@ -28,6 +29,9 @@ BUTTON_FONT = pygame.font.Font(None, 40)
 PLAYER = "X"
 AI = "O"
 
+# Values and best moves of every position, solved once and then read from disk
+TABLE = load_or_solve(TABLE_PATH, ROWS, COLS, 3)
+
 def draw_lines():
     for row in range(1, ROWS):
         pygame.draw.line(SCREEN, BLACK, (0, CELL_SIZE * row), (WIDTH, CELL_SIZE * row), LINE_WIDTH)
@@ -63,47 +67,8 @@ def is_winner(player):
 def is_full():
     return all(cell != "" for row in board for cell in row)
 
-def minimax(depth, is_maximizing):
-    if is_winner(AI):
-        return 1
-    if is_winner(PLAYER):
-        return -1
-    if is_full():
-        return 0
-
-    if is_maximizing:
-        best_score = -math.inf
-        for row in range(ROWS):
-            for col in range(COLS):
-                if board[row][col] == "":
-                    board[row][col] = AI
-                    score = minimax(depth + 1, False)
-                    board[row][col] = ""
-                    best_score = max(best_score, score)
-        return best_score
-    else:
-        best_score = math.inf
-        for row in range(ROWS):
-            for col in range(COLS):
-                if board[row][col] == "":
-                    board[row][col] = PLAYER
-                    score = minimax(depth + 1, True)
-                    board[row][col] = ""
-                    best_score = min(best_score, score)
-        return best_score
-
 def ai_move():
-    best_score = -math.inf
-    best_move = None
-    for row in range(ROWS):
-        for col in range(COLS):
-            if board[row][col] == "":
-                board[row][col] = AI
-                score = minimax(0, False)
-                board[row][col] = ""
-                if score > best_score:
-                    best_score = score
-                    best_move = (row, col)
+    _, best_move = TABLE.lookup(board, (PLAYER, AI))
     if best_move:
         board[best_move[0]][best_move[1]] = AI
         
@@ -0,0 +1,188 @@
+import os
+
+import numpy as np
+
+ROWS, COLS = 3, 3
+WIN_LENGTH = 3
+MARKS = ("X", "O")  # First and second player
+TABLE_PATH = 'outputs/solver/tictactoe_3x3.npz'
+
+WIN = 100  # Score of a win right now; a win in p plies scores WIN - p, a loss -(WIN - p)
+NO_MOVE = 255
+
+
+def winning_lines(rows, cols, length):
+    """Every row, column and diagonal run of `length` cells, as tuples of cell indices (row * cols + col)."""
+    lines = []
+    for row in range(rows):
+        for col in range(cols):
+            for d_row, d_col in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                end_row, end_col = row + d_row * (length - 1), col + d_col * (length - 1)
+                if 0 <= end_row < rows and 0 <= end_col < cols:
+                    lines.append(tuple((row + d_row * i) * cols + col + d_col * i for i in range(length)))
+    return lines
+
+
+def symmetries(rows, cols):
+    """
+    Cell permutations of the board's symmetry group (8 for a square board,
+    4 otherwise): the transformed board has cells[perm[i]] at index i.
+    """
+    maps = [lambda r, c: (r, c), lambda r, c: (r, cols - 1 - c),
+            lambda r, c: (rows - 1 - r, c), lambda r, c: (rows - 1 - r, cols - 1 - c)]
+    if rows == cols:
+        maps += [lambda r, c: (c, r), lambda r, c: (c, cols - 1 - r),
+                 lambda r, c: (rows - 1 - c, r), lambda r, c: (rows - 1 - c, cols - 1 - r)]
+    perms = []
+    for source in maps:
+        perm = tuple(source_row * cols + source_col
+                     for source_row, source_col in (source(i // cols, i % cols) for i in range(rows * cols)))
+        if perm not in perms:
+            perms.append(perm)
+    return perms
+
+
+def child_score(score):
+    """A child's score (for the opponent) seen from the parent, one ply further from the end."""
+    if score > 0:
+        return -score + 1
+    if score < 0:
+        return -score - 1
+    return 0
+
+
+class PerfectPlayTable:
+    """
+    Value and best move of every reachable position of a small k-in-a-row
+    game, one entry per symmetry class.
+
+    Positions are tuples of cells, 0 empty, 1 the first player's mark and 2
+    the second's, keyed by their base-3 number; the side to move follows
+    from the mark counts. Scores are from the side to move's point of view:
+    WIN - p for a win in p plies, -(WIN - p) for a loss, 0 for a draw.
+    """
+
+    def __init__(self, rows, cols, win_length, entries):
+        self.rows = rows
+        self.cols = cols
+        self.win_length = win_length
+        self.entries = entries  # Canonical key -> (score, best move in canonical cells or NO_MOVE)
+        self.symmetries = symmetries(rows, cols)
+        self.powers = [3 ** i for i in range(rows * cols)]
+
+    def canonical(self, cells):
+        """(key, perm) of the symmetric copy of cells with the smallest key."""
+        powers = self.powers
+        return min((sum(cells[source] * power for source, power in zip(perm, powers)), perm)
+                   for perm in self.symmetries)
+
+    def encode(self, board, marks=MARKS):
+        """Cells of a board given as rows of "", marks[0] and marks[1]."""
+        codes = {"": 0, marks[0]: 1, marks[1]: 2}
+        return tuple(codes[cell] for row in board for cell in row)
+
+    def lookup(self, board, marks=MARKS):
+        """(score, best move as (row, col), or None once the game is over) for the side to move."""
+        key, perm = self.canonical(self.encode(board, marks))
+        score, move = self.entries[key]
+        if move == NO_MOVE:
+            return score, None
+        cell = perm[move]  # Back from the canonical board to this one
+        return score, (cell // self.cols, cell % self.cols)
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        keys = np.fromiter(self.entries, dtype=np.uint64, count=len(self.entries))
+        keys.sort()
+        values = [self.entries[int(key)] for key in keys]
+        np.savez_compressed(path, shape=np.array([self.rows, self.cols, self.win_length]), keys=keys,
+                            scores=np.array([score for score, _ in values], dtype=np.int8),
+                            moves=np.array([move for _, move in values], dtype=np.uint8))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            rows, cols, win_length = data['shape'].tolist()
+            entries = dict(zip(data['keys'].tolist(), zip(data['scores'].tolist(), data['moves'].tolist())))
+        return cls(rows, cols, win_length, entries)
+
+
+def solve(rows=ROWS, cols=COLS, win_length=WIN_LENGTH):
+    """
+    Solve a k-in-a-row game by retrograde analysis.
+
+    Every reachable position is enumerated once, layer by layer by number
+    of marks, keeping one representative per symmetry class. The layers
+    are then scored from the fullest back to the empty board, so each
+    position only looks up its children's finished scores.
+    """
+    table = PerfectPlayTable(rows, cols, win_length, {})
+    lines = winning_lines(rows, cols, win_length)
+    cells = rows * cols
+
+    def is_over(position):
+        return any(position[line[0]] and all(position[i] == position[line[0]] for i in line) for line in lines)
+
+    def children(position):
+        mark = 1 if position.count(1) == position.count(2) else 2
+        for i in range(cells):
+            if position[i] == 0:
+                yield i, position[:i] + (mark,) + position[i + 1:]
+
+    def representative(position):
+        _, perm = table.canonical(position)
+        return tuple(position[source] for source in perm)
+
+    layers = [{representative((0,) * cells)}]
+    for _ in range(cells):
+        layers.append({representative(child) for position in layers[-1] if not is_over(position)
+                       for _, child in children(position)})
+
+    entries = table.entries
+    for layer in reversed(layers):
+        for position in layer:
+            key = table.canonical(position)[0]
+            if is_over(position):
+                entries[key] = (-WIN, NO_MOVE)  # The player who just moved completed a line
+            elif 0 not in position:
+                entries[key] = (0, NO_MOVE)
+            else:
+                best = None
+                for i, child in children(position):
+                    score = child_score(entries[table.canonical(child)[0]][0])
+                    if best is None or score > best[0]:  # Ties go to the first cell
+                        best = (score, i)
+                entries[key] = best
+    return table
+
+
+def load_or_solve(path=TABLE_PATH, rows=ROWS, cols=COLS, win_length=WIN_LENGTH):
+    """The table for this game from path, solved and saved there first if missing or for another game."""
+    if os.path.exists(path):
+        table = PerfectPlayTable.load(path)
+        if (table.rows, table.cols, table.win_length) == (rows, cols, win_length):
+            return table
+    table = solve(rows, cols, win_length)
+    table.save(path)
+    return table
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Solve a small k-in-a-row game and save its perfect-play table.")
+    parser.add_argument("--rows", type=int, default=ROWS)
+    parser.add_argument("--cols", type=int, default=COLS)
+    parser.add_argument("--win-length", type=int, default=WIN_LENGTH)
+    parser.add_argument("--output", help="Where to save the table (default: outputs/solver/<rows>x<cols>x<k>.npz)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    table = solve(args.rows, args.cols, args.win_length)
+    output = args.output or f"outputs/solver/{args.rows}x{args.cols}x{args.win_length}.npz"
+    table.save(output)
+    score, move = table.lookup([[""] * args.cols for _ in range(args.rows)])
+    outcome = "first player wins" if score > 0 else "second player wins" if score < 0 else "draw"
+    print(f"{len(table.entries)} positions up to symmetry solved in {time.perf_counter() - start:.2f}s: "
+          f"{outcome} (score {score}), best first move {move}. Saved to {output}")
@@ -0,0 +1,127 @@
+# models/export.py
+
+import argparse
+import time
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+from config.game_config import BOARD_SIZE
+from models.dq_network import DQNetworkCNN
+
+
+def load_eager_model(weights_path, board_size=BOARD_SIZE):
+    """DQNetworkCNN in eval mode with the weights of a saved state dict (e.g. sos_dqn.pth)."""
+    model = DQNetworkCNN(board_size * board_size * 2, board_size)
+    model.load_state_dict(torch.load(weights_path, map_location='cpu'))
+    model.eval()
+    return model
+
+
+def export_model(weights_path, output_path, quantize=False, board_size=BOARD_SIZE):
+    """
+    Export a trained DQNetworkCNN as a frozen TorchScript inference artifact.
+
+    The model is traced and frozen (weights inlined as constants). With
+    quantize the fully connected layers, which hold almost all the weights,
+    are dynamically quantized to int8 first. Fusion happens at load time,
+    see load_inference_model.
+    """
+    model = load_eager_model(weights_path, board_size)
+    if quantize:
+        model = torch.ao.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+
+    example = torch.zeros(1, board_size, board_size)
+    with torch.no_grad():
+        traced = torch.jit.trace(model, example)
+        frozen = torch.jit.freeze(traced)
+    torch.jit.save(frozen, output_path)
+    return frozen
+
+
+def load_inference_model(path, board_size=BOARD_SIZE, fuse=False):
+    """
+    Load a model for move serving: an exported TorchScript artifact, or
+    the eager network when given a plain state dict (.pth).
+
+    fuse runs optimize_for_inference on the artifact, which fuses conv/ReLU
+    pairs into oneDNN kernels. That is a clear win from batch ~32 up, but a
+    fixed layout conversion cost makes single-board calls slower, so leave
+    it off for one-game-at-a-time callers like the GUIs. (Fused modules
+    cannot be saved, which is why this is not done at export time.)
+    """
+    if path.endswith('.pth'):
+        return load_eager_model(path, board_size)
+    model = torch.jit.load(path, map_location='cpu')
+    model.eval()
+    if fuse:
+        model = torch.jit.optimize_for_inference(model)
+    return model
+
+
+def random_positions(count, board_size=BOARD_SIZE, seed=0):
+    """Random SOS observations (0 empty, 1 S, 2 O) with their legal-action masks."""
+    rng = np.random.default_rng(seed)
+    states = rng.choice(3, size=(count, board_size, board_size), p=[0.5, 0.25, 0.25]).astype(np.float32)
+    masks = np.repeat(states.reshape(count, -1) == 0, 2, axis=1)
+    return torch.from_numpy(states), torch.from_numpy(masks)
+
+
+def check_accuracy(eager_model, exported_model, count=1024, board_size=BOARD_SIZE):
+    """Max absolute Q-value error and masked best-move agreement on random positions."""
+    states, masks = random_positions(count, board_size)
+    with torch.no_grad():
+        expected = eager_model(states)
+        actual = exported_model(states)
+    best_expected = expected.masked_fill(~masks, float('-inf')).argmax(dim=1)
+    best_actual = actual.masked_fill(~masks, float('-inf')).argmax(dim=1)
+    return {
+        'max_abs_error': (expected - actual).abs().max().item(),
+        'best_move_agreement': (best_expected == best_actual).float().mean().item(),
+    }
+
+
+def measure_latency(model, batch_size, repeats=50, board_size=BOARD_SIZE):
+    """Median wall-clock time of one forward pass, in milliseconds."""
+    states, _ = random_positions(batch_size, board_size)
+    timings = []
+    with torch.no_grad():
+        for _ in range(5):  # Warm-up (TorchScript profiles the first calls)
+            model(states)
+        for _ in range(repeats):
+            start = time.perf_counter()
+            model(states)
+            timings.append(time.perf_counter() - start)
+    return float(np.median(timings)) * 1000
+
+
+def compare_latency(eager_model, exported_model, batch_sizes=(1, 32, 1024), board_size=BOARD_SIZE):
+    """{batch_size: (eager_ms, exported_ms)} for each batch size."""
+    return {
+        batch_size: (measure_latency(eager_model, batch_size, board_size=board_size),
+                     measure_latency(exported_model, batch_size, board_size=board_size))
+        for batch_size in batch_sizes
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Export DQNetworkCNN for CPU inference.')
+    parser.add_argument('weights', nargs='?', default='outputs/models/sos_dqn.pth')
+    parser.add_argument('output', nargs='?', default='outputs/models/sos_dqn.pt')
+    parser.add_argument('--quantize', action='store_true', help='Quantize the linear layers to int8')
+    parser.add_argument('--no-check', action='store_true', help='Skip the accuracy and latency report')
+    args = parser.parse_args()
+
+    export_model(args.weights, args.output, quantize=args.quantize)
+    print(f"Exported {args.weights} -> {args.output}")
+    if not args.no_check:
+        eager = load_eager_model(args.weights)
+        for fuse in (False, True):
+            exported = load_inference_model(args.output, fuse=fuse)
+            accuracy = check_accuracy(eager, exported)
+            print(f"{'Fused' if fuse else 'Unfused'}: max |Q error| {accuracy['max_abs_error']:.2e}, "
+                  f"best-move agreement {accuracy['best_move_agreement']:.2%}")
+            for batch_size, (eager_ms, exported_ms) in compare_latency(eager, exported).items():
+                print(f"  Batch {batch_size:5d}: eager {eager_ms:.3f} ms, exported {exported_ms:.3f} ms "
+                      f"({eager_ms / exported_ms:.2f}x)")
@@ -0,0 +1,258 @@
+# models/inference_server.py
+
+import argparse
+import asyncio
+import collections
+import json
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import torch
+
+from config.game_config import (BOARD_SIZE, SERVER_HOST, SERVER_MAX_BATCH, SERVER_MAX_LATENCY_MS, SERVER_MODEL,
+                                SERVER_PORT)
+from models.export import load_inference_model
+from training.policy import masked_argmax
+
+
+class MicroBatcher:
+    """
+    Collects move requests from many games into dynamic batches.
+
+    A batch is closed when it holds max_batch boards or max_latency_ms after
+    its first request arrived, whichever comes first, and is answered with
+    one forward pass. The forward pass runs on a worker thread, so the next
+    batch fills up while the current one is being computed.
+    """
+
+    def __init__(self, model, board_size=BOARD_SIZE, max_batch=SERVER_MAX_BATCH,
+                 max_latency_ms=SERVER_MAX_LATENCY_MS, latency_window=10000):
+        self.model = model
+        self.board_size = board_size
+        self.max_batch = max_batch
+        self.max_latency = max_latency_ms / 1000
+        self.queue = asyncio.Queue()
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.latencies = collections.deque(maxlen=latency_window)
+        self.requests = 0
+        self.batches = 0
+        self.task = None
+
+    def start(self):
+        self.task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        self.executor.shutdown()
+
+    async def best_action(self, board, mask=None):
+        """Masked best action (encode_action index) for one board of 0 empty / 1 S / 2 O cells."""
+        board = np.asarray(board, dtype=np.float32)
+        if board.size != self.board_size * self.board_size:
+            raise ValueError(f"Board has {board.size} cells, expected {self.board_size * self.board_size}")
+        board = board.reshape(self.board_size, self.board_size)
+        if mask is None:
+            mask = np.repeat(board.reshape(-1) == 0, 2)
+        mask = np.asarray(mask, dtype=bool).reshape(-1)
+        if mask.size != board.size * 2:
+            raise ValueError(f"Mask has {mask.size} entries, expected {board.size * 2}")
+        if not mask.any():
+            raise ValueError("No legal moves")
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((board, mask, future, time.perf_counter()))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_latency
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            # Requests whose client went away are dropped before the forward pass
+            batch = [item for item in batch if not item[2].done()]
+            if not batch:
+                continue
+
+            try:
+                boards = np.stack([item[0] for item in batch])
+                masks = np.stack([item[1] for item in batch])
+                actions = await loop.run_in_executor(self.executor, self._forward, boards, masks)
+            except Exception as error:
+                # Fail this batch's requests, but keep serving the next ones
+                for _, _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+
+            done = time.perf_counter()
+            for (_, _, future, start), action in zip(batch, actions):
+                if not future.done():
+                    future.set_result(int(action))
+                self.latencies.append(done - start)
+            self.requests += len(batch)
+            self.batches += 1
+
+    def _forward(self, boards, masks):
+        with torch.no_grad():
+            q_values = self.model(torch.from_numpy(boards))
+        return masked_argmax(q_values, torch.from_numpy(masks)).numpy()
+
+    def metrics(self):
+        """Queue depth, throughput counters and request latency percentiles (ms) over recent requests."""
+        latencies = np.array(self.latencies) * 1000
+        metrics = {
+            'queue_depth': self.queue.qsize(),
+            'requests': self.requests,
+            'batches': self.batches,
+            'mean_batch_size': self.requests / self.batches if self.batches else 0.0,
+        }
+        if len(latencies):
+            metrics.update({f'latency_p{q}_ms': float(np.percentile(latencies, q)) for q in (50, 95, 99)})
+        return metrics
+
+
+class InferenceServer:
+    """
+    Serves MicroBatcher over newline-delimited JSON on localhost TCP or a Unix socket.
+
+    Requests and replies, one JSON object per line:
+        {"id": 1, "board": [0, 1, 2, ...]}      -> {"id": 1, "action": 17}
+        {"id": 2, "board": [...], "mask": [...]} (explicit legal-action mask)
+        {"id": 3, "op": "metrics"}              -> {"id": 3, "metrics": {...}}
+    Errors are answered as {"id": ..., "error": "..."}. A connection may
+    pipeline requests; replies can come back out of order, matched by id.
+    """
+
+    def __init__(self, model, board_size=BOARD_SIZE, host=SERVER_HOST, port=SERVER_PORT, unix_path=None,
+                 max_batch=SERVER_MAX_BATCH, max_latency_ms=SERVER_MAX_LATENCY_MS):
+        self.batcher = MicroBatcher(model, board_size, max_batch, max_latency_ms)
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+        self.server = None
+
+    async def start(self):
+        self.batcher.start()
+        if self.unix_path:
+            self.server = await asyncio.start_unix_server(self._handle, path=self.unix_path)
+        else:
+            self.server = await asyncio.start_server(self._handle, self.host, self.port)
+            self.port = self.server.sockets[0].getsockname()[1]  # Resolves port 0
+        return self
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+        await self.batcher.stop()
+
+    async def serve_forever(self):
+        await self.start()
+        address = self.unix_path or f"{self.host}:{self.port}"
+        print(f"Serving moves on {address} (max batch {self.batcher.max_batch}, "
+              f"max latency {self.batcher.max_latency * 1000:.1f} ms)")
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def _handle(self, reader, writer):
+        write_lock = asyncio.Lock()
+        pending = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                task = asyncio.create_task(self._answer(line, writer, write_lock))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+        finally:
+            for task in pending:
+                task.cancel()
+            writer.close()
+
+    async def _answer(self, line, writer, write_lock):
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get('id')
+            if request.get('op') == 'metrics':
+                reply = {'id': request_id, 'metrics': self.batcher.metrics()}
+            else:
+                action = await self.batcher.best_action(request['board'], request.get('mask'))
+                reply = {'id': request_id, 'action': action}
+        except Exception as error:  # Bad requests and failed batches alike get an error reply
+            reply = {'id': request_id, 'error': str(error)}
+        async with write_lock:
+            writer.write((json.dumps(reply) + '\n').encode())
+            await writer.drain()
+
+
+class InferenceClient:
+    """Blocking client for InferenceServer, e.g. one per GUI session."""
+
+    def __init__(self, host=SERVER_HOST, port=SERVER_PORT, unix_path=None, timeout=5.0):
+        if unix_path:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.settimeout(timeout)
+            self.sock.connect(unix_path)
+        else:
+            self.sock = socket.create_connection((host, port), timeout=timeout)
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.file = self.sock.makefile('rb')
+        self.next_id = 0
+
+    def _call(self, request):
+        self.next_id += 1
+        request['id'] = self.next_id
+        self.sock.sendall((json.dumps(request) + '\n').encode())
+        reply = json.loads(self.file.readline())
+        if 'error' in reply:
+            raise ValueError(reply['error'])
+        return reply
+
+    def best_action(self, observation, mask=None):
+        """Masked best action for an observation (0 empty, 1 S, 2 O), as an encode_action index."""
+        request = {'board': np.asarray(observation).reshape(-1).astype(int).tolist()}
+        if mask is not None:
+            request['mask'] = np.asarray(mask, dtype=bool).astype(int).tolist()
+        return self._call(request)['action']
+
+    def metrics(self):
+        return self._call({'op': 'metrics'})['metrics']
+
+    def close(self):
+        self.file.close()
+        self.sock.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Serve SOS agent moves to many games with micro-batching.')
+    parser.add_argument('model', nargs='?', default=SERVER_MODEL,
+                        help='State dict (.pth) or exported TorchScript model')
+    parser.add_argument('--host', default=SERVER_HOST)
+    parser.add_argument('--port', type=int, default=SERVER_PORT)
+    parser.add_argument('--unix', help='Listen on this Unix socket path instead of TCP')
+    parser.add_argument('--max-batch', type=int, default=SERVER_MAX_BATCH)
+    parser.add_argument('--max-latency-ms', type=float, default=SERVER_MAX_LATENCY_MS,
+                        help='How long the first request of a batch may wait for others')
+    args = parser.parse_args()
+
+    model = load_inference_model(args.model, fuse=True)
+    server = InferenceServer(model, host=args.host, port=args.port, unix_path=args.unix,
+                             max_batch=args.max_batch, max_latency_ms=args.max_latency_ms)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
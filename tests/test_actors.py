@@ -0,0 +1,73 @@
+# tests/test_actors.py
+
+import json
+import os
+import queue
+import tempfile
+import threading
+import unittest
+
+import numpy as np
+import torch
+
+from models.dq_network import DQNetworkCNN
+from training import actors
+
+
+def collect_messages(seed, count=3):
+    """Run actor_worker in a thread until it has produced count messages."""
+    torch.manual_seed(0)
+    shared_net = DQNetworkCNN(50)
+    transition_queue = queue.Queue(maxsize=count)
+    stop_event = threading.Event()
+    version = type('Version', (), {'value': 0})()
+    worker = threading.Thread(target=actors.actor_worker,
+                              args=(0, seed, 0.5, shared_net, threading.Lock(), version,
+                                    transition_queue, stop_event))
+    worker.start()
+    messages = [transition_queue.get(timeout=30) for _ in range(count)]
+    stop_event.set()
+    worker.join(timeout=30)
+    return messages
+
+
+class TestActors(unittest.TestCase):
+    def test_actor_epsilon_schedule(self):
+        epsilons = [actors.actor_epsilon(i, 8) for i in range(8)]
+        self.assertAlmostEqual(epsilons[0], actors.ACTOR_EPSILON_BASE)
+        self.assertTrue(all(a > b for a, b in zip(epsilons, epsilons[1:])))
+        self.assertEqual(actors.actor_epsilon(0, 1), actors.ACTOR_EPSILON_BASE)
+
+    def test_worker_messages_are_seeded(self):
+        first = collect_messages(seed=3)
+        second = collect_messages(seed=3)
+        steps = actors.ACTOR_SEND_STEPS * actors.ACTOR_NUM_ENVS
+        for a, b in zip(first, second):
+            self.assertEqual(len(a[2]), steps)
+            self.assertEqual(a[1].shape, (steps, 5, 5))
+            for column_a, column_b in zip(a[1:6], b[1:6]):
+                np.testing.assert_array_equal(column_a, column_b)
+
+    def test_train_with_actors(self):
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            try:
+                actors.train_with_actors(num_actors=2, num_episodes=20)
+                self.assertTrue(os.path.exists(os.path.join('outputs', 'models', 'sos_dqn.pth')))
+                with open(actors.METRICS_PATH) as f:
+                    record = json.loads(f.readlines()[-1])
+            finally:
+                os.chdir(cwd)
+
+        # One update per ACTOR_TRANSITIONS_PER_UPDATE transitions, except those ingested while
+        # the buffer was still filling to a batch
+        untrained = record['steps'] - record['updates'] * actors.ACTOR_TRANSITIONS_PER_UPDATE
+        self.assertGreater(record['updates'], 0)
+        self.assertGreaterEqual(untrained, 0)
+        self.assertLess(untrained, actors.BATCH_SIZE + actors.ACTOR_SEND_STEPS * actors.ACTOR_NUM_ENVS
+                        + actors.ACTOR_TRANSITIONS_PER_UPDATE)
+
+
+if __name__ == '__main__':
+    unittest.main()
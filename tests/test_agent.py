@@ -1,8 +1,8 @@
-import torch
 import matplotlib.pyplot as plt
-from models.dq_network import DQNetworkCNN
+from models.export import load_inference_model
 from game.game_env import SOSGameEnv
-from training.train import decode_action, encode_action
+from training.policy import select_actions
+from training.train import decode_action
 
 
 def test_agent(policy_net, env):
@@ -14,20 +14,12 @@ def test_agent(policy_net, env):
     total_reward = 0
 
     while not done:
-        state_tensor = torch.FloatTensor(state).unsqueeze(0)  # Convert state to tensor
-        with torch.no_grad():
-            q_values = policy_net(state_tensor)
-
         # Determine valid actions
-        valid_actions = env.available_actions()
-        if not valid_actions:
+        if not env.legal_mask.any():
             break
 
-        # Select the best valid action
-        valid_action_indices = [encode_action(a, env.board_size) for a in valid_actions]
-        q_values_valid = q_values[0, valid_action_indices]
-        max_q_index = torch.argmax(q_values_valid).item()
-        action_index = valid_action_indices[max_q_index]
+        # Select the best valid action (batch of one, zero-copy views of the env buffers)
+        action_index = select_actions(policy_net, env.observation[None], env.legal_mask[None]).item()
 
         # Decode the selected action and execute it
         row, col, letter = decode_action(action_index, env.board_size)
@@ -37,16 +29,16 @@ def test_agent(policy_net, env):
     return total_reward, env.scores  # Return total reward and final scores
 
 
+test_agent.__test__ = False  # An evaluation helper, not a pytest test
+
+
 def evaluate_agent(num_games=10):
     """
     Evaluates the agent over multiple games and visualizes performance.
     """
     # Initialize the game environment and the trained policy network
     env = SOSGameEnv()
-    action_size = env.board_size * env.board_size * 2
-    policy_net = DQNetworkCNN(action_size)
-    policy_net.load_state_dict(torch.load('../training/outputs/models/sos_dqn.pth'))
-    policy_net.eval()  # Set the model to evaluation mode
+    policy_net = load_inference_model('../training/outputs/models/sos_dqn.pth', env.board_size)
 
     # Metrics to track
     rewards = []
@@ -0,0 +1,229 @@
+# tests/test_alphabeta.py
+
+import functools
+import os
+import random
+import subprocess
+import sys
+import time
+import unittest
+
+from benchmarks.harness import REPO_ROOT, load_script
+
+alphabeta = load_script(os.path.join('Minimax+AlphaBeta', 'engine.py'), 'alphabeta_engine')
+PLAYER, AI = alphabeta.PLAYER, alphabeta.AI
+
+
+def random_board(rng, marks, rows=5, cols=5):
+    board = [["" for _ in range(cols)] for _ in range(rows)]
+    for i, cell in enumerate(rng.sample(range(rows * cols), marks)):
+        board[cell // cols][cell % cols] = PLAYER if i % 2 == 0 else AI
+    return board
+
+
+@functools.lru_cache(maxsize=None)
+def scan_lines(rows, cols, length):
+    """Cells of every row, column and diagonal run of `length` cells on the board."""
+    lines = []
+    for row in range(rows):
+        for col in range(cols):
+            for d_row, d_col in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                cells = [(row + d_row * i, col + d_col * i) for i in range(length)]
+                if all(0 <= r < rows and 0 <= c < cols for r, c in cells):
+                    lines.append(cells)
+    return lines
+
+
+def scan_sequences(engine, player, length):
+    """Runs of `length` marks of player, by scanning every row, column and diagonal as the original code did."""
+    board = engine.board
+    return sum(all(board[r][c] == player for r, c in cells)
+               for cells in scan_lines(engine.rows, engine.cols, length))
+
+
+def scan_evaluation(engine):
+    score = {mark: scan_sequences(engine, mark, engine.win_length) * 10
+             + scan_sequences(engine, mark, engine.win_length - 1) * 5 for mark in (PLAYER, AI)}
+    return score[AI] - score[PLAYER]
+
+
+_plain_values = {}
+
+
+def plain_minimax(engine, depth, is_maximizing):
+    """
+    Exhaustive minimax over board scans, without pruning or any of the
+    engine's tables, scored like engine.minimax(). Results are cached by
+    position, which only saves the scans from being repeated.
+    """
+    key = (tuple(cell for row in engine.board for cell in row), engine.win_length, depth, is_maximizing)
+    if key not in _plain_values:
+        _plain_values[key] = _plain_minimax(engine, depth, is_maximizing)
+    return _plain_values[key]
+
+
+def _plain_minimax(engine, depth, is_maximizing):
+    if scan_sequences(engine, AI, engine.win_length):
+        return engine.win_score + depth
+    if scan_sequences(engine, PLAYER, engine.win_length):
+        return -engine.win_score - depth
+    if not engine.empty_cells() or depth == 0:
+        return scan_evaluation(engine)
+    values = []
+    for row, col in engine.empty_cells():
+        engine.board[row][col] = AI if is_maximizing else PLAYER
+        values.append(plain_minimax(engine, depth - 1, not is_maximizing))
+        engine.board[row][col] = ""
+    return max(values) if is_maximizing else min(values)
+
+
+class TestWindowCounts(unittest.TestCase):
+    def test_incremental_counts_match_scans(self):
+        rng = random.Random(3)
+        for shape in ((5, 5, 4), (4, 6, 3)):
+            engine = alphabeta.AlphaBetaEngine(*shape)
+            placed = []
+            for _ in range(200):
+                if placed and (not engine.empty_cells() or rng.random() < 0.4):
+                    engine.remove_mark(*placed.pop(rng.randrange(len(placed))))
+                else:
+                    cell = rng.choice(engine.empty_cells())
+                    engine.place_mark(*cell, rng.choice((PLAYER, AI)))
+                    placed.append(cell)
+                self.assertEqual(engine.evaluate(), scan_evaluation(engine))
+                for mark in (PLAYER, AI):
+                    self.assertEqual(engine.is_winner(mark), scan_sequences(engine, mark, engine.win_length) > 0)
+                self.assertEqual(engine.is_full(), not engine.empty_cells())
+
+    def test_windows(self):
+        self.assertEqual(len(alphabeta.build_windows(5, 5, 4)), 2 * 5 * 2 + 2 * 2 * 2)
+        engine = alphabeta.AlphaBetaEngine()
+        self.assertEqual(len(engine.cell_windows[0][0]), 3 + 3)  # One 4-cell and one 3-cell run per direction
+        self.assertEqual(sum(len(cells) for row in engine.cell_windows for cells in row),
+                         sum(len(window) for window in engine.windows))
+
+
+class TestTranspositionTable(unittest.TestCase):
+    def test_incremental_hash_matches_rehash(self):
+        rng = random.Random(0)
+        engine = alphabeta.AlphaBetaEngine()
+        engine.set_board(random_board(rng, 6))
+        for _ in range(50):
+            row, col = rng.choice(engine.empty_cells())
+            engine.place_mark(row, col, rng.choice((PLAYER, AI)))
+            key = engine.hash
+            engine.set_board(engine.board)
+            self.assertEqual(engine.hash, key)
+            if rng.random() < 0.5:
+                engine.remove_mark(row, col)
+            if not engine.empty_cells():
+                engine.set_board(random_board(rng, 6))
+
+    def test_search_matches_plain_minimax(self):
+        rng = random.Random(1)
+        engine = alphabeta.AlphaBetaEngine()
+        for _ in range(10):
+            engine.set_board(random_board(rng, rng.randint(10, 14)))
+            expected = plain_minimax(engine, 3, True)
+            for _ in range(2):  # The second search is answered from the table
+                self.assertEqual(engine.minimax(3, float('-inf'), float('inf'), True), expected)
+
+    def test_takes_win_and_keeps_table_until_new_game(self):
+        engine = alphabeta.AlphaBetaEngine()
+        engine.set_board([["X", "X", "X", "", ""],
+                          ["", "", "", "", ""],
+                          ["", "", "X", "", ""],
+                          ["", "", "", "", ""],
+                          ["O", "O", "O", "", ""]])
+        move, score, _ = engine.search(time_limit=0.2)
+        self.assertEqual(move, (4, 3))
+        self.assertGreater(score, engine.win_score // 2)
+        self.assertTrue(any(engine.transposition_table))
+
+        engine.set_board()
+        self.assertFalse(any(engine.transposition_table))
+        self.assertEqual(engine.hash, 0)
+
+
+class TestIterativeDeepening(unittest.TestCase):
+    def test_matches_fixed_depth_search(self):
+        rng = random.Random(2)
+        engine = alphabeta.AlphaBetaEngine()
+        for _ in range(5):
+            engine.set_board(random_board(rng, 12))
+            if engine.is_winner(AI) or engine.is_winner(PLAYER):
+                continue
+            move, score, depth = engine.search(time_limit=None, max_depth=3)
+            if abs(score) < engine.win_score // 2:
+                self.assertEqual(depth, 3)
+            row, col = move
+            engine.place_mark(row, col, AI)
+            self.assertEqual(plain_minimax(engine, depth - 1, False), score)
+            engine.remove_mark(row, col)
+            self.assertEqual(score, plain_minimax(engine, depth, True))
+
+    def test_time_limit_keeps_board_and_deepest_move(self):
+        engine = alphabeta.AlphaBetaEngine()
+        engine.place_mark(0, 0, PLAYER)
+        board = [row[:] for row in engine.board]
+        key = engine.hash
+        start = time.perf_counter()
+        move, _, depth = engine.search(time_limit=0.3)
+        self.assertLess(time.perf_counter() - start, 1.5)
+        self.assertGreaterEqual(depth, 2)
+        self.assertLess(depth, 24)
+        self.assertEqual(engine.board, board)
+        self.assertEqual(engine.hash, key)
+        self.assertEqual(engine.board[move[0]][move[1]], "")
+
+    def test_move_ordering(self):
+        engine = alphabeta.AlphaBetaEngine()
+        self.assertEqual(engine.ordered_moves(AI)[0], (2, 2))
+        engine.record_cutoff((0, 4), AI, 3, 25)
+        engine.history[AI][4][4] = 100
+        moves = engine.ordered_moves(AI, hash_move=(1, 1))
+        self.assertEqual(moves[:4], [(1, 1), (0, 4), (4, 4), (2, 2)])
+        self.assertEqual(len(moves), 25)
+
+
+class TestEngine(unittest.TestCase):
+    def test_headless_and_configurable(self):
+        self.assertNotIn('pygame', vars(alphabeta))
+        engine = alphabeta.AlphaBetaEngine(rows=3, cols=3, win_length=3)
+        engine.set_board([["X", "X", ""],
+                          ["O", "", ""],
+                          ["", "", ""]])
+        self.assertEqual(engine.search(time_limit=None)[0], (0, 2))  # Must block
+        first = alphabeta.AlphaBetaEngine(3, 3, 3)
+        first.set_board()
+        _, score, depth = first.search(time_limit=None)
+        self.assertEqual(depth, 9)
+        self.assertLess(abs(score), first.win_score // 2)  # Tic-tac-toe is a draw
+
+    def test_frontend_import_opens_no_window(self):
+        # What a spawned pool worker does: re-import the frontend without running it
+        code = "import main, pygame; print(main.SCREEN is None and not pygame.display.get_init())"
+        env = dict(os.environ, SDL_VIDEODRIVER='dummy', SDL_AUDIODRIVER='dummy', PYGAME_HIDE_SUPPORT_PROMPT='1')
+        output = subprocess.run([sys.executable, '-c', code], cwd=os.path.join(REPO_ROOT, 'Minimax+AlphaBeta'),
+                                env=env, capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.strip(), 'True')
+
+    def test_parallel_root_split_matches_serial(self):
+        rng = random.Random(4)
+        engine = alphabeta.ParallelAlphaBetaEngine(workers=2)
+        try:
+            for _ in range(3):
+                board = random_board(rng, 10)
+                engine.set_board(board)
+                serial = alphabeta.AlphaBetaEngine()
+                serial.set_board(board)
+                self.assertEqual(engine.search(time_limit=None, max_depth=3),
+                                 serial.search(time_limit=None, max_depth=3))
+                self.assertEqual(engine.board, board)
+                self.assertGreater(engine.nodes, 0)
+        finally:
+            engine.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
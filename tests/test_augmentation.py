@@ -0,0 +1,78 @@
+# tests/test_augmentation.py
+
+import random
+import unittest
+
+import numpy as np
+
+from game.game_env import SOSGameEnv
+from training.augmentation import NUM_SYMMETRIES, augment_batch, symmetry_tables, transform
+from training.replay_buffer import ReplayBuffer
+from training.train import decode_action, encode_action
+
+
+def play_random_game(seed, board_size=5):
+    rng = random.Random(seed)
+    env = SOSGameEnv(board_size)
+    state = env.reset()
+    transitions = []
+    done = False
+    while not done:
+        action = rng.choice(env.available_actions())
+        next_state, reward, done, _ = env.step(action)
+        transitions.append((state, encode_action(action, board_size), reward, next_state, done))
+        state = next_state
+    return [np.array(column) for column in zip(*transitions)]
+
+
+class TestAugmentation(unittest.TestCase):
+    def test_tables_are_permutations(self):
+        cell_sources, action_targets = symmetry_tables(5)
+        self.assertEqual(cell_sources.shape, (NUM_SYMMETRIES, 25))
+        self.assertEqual(action_targets.shape, (NUM_SYMMETRIES, 50))
+        np.testing.assert_array_equal(cell_sources[0], np.arange(25))
+        np.testing.assert_array_equal(action_targets[0], np.arange(50))
+        for k in range(NUM_SYMMETRIES):
+            np.testing.assert_array_equal(np.sort(action_targets[k]), np.arange(50))
+            np.testing.assert_array_equal(action_targets[k] % 2, np.arange(50) % 2)
+        self.assertEqual(len({tuple(row) for row in cell_sources}), NUM_SYMMETRIES)
+
+    def test_transformed_games_are_valid_games(self):
+        for board_size in (5, 6):
+            states, actions, rewards, next_states, dones = play_random_game(board_size, board_size)
+            for k in range(NUM_SYMMETRIES):
+                symmetries = np.full(len(actions), k)
+                t_states, t_actions, t_next_states = transform(states, actions, next_states, symmetries)
+                env = SOSGameEnv(board_size)
+                env.reset()
+                for i in range(len(actions)):
+                    np.testing.assert_array_equal(env.get_state(), t_states[i])
+                    next_state, reward, done, _ = env.step(decode_action(t_actions[i], board_size))
+                    self.assertEqual(reward, rewards[i])
+                    np.testing.assert_array_equal(next_state, t_next_states[i])
+
+    def test_augment_batch_keeps_rewards_and_dones(self):
+        batch = play_random_game(1)
+        augmented = augment_batch(batch)
+        np.testing.assert_array_equal(augmented[2], batch[2])
+        np.testing.assert_array_equal(augmented[4], batch[4])
+        self.assertEqual(augmented[0].shape, batch[0].shape)
+
+    def test_replay_buffer_modes(self):
+        states, actions, rewards, next_states, dones = play_random_game(2)
+        pushed = ReplayBuffer(1000, augment='push')
+        pushed.push_batch(states, actions, rewards, next_states, dones)
+        pushed.push(states[0], actions[0], rewards[0], next_states[0], dones[0])
+        self.assertEqual(len(pushed), (len(actions) + 1) * NUM_SYMMETRIES)
+
+        sampled = ReplayBuffer(1000, augment='sample')
+        sampled.push_batch(states, actions, rewards, next_states, dones)
+        self.assertEqual(len(sampled), len(actions))
+        self.assertEqual(sampled.sample(16)[0].shape, (16, 5, 5))
+
+        with self.assertRaises(ValueError):
+            ReplayBuffer(10, augment='always')
+
+
+if __name__ == '__main__':
+    unittest.main()
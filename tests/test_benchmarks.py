@@ -0,0 +1,50 @@
+# tests/test_benchmarks.py
+
+import os
+import tempfile
+import unittest
+
+from benchmarks.harness import compare, load_results, save_results, time_case
+from benchmarks.run import CASES, GRID_MIDGAME, grid, load_script
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_time_case_reports_per_op(self):
+        calls = []
+        stats = time_case(lambda: calls.append(1), ops=4, repeats=3, min_time=0.001)
+        self.assertGreaterEqual(len(calls), 1 + 3 * stats['calls_per_repeat'])
+        self.assertEqual(stats['ops_per_call'], 4)
+        self.assertLessEqual(stats['min_us'], stats['median_us'])
+
+    def test_compare_flags_regressions(self):
+        baseline = {'a': {'median_us': 10.0}, 'b': {'median_us': 10.0}, 'c': {'median_us': 10.0}}
+        results = {'a': {'median_us': 14.0}, 'b': {'median_us': 7.0}, 'c': {'median_us': 11.0},
+                   'd': {'median_us': 1.0}}
+        statuses = {row[0]: row[4] for row in compare(results, baseline, threshold=0.25)}
+        self.assertEqual(statuses, {'a': 'regression', 'b': 'improvement', 'c': 'ok', 'd': 'new'})
+
+    def test_results_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'results.json')
+            save_results({'a': {'median_us': 1.5}}, path)
+            self.assertEqual(load_results(path), {'a': {'median_us': 1.5}})
+
+    def test_cases_build(self):
+        for name, factory in CASES.items():
+            if 'depth=3' in name or 'depth=5' in name or 'inference[1024]' in name:
+                continue  # Too slow for the unit suite
+            with self.subTest(name=name):
+                run, ops = factory()
+                run()
+                self.assertGreater(ops, 0)
+
+    def test_fixed_grid_is_undecided(self):
+        alphabeta_engine = load_script(os.path.join('Minimax+AlphaBeta', 'engine.py'), 'alphabeta_engine')
+        engine = alphabeta_engine.AlphaBetaEngine()
+        engine.set_board(grid(GRID_MIDGAME))
+        self.assertFalse(engine.is_winner('X'))
+        self.assertFalse(engine.is_winner('O'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+# tests/test_bitboard_env.py
+
+import random
+import unittest
+
+import numpy as np
+
+from game.bitboard_env import BitboardSOSGameEnv
+from game.game_env import SOSGameEnv
+
+
+class TestBitboardSOSGameEnv(unittest.TestCase):
+    def setUp(self):
+        self.env = BitboardSOSGameEnv()
+
+    def test_initial_state(self):
+        state = self.env.reset()
+        self.assertEqual(state.shape, (5, 5))
+        self.assertEqual(state.dtype, np.float32)
+        self.assertTrue((state == 0).all())
+        self.assertEqual(len(self.env.available_actions()), 50)
+
+    def test_sos_scores_and_keeps_turn(self):
+        self.env.step((0, 0, 'S'))
+        self.env.step((0, 1, 'O'))
+        state, reward, done, info = self.env.step((0, 2, 'S'))
+        self.assertEqual(reward, 10)
+        self.assertEqual(self.env.scores['player1'], 1)
+        self.assertEqual(self.env.current_player, 'player1')
+        self.assertEqual(state[0, 2], 1)
+
+    def test_invalid_move(self):
+        self.env.step((0, 0, 'S'))
+        _, reward, done, info = self.env.step((0, 0, 'O'))
+        self.assertEqual(reward, -1)
+        self.assertFalse(done)
+        self.assertTrue(info['invalid_move'])
+        _, reward, _, info = self.env.step((5, 0, 'O'))
+        self.assertTrue(info['invalid_move'])
+
+    def test_matches_string_board_env(self):
+        rng = random.Random(0)
+        for _ in range(50):
+            reference = SOSGameEnv()
+            self.env.reset()
+            done = False
+            while not done:
+                actions = reference.available_actions()
+                self.assertEqual(actions, self.env.available_actions())
+                if rng.random() < 0.05:
+                    action = (rng.randrange(5), rng.randrange(5), rng.choice('SO'))
+                else:
+                    action = rng.choice(actions)
+                expected = reference.step(action)
+                actual = self.env.step(action)
+                np.testing.assert_array_equal(expected[0], actual[0])
+                self.assertEqual(expected[1:], actual[1:])
+                done = actual[2]
+                self.assertEqual(reference.scores, self.env.scores)
+                self.assertEqual(reference.current_player, self.env.current_player)
+            np.testing.assert_array_equal(reference.board, self.env.board)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+# tests/test_checkpoint.py
+
+import contextlib
+import io
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import torch
+
+from training import train as train_module
+from training.checkpoint import CheckpointWriter, load_checkpoint
+
+
+def run_training(num_episodes, resume=False):
+    with mock.patch.object(train_module, 'NUM_EPISODES', num_episodes), \
+            mock.patch.object(train_module, 'CHECKPOINT_EVERY', 8), \
+            contextlib.redirect_stdout(io.StringIO()):
+        train_module.train(resume=resume, checkpoint_path=os.path.join('checkpoints', 'checkpoint.pt'))
+    return torch.load(os.path.join('outputs', 'models', 'sos_dqn.pth'))
+
+
+def seed_everything(seed):
+    random.seed(seed)
+    np.random.seed(seed)
+    torch.manual_seed(seed)
+
+
+class TestCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def test_writer_keeps_latest_snapshot(self):
+        writer = CheckpointWriter(os.path.join('checkpoints', 'latest.pt'))
+        for step in range(20):
+            writer.save({'step': step, 'weights': torch.full((64, 64), float(step))})
+        writer.close()
+        checkpoint = load_checkpoint(os.path.join('checkpoints', 'latest.pt'))
+        self.assertEqual(checkpoint['step'], 19)
+        self.assertFalse(os.path.exists(os.path.join('checkpoints', 'latest.pt.tmp')))
+
+    def test_writer_reports_failed_write(self):
+        with open('blocker', 'w'):
+            pass  # A file where the checkpoint directory should be
+        writer = CheckpointWriter(os.path.join('blocker', 'latest.pt'))
+        writer.save({'step': 0})
+        writer.thread.join(timeout=10)
+        self.assertFalse(writer.thread.is_alive())
+        with self.assertRaises(RuntimeError):
+            writer.save({'step': 1})
+        writer.pending.put_nowait({'step': 2})  # Leave a snapshot nobody will take
+        with self.assertRaises(RuntimeError):
+            writer.close()
+
+    def test_resume_continues_exactly(self):
+        seed_everything(0)
+        uninterrupted = run_training(24)
+
+        os.remove(os.path.join('checkpoints', 'checkpoint.pt'))
+        seed_everything(0)
+        run_training(16)
+        checkpoint = load_checkpoint(os.path.join('checkpoints', 'checkpoint.pt'))
+        self.assertEqual(checkpoint['episode'], 16)
+        self.assertGreater(checkpoint['replay_buffer']['size'], 0)
+        self.assertEqual(set(checkpoint['early_stopping']), {'best', 'stale'})
+
+        seed_everything(123)  # The checkpoint's RNG states must win over the process's
+        resumed = run_training(24, resume=True)
+        for name, tensor in uninterrupted.items():
+            torch.testing.assert_close(resumed[name], tensor, rtol=0, atol=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
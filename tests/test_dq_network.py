@@ -4,11 +4,11 @@ from models.dq_network import DQNetworkCNN
 
 class TestDQNetwork(unittest.TestCase):
     def setUp(self):
-        self.state_size = 25  # 5x5 board flattened
-        self.action_size = 25  # 25 possible actions (one for each cell)
-        self.model = DQNetworkCNN(self.state_size, self.action_size)
+        self.board_size = 5  # 5x5 board
+        self.action_size = 50  # 25 cells x 2 letters ('S' or 'O')
+        self.model = DQNetworkCNN(self.action_size, self.board_size)
 
     def test_forward_pass(self):
-        state = torch.randn(1, self.state_size)  # Random input state
+        state = torch.randn(1, self.board_size, self.board_size)  # Random input board
         q_values = self.model(state)
         self.assertEqual(q_values.shape, (1, self.action_size))  # Ensure correct output shape
@@ -0,0 +1,90 @@
+# tests/test_evaluation.py
+
+import json
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import torch
+
+from game.vector_env import SOSVectorEnv
+from models.dq_network import DQNetworkCNN
+from training.checkpoint import clone_state_dict
+from training.evaluation import BackgroundEvaluator, EarlyStopping, play_match, wilson_interval
+
+
+class TestEvaluation(unittest.TestCase):
+    def setUp(self):
+        torch.manual_seed(0)
+        self.net = DQNetworkCNN(18, 3).eval()
+
+    def test_wilson_interval(self):
+        low, high = wilson_interval(8, 10)
+        self.assertAlmostEqual(low, 0.490, places=3)
+        self.assertAlmostEqual(high, 0.943, places=3)
+        self.assertEqual(wilson_interval(0, 10)[0], 0.0)
+        low, high = wilson_interval(5, 10)
+        self.assertAlmostEqual(0.5 - low, high - 0.5)
+
+    def test_early_stopping(self):
+        stopping = EarlyStopping(patience=2, min_delta=0.05)
+        self.assertFalse(stopping.update(0.5))
+        self.assertFalse(stopping.update(0.6))
+        self.assertFalse(stopping.update(0.62))  # Within min_delta: no improvement
+        self.assertTrue(stopping.update(0.6))
+        self.assertEqual(stopping.best, 0.6)
+        self.assertFalse(EarlyStopping(patience=0).update(0.0))
+
+    def test_early_stopping_state_round_trip(self):
+        stopping = EarlyStopping(patience=3, min_delta=0.05)
+        for value in (0.5, 0.6, 0.62):
+            stopping.update(value)
+        resumed = EarlyStopping(patience=3, min_delta=0.05)
+        resumed.load_state_dict(stopping.state_dict())
+        self.assertEqual((resumed.best, resumed.stale), (0.6, 1))
+        self.assertFalse(resumed.update(0.6))
+        self.assertTrue(resumed.update(0.6))  # Counts on from before the resume, as an uninterrupted run would
+
+    def test_action_points_match_step(self):
+        rng = np.random.default_rng(0)
+        env = SOSVectorEnv(16, board_size=4)
+        for _ in range(10):
+            masks = env.legal_action_mask()
+            actions = np.array([rng.choice(np.flatnonzero(mask)) for mask in masks])
+            expected = env.action_points()[np.arange(16), actions]
+            scores = env.scores.sum(axis=1)
+            env.step(actions)
+            np.testing.assert_array_equal(env.scores.sum(axis=1) - scores, expected)
+
+    def test_play_match(self):
+        result = play_match(self.net, 'greedy', num_games=32, board_size=3, seed=1)
+        self.assertEqual(result['games'], 32)
+        self.assertEqual(result['wins'] + result['draws'] + result['losses'], 32)
+        low, high = result['win_rate_ci']
+        self.assertLessEqual(low, result['win_rate'])
+        self.assertGreaterEqual(high, result['win_rate'])
+        self.assertEqual(result, play_match(self.net, 'greedy', num_games=32, board_size=3, seed=1))
+        with self.assertRaises(ValueError):
+            play_match(self.net, 'minimax', num_games=2, board_size=3)
+
+    def test_background_evaluator(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'eval.jsonl')
+            evaluator = BackgroundEvaluator(path, board_size=3, num_games=8, opponents=('random',))
+            self.assertEqual(evaluator.poll(), [])
+            evaluator.submit(10, clone_state_dict(self.net))
+            finished = evaluator.wait()
+            self.assertEqual(evaluator.wait(), [])
+            self.assertEqual(evaluator.close(), [])
+
+            self.assertEqual(len(finished), 1)
+            episode, results = finished[0]
+            self.assertEqual(episode, 10)
+            self.assertEqual(results['random']['games'], 8)
+            with open(path) as f:
+                self.assertEqual(json.loads(f.readline())['episode'], 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+# tests/test_export.py
+
+import os
+import tempfile
+import unittest
+
+import torch
+
+from models.dq_network import DQNetworkCNN
+from models.export import (check_accuracy, compare_latency, export_model, load_eager_model,
+                           load_inference_model)
+
+
+class TestExport(unittest.TestCase):
+    def setUp(self):
+        torch.manual_seed(0)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.weights = os.path.join(self.tmp.name, 'sos_dqn.pth')
+        torch.save(DQNetworkCNN(50).state_dict(), self.weights)
+        self.eager = load_eager_model(self.weights)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_exported_model_matches_eager(self):
+        path = os.path.join(self.tmp.name, 'sos_dqn.pt')
+        export_model(self.weights, path)
+        for fuse in (True, False):
+            exported = load_inference_model(path, fuse=fuse)
+            accuracy = check_accuracy(self.eager, exported, count=256)
+            self.assertLess(accuracy['max_abs_error'], 1e-4)
+            self.assertEqual(accuracy['best_move_agreement'], 1.0)
+
+    def test_quantized_model_is_close(self):
+        path = os.path.join(self.tmp.name, 'sos_dqn_int8.pt')
+        export_model(self.weights, path, quantize=True)
+        accuracy = check_accuracy(self.eager, load_inference_model(path, fuse=True), count=256)
+        self.assertLess(accuracy['max_abs_error'], 0.05)
+        self.assertGreater(accuracy['best_move_agreement'], 0.9)
+
+    def test_loader_accepts_state_dict(self):
+        model = load_inference_model(self.weights)
+        self.assertIsInstance(model, DQNetworkCNN)
+        self.assertFalse(model.training)
+
+    def test_compare_latency(self):
+        path = os.path.join(self.tmp.name, 'sos_dqn.pt')
+        exported = export_model(self.weights, path)
+        timings = compare_latency(self.eager, exported, batch_sizes=(1, 4))
+        self.assertEqual(sorted(timings), [1, 4])
+        self.assertTrue(all(eager > 0 and fast > 0 for eager, fast in timings.values()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -16,7 +16,7 @@ class TestSOSGameEnv(unittest.TestCase):
     def test_valid_move(self):
         action = (0, 0, 'S')
         state, reward, done, info = self.env.step(action)
-        self.assertEqual(reward, 0)
+        self.assertAlmostEqual(reward, -0.1)  # No SOS formed
         self.assertFalse(done)
         self.assertFalse(info['invalid_move'])
         self.assertEqual(self.env.board[0, 0], 'S')
@@ -35,7 +35,7 @@ class TestSOSGameEnv(unittest.TestCase):
         self.env.board[0, 1] = 'O'
         action = (0, 2, 'S')  # This should form an SOS horizontally
         state, reward, done, info = self.env.step(action)
-        self.assertEqual(reward, 1)
+        self.assertEqual(reward, 10)  # 10 per SOS
         self.assertFalse(done)
         self.assertEqual(self.env.scores[self.env.current_player], 1)
 
@@ -45,7 +45,7 @@ class TestSOSGameEnv(unittest.TestCase):
         self.env.board[1, 1] = 'O'
         action = (2, 2, 'S')  # This should form an SOS diagonally
         state, reward, done, info = self.env.step(action)
-        self.assertEqual(reward, 1)
+        self.assertEqual(reward, 10)
         self.assertFalse(done)
 
     def test_game_over(self):
@@ -55,6 +55,14 @@ class TestSOSGameEnv(unittest.TestCase):
                 self.env.board[row, col] = 'S'
         self.env.check_game_over()
         self.assertTrue(self.env.game_over)
+        self.assertEqual(self.env.available_actions(), [])
+        self.assertTrue((self.env.get_state() == 1).all())
+
+    def test_unknown_letter_leaves_the_game_untouched(self):
+        with self.assertRaises(ValueError):
+            self.env.step((0, 0, 'X'))
+        self.assertEqual(self.env.board[0, 0], '')
+        self.assertEqual(len(self.env.available_actions()), 50)
 
     def test_switch_player(self):
         self.env.current_player = 'player1'
@@ -63,6 +71,27 @@ class TestSOSGameEnv(unittest.TestCase):
         self.env.switch_player()
         self.assertEqual(self.env.current_player, 'player1')
 
+    def test_incremental_observation_and_mask(self):
+        observation = self.env.observation
+        self.env.step((1, 2, 'O'))
+        self.assertIs(self.env.observation, observation)
+        self.assertEqual(observation[1, 2], 2)
+        self.assertEqual(self.env.empty_cells, 24)
+        cell = 1 * 5 + 2
+        self.assertFalse(self.env.legal_mask[cell * 2:cell * 2 + 2].any())
+        self.assertEqual(self.env.legal_mask.sum(), 48)
+        self.assertEqual(len(self.env.available_actions()), 48)
+        self.assertNotIn((1, 2, 'S'), self.env.available_actions())
+
+        state = self.env.get_state()
+        self.env.step((0, 0, 'S'))
+        self.assertEqual(state[0, 0], 0)  # get_state() returns a snapshot
+
+        self.env.reset()
+        self.assertIs(self.env.observation, observation)
+        self.assertTrue((observation == 0).all())
+        self.assertTrue(self.env.legal_mask.all())
+
     def test_render(self):
         self.env.board[0, 0] = 'S'
         self.env.board[1, 1] = 'O'
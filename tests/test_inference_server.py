@@ -0,0 +1,119 @@
+# tests/test_inference_server.py
+
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import torch
+
+from models.dq_network import DQNetworkCNN
+from models.export import random_positions
+from models.inference_server import InferenceClient, InferenceServer
+from training.policy import select_actions
+
+
+class ServerThread:
+    """Runs an InferenceServer on its own event loop thread."""
+
+    def __init__(self, model, **kwargs):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        self.server = asyncio.run_coroutine_threadsafe(InferenceServer(model, board_size=3, **kwargs).start(),
+                                                       self.loop).result()
+
+    def close(self):
+        asyncio.run_coroutine_threadsafe(self.server.stop(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+
+class TestInferenceServer(unittest.TestCase):
+    def setUp(self):
+        torch.manual_seed(0)
+        self.model = DQNetworkCNN(18, 3).eval()
+        self.states, self.masks = random_positions(64, board_size=3)
+        self.expected = select_actions(self.model, self.states, self.masks).tolist()
+
+    def test_concurrent_games_are_batched(self):
+        server = ServerThread(self.model, port=0, max_latency_ms=50)
+        try:
+            def play(i):
+                client = InferenceClient(port=server.server.port)
+                try:
+                    return client.best_action(self.states[i].numpy())
+                finally:
+                    client.close()
+
+            with ThreadPoolExecutor(max_workers=16) as pool:
+                actions = list(pool.map(play, range(64)))
+            self.assertEqual(actions, self.expected)
+
+            client = InferenceClient(port=server.server.port)
+            metrics = client.metrics()
+            self.assertEqual(metrics['requests'], 64)
+            self.assertGreater(metrics['mean_batch_size'], 1)
+            self.assertEqual(metrics['queue_depth'], 0)
+            self.assertIn('latency_p95_ms', metrics)
+
+            with self.assertRaises(ValueError):
+                client.best_action([0, 1, 2])  # Wrong board size
+            with self.assertRaises(ValueError):
+                client.best_action(self.states[0].numpy(), mask=[False] * 18)
+            client.close()
+        finally:
+            server.close()
+
+    def test_malformed_requests_do_not_stop_the_server(self):
+        server = ServerThread(self.model, port=0, max_latency_ms=1)
+        try:
+            client = InferenceClient(port=server.server.port)
+            with self.assertRaises(ValueError):
+                client.best_action([0] * 9, mask=[1] * 10)
+            with self.assertRaises(ValueError):
+                client.best_action([0] * 10)
+            self.assertEqual(client.best_action(self.states[0].numpy()), self.expected[0])
+            self.assertFalse(server.server.batcher.task.done())
+            client.close()
+        finally:
+            server.close()
+
+    def test_failed_batch_answers_its_requests_with_errors(self):
+        server = ServerThread(self.model, port=0, max_latency_ms=1)
+        try:
+            batcher = server.server.batcher
+            forward = batcher._forward
+
+            def failing_forward(boards, masks):
+                raise RuntimeError("forward failed")
+
+            batcher._forward = failing_forward
+            client = InferenceClient(port=server.server.port)
+            with self.assertRaises(ValueError):
+                client.best_action(self.states[0].numpy())
+            batcher._forward = forward
+            self.assertEqual(client.best_action(self.states[1].numpy()), self.expected[1])
+            client.close()
+        finally:
+            server.close()
+
+    def test_unix_socket_with_explicit_mask(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'sos.sock')
+            server = ServerThread(self.model, unix_path=path, max_latency_ms=1)
+            try:
+                client = InferenceClient(unix_path=path)
+                mask = torch.zeros(18, dtype=torch.bool)
+                mask[5] = True
+                self.assertEqual(client.best_action(torch.zeros(3, 3).numpy(), mask.numpy()), 5)
+                client.close()
+            finally:
+                server.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+# tests/test_metrics.py
+
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from training import train as train_module
+from training.metrics import IterationProfiler, MetricsLogger, PhaseTimer
+from training.replay_buffer import ReplayBuffer
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def test_phase_timer_accumulates(self):
+        timer = PhaseTimer()
+        for _ in range(3):
+            with timer.phase('env_step'):
+                pass
+        self.assertEqual(timer.counts['env_step'], 3)
+        self.assertGreaterEqual(timer.totals['env_step'], 0.0)
+        self.assertIs(timer.phase('env_step'), timer.phase('env_step'))
+
+    def test_logger_writes_rates(self):
+        logger = MetricsLogger(os.path.join('metrics', 'run.jsonl'), interval=3600)
+        buffer = ReplayBuffer(100, board_size=3)
+        with logger.timer.phase('train_batch'):
+            pass
+        self.assertIsNone(logger.maybe_log(1, 80, 10, buffer))
+        record = logger.maybe_log(1, 80, 10, buffer, force=True)
+        logger.close()
+
+        with open(os.path.join('metrics', 'run.jsonl')) as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual(lines, [record])
+        self.assertGreater(record['steps_per_sec'], 0)
+        self.assertIn('train_batch', record['phase_seconds'])
+        self.assertEqual(record['replay_bytes'], buffer.nbytes)
+
+    def test_profiler_window(self):
+        profiler = IterationProfiler('cprofile', start=2, iterations=3, directory='profiles')
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(10):
+                profiler.step()
+        self.assertTrue(os.path.exists(os.path.join('profiles', 'train.prof')))
+        with self.assertRaises(ValueError):
+            IterationProfiler('perf', 0, 1, 'profiles')
+
+    def test_train_writes_metrics(self):
+        with mock.patch.object(train_module, 'NUM_EPISODES', 16), \
+                contextlib.redirect_stdout(io.StringIO()):
+            train_module.train(checkpoint_path=os.path.join('checkpoints', 'checkpoint.pt'), profile='torch')
+        with open(train_module.METRICS_PATH) as f:
+            record = json.loads(f.readlines()[-1])
+        self.assertEqual(record['episode'], 16)
+        self.assertGreater(record['steps'], 0)
+        self.assertIn('env_step', record['phase_seconds'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,210 @@
+# tests/test_monte_carlo.py
+
+import os
+import random
+import time
+import unittest
+
+from benchmarks.harness import load_script
+
+monte_carlo = load_script(os.path.join('MonteCarlo', 'main.py'), 'montecarlo_main')
+
+
+def scan_winner(board):
+    """Winner by scanning every line of the board, as the original GameState did."""
+    size = monte_carlo.BOARD_SIZE
+    for line in monte_carlo.LINES:
+        marks = {board[cell // size][cell % size] for cell in range(size * size) if line >> cell & 1}
+        if len(marks) == 1 and marks != {""}:
+            return marks.pop()
+    return None
+
+
+def make_state(rows, player):
+    return monte_carlo.GameState.from_board(rows, player)
+
+
+class TestGameState(unittest.TestCase):
+    def test_incremental_winner_matches_full_scan(self):
+        rng = random.Random(0)
+        for _ in range(200):
+            state = monte_carlo.GameState()
+            while state.winner is None and state.empty:
+                state.make_move(*rng.choice(state.get_available_moves()))
+            board = state.board
+            self.assertEqual(state.winner, scan_winner(board))
+            self.assertEqual(len(state.empty), sum(row.count("") for row in board))
+
+    def test_clone_is_independent(self):
+        state = make_state(["X....", ".....", ".....", ".....", "....O"], "X")
+        copy = state.clone()
+        copy.make_move(2, 2)
+        self.assertEqual(state.board[2][2], "")
+        self.assertEqual(copy.board[2][2], "X")
+        self.assertEqual(len(state.empty), 23)
+        self.assertFalse(state.make_move(0, 0))
+        self.assertEqual(state.current_player, "X")
+
+
+class TestMonteCarloTreeSearch(unittest.TestCase):
+    def test_takes_immediate_win(self):
+        state = make_state(["X.X..",
+                            ".....",
+                            "....X",
+                            ".....",
+                            "OOO.."], "O")
+        engine = monte_carlo.MonteCarloTreeSearch(seed=0)
+        self.assertEqual(engine.search(state, 800), (4, 3))
+
+    def test_blocks_opponent_win(self):
+        state = make_state(["XXX..",
+                            ".....",
+                            "..O..",
+                            "O....",
+                            "....O"], "O")
+        engine = monte_carlo.MonteCarloTreeSearch(seed=0)
+        self.assertEqual(engine.search(state, 1500), (0, 3))
+
+    def test_tree_is_reused_across_moves(self):
+        state = monte_carlo.GameState()
+        state.make_move(2, 2)
+        engine = monte_carlo.MonteCarloTreeSearch(seed=1)
+        move = engine.search(state, 400)
+        state.make_move(*move)
+        engine.advance(move)
+        reply = max(engine.root.children, key=lambda child: child.visits).move
+        state.make_move(*reply)
+        engine.advance(reply)
+
+        kept = engine.root.visits
+        self.assertGreater(kept, 0)
+        self.assertIsNone(engine.root.parent)
+        engine.search(state, 100)
+        self.assertEqual(engine.root.visits, kept + 100)
+
+    def test_seeded_search_is_reproducible(self):
+        state = make_state(["X....",
+                            ".O...",
+                            "..X..",
+                            ".....",
+                            "....."], "O")
+        moves = [monte_carlo.MonteCarloTreeSearch(seed=3).search(state, 300) for _ in range(2)]
+        self.assertEqual(moves[0], moves[1])
+
+
+class TestAnytimeSearch(unittest.TestCase):
+    def test_think_budgets(self):
+        engine = monte_carlo.MonteCarloTreeSearch(seed=0)
+        progress = []
+        engine.think(monte_carlo.GameState(), playouts=150, on_progress=lambda *update: progress.append(update))
+        self.assertEqual(engine.root.visits, 150)
+        self.assertEqual([done for _, done, _ in progress], [64, 128, 150])
+
+        start = time.perf_counter()
+        engine.think(monte_carlo.GameState(), time_ms=100)
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertGreater(engine.root.visits, 150)
+        with self.assertRaises(ValueError):
+            engine.think(monte_carlo.GameState())
+
+    def test_search_thread_ponders_between_moves(self):
+        state = monte_carlo.GameState()
+        searcher = monte_carlo.SearchThread(monte_carlo.MonteCarloTreeSearch(seed=0))
+        searcher.start()
+        try:
+            state.make_move(2, 2)
+            searcher.advance((2, 2))
+            searcher.think(state, request_id=7, time_ms=None, playouts=200)
+            messages = []
+            while not messages or messages[-1][0] != 'done':
+                messages.append(searcher.results.get(timeout=10))
+            self.assertEqual(messages[-1][1], 7)
+            self.assertTrue(all(message[0] == 'progress' for message in messages[:-1]))
+            move = messages[-1][2]
+            state.make_move(*move)
+            searcher.advance(move)
+
+            time.sleep(0.3)  # The human thinks; the engine ponders
+            searcher.think(state, request_id=8, time_ms=None, playouts=1)
+            while True:
+                message = searcher.results.get(timeout=10)
+                if message[0] == 'done':
+                    break
+            self.assertGreater(searcher.engine.root.visits, 200)
+        finally:
+            searcher.stop()
+
+    def test_pondering_carries_over_the_human_move(self):
+        def visits_after_human_move(mode, ponder):
+            if mode == 'serial':
+                engine = monte_carlo.MonteCarloTreeSearch(seed=0)
+            else:
+                engine = monte_carlo.ParallelMonteCarloTreeSearch(workers=2, mode=mode, chunk=8, seed=0)
+            searcher = monte_carlo.SearchThread(engine, ponder)
+            searcher.start()
+            try:
+                state = monte_carlo.GameState()
+                state.make_move(2, 2)
+                searcher.advance((2, 2))
+                searcher.think(state, request_id=1, time_ms=None, playouts=256)
+                while True:
+                    message = searcher.results.get(timeout=30)
+                    if message[0] == 'done':
+                        break
+                state.make_move(*message[2])
+                searcher.advance(message[2])
+                time.sleep(1.0)  # The human thinks; the engine ponders
+                searcher.advance(state.get_available_moves()[0])
+            finally:
+                searcher.stop()  # Handled after the advance, so the root is the next think's
+                if mode != 'serial':
+                    engine.close()
+            return engine.root.visits
+
+        for mode in ('serial', 'leaf', 'root'):
+            with self.subTest(mode=mode):
+                self.assertGreater(visits_after_human_move(mode, ponder=True),
+                                   visits_after_human_move(mode, ponder=False))
+
+
+class TestParallelMonteCarloTreeSearch(unittest.TestCase):
+    def test_modes_find_block_and_are_reproducible(self):
+        state = make_state(["XXX..",
+                            ".....",
+                            "..O..",
+                            "O....",
+                            "....O"], "O")
+        for mode in ('root', 'leaf'):
+            with self.subTest(mode=mode):
+                runs = []
+                for _ in range(2):
+                    engine = monte_carlo.ParallelMonteCarloTreeSearch(workers=2, mode=mode, chunk=8, seed=5)
+                    try:
+                        move = engine.search(state, 1600)
+                        if mode == 'root':
+                            # Root mode keeps no tree here, only the visit and score totals merged from the workers
+                            statistics = sorted((move, visits, score)
+                                                for move, (visits, score) in engine.root_totals.items())
+                        else:
+                            statistics = sorted((child.move, child.visits, child.score)
+                                                for child in engine.root.children)
+                        runs.append((move, statistics))
+                    finally:
+                        engine.close()
+                self.assertEqual(runs[0][0], (0, 3))
+                self.assertTrue(runs[0][1])
+                self.assertEqual(sum(visits for _, visits, _ in runs[0][1]), 1600)
+                self.assertEqual(runs[0], runs[1])
+
+    def test_leaf_visits_match_budget(self):
+        engine = monte_carlo.ParallelMonteCarloTreeSearch(workers=2, mode='leaf', chunk=10, seed=0)
+        try:
+            engine.search(monte_carlo.GameState(), 95)
+            self.assertEqual(engine.root.visits, 95)
+            self.assertEqual(sum(child.visits for child in engine.root.children), 95)
+        finally:
+            engine.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+# tests/test_policy.py
+
+import unittest
+
+import numpy as np
+import torch
+
+from models.dq_network import DQNetworkCNN
+from training.policy import masked_argmax, masked_random, select_actions
+
+
+class TestPolicy(unittest.TestCase):
+    def setUp(self):
+        torch.manual_seed(0)
+        self.q_values = torch.tensor([[5.0, 1.0, 3.0, 2.0],
+                                      [0.0, 9.0, 4.0, -1.0]])
+        self.masks = torch.tensor([[False, True, True, False],
+                                   [True, False, False, True]])
+
+    def test_masked_argmax(self):
+        self.assertEqual(masked_argmax(self.q_values, self.masks).tolist(), [2, 0])
+
+    def test_masked_random_only_picks_legal_actions(self):
+        masks = self.masks.repeat(500, 1)
+        actions = masked_random(masks)
+        self.assertTrue(masks[torch.arange(len(masks)), actions].all())
+        counts = torch.bincount(actions[::2], minlength=4)
+        self.assertGreater(counts[1], 200)
+        self.assertGreater(counts[2], 200)
+
+    def test_epsilon_extremes(self):
+        states = np.zeros((2, 5, 5), dtype=np.float32)
+        rng_state = torch.get_rng_state()
+        self.assertEqual(select_actions(lambda _: self.q_values, states, self.masks, 0.0).tolist(), [2, 0])
+        self.assertTrue(torch.equal(torch.get_rng_state(), rng_state))  # Greedy play draws no random numbers
+
+        def never_called(_):
+            raise AssertionError("The network is not needed when every row explores")
+
+        generator = torch.Generator().manual_seed(1)
+        masks = self.masks.repeat(100, 1)
+        actions = select_actions(never_called, states.repeat(100, axis=0), masks, 1.0, generator)
+        self.assertTrue(masks[torch.arange(200), actions].all())
+
+    def test_batch_matches_single_rows(self):
+        net = DQNetworkCNN(50)
+        rng = np.random.default_rng(0)
+        states = rng.integers(0, 3, size=(32, 5, 5)).astype(np.float32)
+        masks = np.repeat(states.reshape(32, 25) == 0, 2, axis=1)
+        batched = select_actions(net, states, masks)
+        singles = [select_actions(net, states[i:i + 1], masks[i:i + 1]).item() for i in range(32)]
+        self.assertEqual(batched.tolist(), singles)
+        self.assertTrue(masks[np.arange(32), batched.numpy()].all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+# tests/test_replay_buffer.py
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import torch.nn as nn
+import torch.optim as optim
+
+from config.game_config import MEMORY_SIZE, REPLAY_DISK_SIZE
+from models.dq_network import DQNetworkCNN
+from training.replay_buffer import (MemmapReplayBuffer, PrioritizedReplayBuffer, ReplayBuffer, SumTree,
+                                    make_replay_buffer)
+from training.train import train_batch
+
+
+def fill(buffer, count):
+    for i in range(count):
+        state = np.full((5, 5), i % 3, dtype=np.float32)
+        buffer.push(state, i % 50, float(i), state, i % 25 == 24)
+
+
+class TestSumTree(unittest.TestCase):
+    def test_update_and_total(self):
+        tree = SumTree(5)
+        tree.update([0, 1, 2, 3, 4], [1.0, 2.0, 3.0, 4.0, 5.0])
+        self.assertAlmostEqual(tree.total(), 15.0)
+        tree.update([2, 2], [0.0, 10.0])
+        self.assertAlmostEqual(tree.total(), 22.0)
+
+    def test_find(self):
+        tree = SumTree(4)
+        tree.update([0, 1, 2, 3], [1.0, 0.0, 2.0, 1.0])
+        np.testing.assert_array_equal(tree.find([0.0, 0.99, 1.0, 2.99, 3.0, 3.99]), [0, 0, 2, 2, 3, 3])
+
+
+class TestReplayBuffers(unittest.TestCase):
+    def test_uniform_buffer(self):
+        buffer = ReplayBuffer(10)
+        fill(buffer, 15)
+        self.assertEqual(len(buffer), 10)
+        states, actions, rewards, next_states, dones = buffer.sample(4)
+        self.assertEqual(states.shape, (4, 5, 5))
+        self.assertEqual(states.dtype, np.float32)
+        self.assertEqual(actions.dtype, np.int64)
+        self.assertEqual(rewards.dtype, np.float32)
+        self.assertEqual(dones.dtype, np.float32)
+        self.assertTrue(states.flags['C_CONTIGUOUS'])
+        self.assertTrue((rewards >= 5).all())  # The first five were overwritten
+
+    def test_compact_columns(self):
+        buffer = ReplayBuffer(10)
+        self.assertEqual(buffer.states.dtype, np.uint8)
+        self.assertEqual(buffer.actions.dtype, np.int16)
+        self.assertEqual(buffer.dones.dtype, bool)
+
+    def test_push_batch(self):
+        buffer = ReplayBuffer(6)
+        states = np.arange(4 * 25).reshape(4, 5, 5) % 3
+        indices = buffer.push_batch(states, np.arange(4), np.ones(4), states, np.zeros(4, dtype=bool))
+        np.testing.assert_array_equal(indices, [0, 1, 2, 3])
+        indices = buffer.push_batch(states, np.arange(4), np.ones(4), states, np.zeros(4, dtype=bool))
+        np.testing.assert_array_equal(indices, [4, 5, 0, 1])
+        self.assertEqual(len(buffer), 6)
+        np.testing.assert_array_equal(buffer.gather(np.array([5]))[0][0], states[1])
+
+    def test_memmap_buffer_warm_start(self):
+        with tempfile.TemporaryDirectory() as directory:
+            buffer = MemmapReplayBuffer(20, directory=directory)
+            self.assertFalse(buffer.resumed)
+            fill(buffer, 12)
+            state = buffer.state_dict()
+            self.assertEqual(state, {'position': 12, 'size': 12})
+            self.assertTrue(os.path.exists(os.path.join(directory, 'states.npy')))
+            fill(buffer, 3)  # Pushed after the checkpoint, then the process dies without flushing
+            del buffer
+
+            resumed = MemmapReplayBuffer(20, directory=directory)
+            self.assertTrue(resumed.resumed)
+            self.assertEqual(resumed.state_dict(), state)  # meta.json matches the checkpoint
+            resumed.load_state_dict(state)
+            self.assertEqual(len(resumed), 12)
+            np.testing.assert_array_equal(resumed.rewards[:12], np.arange(12))
+            states, actions, rewards, next_states, dones = resumed.sample(8)
+            self.assertEqual(states.shape, (8, 5, 5))
+            self.assertTrue((rewards < 12).all())
+            del resumed
+
+            # A different capacity must not overwrite the stored experiences
+            with self.assertRaises(ValueError):
+                MemmapReplayBuffer(30, directory=directory)
+            self.assertEqual(len(MemmapReplayBuffer(20, directory=directory)), 12)
+
+    def test_make_replay_buffer_capacity(self):
+        self.assertEqual(make_replay_buffer(backend='memory').capacity, MEMORY_SIZE)
+        self.assertEqual(make_replay_buffer(64, prioritized=False, backend='memory').capacity, 64)
+        with mock.patch('training.replay_buffer.MemmapReplayBuffer') as memmap:
+            make_replay_buffer(prioritized=False, backend='memmap')
+            make_replay_buffer(48, prioritized=False, backend='memmap')
+        self.assertEqual([call.args[0] for call in memmap.call_args_list], [REPLAY_DISK_SIZE, 48])
+
+    def test_prioritized_sampling_follows_priorities(self):
+        np.random.seed(0)
+        buffer = PrioritizedReplayBuffer(8, alpha=1.0, epsilon=0.0)
+        fill(buffer, 8)
+        buffer.update_priorities(np.arange(8), np.array([1, 1, 1, 1, 1, 1, 1, 93.0]))
+        counts = np.zeros(8)
+        for _ in range(200):
+            batch, indices, weights = buffer.sample(4)
+            np.add.at(counts, indices, 1)
+        self.assertGreater(counts[7] / counts.sum(), 0.8)
+        self.assertEqual(weights.dtype, np.float32)
+        self.assertAlmostEqual(weights.max(), 1.0)
+
+    def test_wraps_around(self):
+        buffer = PrioritizedReplayBuffer(4)
+        fill(buffer, 6)
+        self.assertEqual(len(buffer), 4)
+        batch, indices, _ = buffer.sample(4)
+        self.assertTrue((indices < 4).all())
+        self.assertEqual(buffer.rewards[0], 4.0)
+
+    def test_train_batch_returns_td_errors(self):
+        buffer = PrioritizedReplayBuffer(100)
+        fill(buffer, 100)
+        policy_net, target_net = DQNetworkCNN(50), DQNetworkCNN(50)
+        optimizer = optim.Adam(policy_net.parameters(), lr=1e-3)
+        batch, indices, weights = buffer.sample(16)
+        td_errors = train_batch(policy_net, target_net, optimizer, nn.MSELoss(), batch, weights)
+        self.assertEqual(td_errors.shape, (16,))
+        buffer.update_priorities(indices, td_errors)
+        self.assertGreater(buffer.tree.total(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+# tests/test_solver.py
+
+import os
+import random
+import tempfile
+import unittest
+
+from benchmarks.harness import load_script
+
+solver = load_script(os.path.join('main', 'solver.py'), 'tictactoe_solver')
+
+
+def brute_force(cells, lines):
+    """Minimax score of cells for the side to move, with the table's win-in-p scoring."""
+    for line in lines:
+        if cells[line[0]] and all(cells[i] == cells[line[0]] for i in line):
+            return -solver.WIN
+    if 0 not in cells:
+        return 0
+    mark = 1 if cells.count(1) == cells.count(2) else 2
+    return max(solver.child_score(brute_force(cells[:i] + (mark,) + cells[i + 1:], lines))
+               for i in range(len(cells)) if cells[i] == 0)
+
+
+def to_board(cells, cols=3):
+    marks = ("", "X", "O")
+    return [[marks[cell] for cell in cells[row:row + cols]] for row in range(0, len(cells), cols)]
+
+
+class TestSolver(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.table = solver.solve()
+
+    def test_tictactoe(self):
+        self.assertEqual(len(self.table.entries), 765)  # Reachable positions up to symmetry
+        self.assertEqual(len(solver.symmetries(3, 3)), 8)
+        self.assertEqual(len(solver.symmetries(3, 4)), 4)
+        self.assertEqual(self.table.lookup(to_board((0,) * 9))[0], 0)  # A draw
+        self.assertEqual(self.table.lookup(to_board((1, 1, 0, 2, 2, 0, 0, 0, 0))), (solver.WIN - 1, (0, 2)))
+        self.assertEqual(self.table.lookup(to_board((1, 1, 1, 2, 2, 0, 0, 0, 0))), (-solver.WIN, None))
+
+    def test_matches_brute_force(self):
+        lines = solver.winning_lines(3, 3, 3)
+        rng = random.Random(0)
+        for _ in range(40):
+            cells = (0,) * 9
+            for _ in range(rng.randint(2, 6)):
+                mark = 1 if cells.count(1) == cells.count(2) else 2
+                i = rng.choice([i for i in range(9) if cells[i] == 0])
+                cells = cells[:i] + (mark,) + cells[i + 1:]
+            if brute_force(cells, lines) == -solver.WIN:
+                continue  # Game already over
+            score, (row, col) = self.table.lookup(to_board(cells))
+            self.assertEqual(score, brute_force(cells, lines))
+            i = row * 3 + col
+            self.assertEqual(cells[i], 0)
+            mark = 1 if cells.count(1) == cells.count(2) else 2
+            self.assertEqual(solver.child_score(brute_force(cells[:i] + (mark,) + cells[i + 1:], lines)), score)
+
+    def test_second_player_never_loses(self):
+        def play(board):
+            """Every game the first player can force against the table's moves."""
+            cells = self.table.encode(board)
+            if self.table.lookup(board)[1] is None:
+                return [cells]
+            games = []
+            for row, col in [(r, c) for r in range(3) for c in range(3) if board[r][c] == ""]:
+                board[row][col] = "X"
+                _, reply = self.table.lookup(board)
+                if reply is None:
+                    games.append(self.table.encode(board))
+                else:
+                    board[reply[0]][reply[1]] = "O"
+                    games.extend(play(board))
+                    board[reply[0]][reply[1]] = ""
+                board[row][col] = ""
+            return games
+
+        lines = solver.winning_lines(3, 3, 3)
+        for cells in play(to_board((0,) * 9)):
+            self.assertFalse(any(all(cells[i] == 1 for i in line) for line in lines))
+
+    def test_save_load_and_other_variants(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'table.npz')
+            table = solver.load_or_solve(path, 3, 4, 3)
+            self.assertGreater(table.lookup(to_board((0,) * 12, cols=4))[0], 0)  # First player wins on 3x4
+            loaded = solver.PerfectPlayTable.load(path)
+            self.assertEqual(loaded.entries, table.entries)
+            self.assertEqual((loaded.rows, loaded.cols, loaded.win_length), (3, 4, 3))
+            self.assertEqual(len(solver.load_or_solve(path).entries), 765)  # A different game is re-solved
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+# tests/test_sos_lines.py
+
+import random
+import unittest
+
+import numpy as np
+
+from game.bitboard_env import BitboardSOSGameEnv
+from game.game_env import SOSGameEnv
+from game.sos_lines import DIRECTIONS, sos_triplets
+from game.vector_env import SOSVectorEnv
+from training.train import encode_action
+
+
+def reference_check_sos(board, row, col, letter):
+    """The original direction walk, with explicit bounds checks."""
+    size = board.shape[0]
+
+    def inside(r, c):
+        return 0 <= r < size and 0 <= c < size
+
+    points = 0
+    for dx, dy in DIRECTIONS:
+        if letter == 'S':
+            x1, y1, x2, y2 = row + dx, col + dy, row + 2 * dx, col + 2 * dy
+            if inside(x1, y1) and inside(x2, y2) and board[x1, y1] == 'O' and board[x2, y2] == 'S':
+                points += 1
+        else:
+            x1, y1, x2, y2 = row - dx, col - dy, row + dx, col + dy
+            if inside(x1, y1) and inside(x2, y2) and board[x1, y1] == 'S' and board[x2, y2] == 'S':
+                points += 1
+    return points
+
+
+class TestSOSTriplets(unittest.TestCase):
+    def test_table_is_cached(self):
+        self.assertIs(sos_triplets(9), sos_triplets(9))
+        self.assertIs(SOSGameEnv(9).triplets, SOSGameEnv(9).triplets)
+
+    def test_small_board_has_no_lines(self):
+        self.assertTrue(all(s == () and o == () for s, o in sos_triplets(2)))
+
+    def test_matches_direction_walk(self):
+        rng = random.Random(0)
+        for size in (3, 5, 9, 15):
+            env = SOSGameEnv(size)
+            for _ in range(20):
+                env.board[:] = np.array([rng.choice(['', 'S', 'O']) for _ in range(size * size)]).reshape(size, size)
+                for row in range(size):
+                    for col in range(size):
+                        for letter in 'SO':
+                            self.assertEqual(env.check_sos(row, col, letter),
+                                             reference_check_sos(env.board, row, col, letter))
+
+    def test_large_board_envs_agree(self):
+        size = 9
+        rng = random.Random(1)
+        reference = SOSGameEnv(size)
+        bitboard = BitboardSOSGameEnv(size)
+        vector = SOSVectorEnv(1, size)
+        done = False
+        while not done:
+            action = rng.choice(reference.available_actions())
+            state, reward, done, _ = reference.step(action)
+            self.assertEqual(bitboard.step(action)[1:3], (reward, done))
+            _, rewards, dones, info = vector.step([encode_action(action, size)])
+            self.assertAlmostEqual(rewards[0], reward, places=5)
+            np.testing.assert_array_equal(info['final_state'][0], state)
+        self.assertEqual(reference.scores, bitboard.scores)
+
+
+if __name__ == '__main__':
+    unittest.main()
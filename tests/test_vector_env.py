@@ -0,0 +1,56 @@
+# tests/test_vector_env.py
+
+import unittest
+
+import numpy as np
+
+from game.game_env import SOSGameEnv
+from game.vector_env import SOSVectorEnv
+from training.train import decode_action
+
+
+class TestSOSVectorEnv(unittest.TestCase):
+    def setUp(self):
+        self.num_envs = 6
+        self.env = SOSVectorEnv(self.num_envs)
+
+    def test_reset(self):
+        states = self.env.reset()
+        self.assertEqual(states.shape, (self.num_envs, 5, 5))
+        self.assertEqual(states.dtype, np.float32)
+        self.assertTrue(self.env.legal_action_mask().all())
+
+    def test_matches_single_envs(self):
+        rng = np.random.default_rng(0)
+        references = [SOSGameEnv() for _ in range(self.num_envs)]
+        states = self.env.reset()
+        finished = 0
+        while finished < 20:
+            masks = self.env.legal_action_mask()
+            actions = np.array([rng.choice(np.flatnonzero(m)) for m in masks])
+            # Occasionally replay an occupied cell to exercise invalid moves
+            for i in np.flatnonzero(rng.random(self.num_envs) < 0.05):
+                occupied = np.flatnonzero(~masks[i])
+                if len(occupied):
+                    actions[i] = occupied[0]
+
+            states, rewards, dones, info = self.env.step(actions)
+            for i, reference in enumerate(references):
+                state, reward, done, ref_info = reference.step(decode_action(actions[i], 5))
+                np.testing.assert_array_equal(info['final_state'][i], state)
+                self.assertAlmostEqual(rewards[i], reward, places=5)
+                self.assertEqual(dones[i], done)
+                self.assertEqual(info['invalid_move'][i], ref_info['invalid_move'])
+                self.assertEqual(list(info['final_scores'][i]),
+                                 [reference.scores['player1'], reference.scores['player2']])
+                if done:
+                    finished += 1
+                    reference.reset()
+                    self.assertTrue((states[i] == 0).all())
+                else:
+                    player = 'player1' if self.env.current_player[i] == 0 else 'player2'
+                    self.assertEqual(player, reference.current_player)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,184 @@
+# training/actors.py
+
+import queue
+import random
+
+import numpy as np
+import torch
+import torch.multiprocessing as mp
+import torch.nn as nn
+import torch.optim as optim
+
+from config.game_config import *
+from game.vector_env import SOSVectorEnv
+from models.dq_network import DQNetworkCNN
+from training.metrics import MetricsLogger
+from training.replay_buffer import make_replay_buffer
+from training.policy import select_actions
+from training.train import learn_from_replay, save_model
+
+
+def actor_epsilon(actor_id, num_actors):
+    """Fixed exploration rate of one actor; actor 0 explores the most."""
+    if num_actors == 1:
+        return ACTOR_EPSILON_BASE
+    return ACTOR_EPSILON_BASE ** (1 + ACTOR_EPSILON_ALPHA * actor_id / (num_actors - 1))
+
+
+def actor_worker(actor_id, seed, epsilon, shared_net, weights_lock, weights_version,
+                 transition_queue, stop_event):
+    """
+    Play SOS games with a local copy of the policy and stream transitions to the learner.
+
+    Every message is (actor_id, states, actions, rewards, next_states, dones,
+    finished_rewards) covering ACTOR_SEND_STEPS vector steps. The local
+    weights are refreshed whenever the learner publishes a new version.
+    """
+    torch.set_num_threads(1)
+    random.seed(seed)
+    torch.manual_seed(seed)
+    generator = torch.Generator().manual_seed(seed)
+
+    env = SOSVectorEnv(ACTOR_NUM_ENVS)
+    policy_net = DQNetworkCNN(env.action_size)
+    policy_net.eval()
+    local_version = -1
+
+    states = env.reset()
+    episode_rewards = np.zeros(env.num_envs)
+    while not stop_event.is_set():
+        if weights_version.value != local_version:
+            with weights_lock:
+                policy_net.load_state_dict(shared_net.state_dict())
+                local_version = weights_version.value
+
+        chunk = []
+        finished_rewards = []
+        for _ in range(ACTOR_SEND_STEPS):
+            actions = select_actions(policy_net, states, env.legal_action_mask(), epsilon, generator).numpy()
+            next_states, rewards, dones, info = env.step(actions)
+            chunk.append((states, actions, rewards, info['final_state'], dones))
+            episode_rewards += rewards
+            finished_rewards.extend(episode_rewards[dones].tolist())
+            episode_rewards[dones] = 0
+            states = next_states
+
+        columns = [np.concatenate(column) for column in zip(*chunk)]
+        message = (actor_id, *columns, finished_rewards)
+        while not stop_event.is_set():
+            try:
+                transition_queue.put(message, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+
+    # Whatever is still buffered is not needed once the learner has stopped
+    if hasattr(transition_queue, 'cancel_join_thread'):
+        transition_queue.cancel_join_thread()
+
+
+def drain(transition_queue, block, max_messages=ACTOR_QUEUE_SIZE):
+    """Collect pending actor messages, waiting for the first one only if block is set."""
+    messages = []
+    try:
+        if block:
+            messages.append(transition_queue.get(timeout=1.0))
+        while len(messages) < max_messages:
+            messages.append(transition_queue.get_nowait())
+    except queue.Empty:
+        pass
+    return messages
+
+
+def train_with_actors(num_actors=NUM_ACTORS, num_episodes=NUM_EPISODES, seed=ACTOR_SEED):
+    """
+    Actor/learner training: num_actors processes play self-play games while
+    this process owns the replay buffer and the optimizer.
+    """
+    ctx = mp.get_context('spawn')
+    action_size = BOARD_SIZE * BOARD_SIZE * 2
+
+    # Initialize the networks
+    policy_net = DQNetworkCNN(action_size)
+    target_net = DQNetworkCNN(action_size)
+    target_net.load_state_dict(policy_net.state_dict())
+    target_net.eval()
+
+    # Weights the actors copy from, refreshed every ACTOR_SYNC_INTERVAL updates
+    shared_net = DQNetworkCNN(action_size)
+    shared_net.load_state_dict(policy_net.state_dict())
+    shared_net.share_memory()
+    weights_lock = ctx.Lock()
+    weights_version = ctx.Value('i', 0)
+
+    # Optimizer and loss
+    optimizer = optim.Adam(policy_net.parameters(), lr=LEARNING_RATE)
+    criterion = nn.MSELoss()
+
+    # Replay buffer
+    replay_buffer = make_replay_buffer()
+
+    transition_queue = ctx.Queue(maxsize=ACTOR_QUEUE_SIZE)
+    stop_event = ctx.Event()
+    actors = [
+        ctx.Process(target=actor_worker,
+                    args=(i, seed + i, actor_epsilon(i, num_actors), shared_net, weights_lock,
+                          weights_version, transition_queue, stop_event),
+                    daemon=True)
+        for i in range(num_actors)
+    ]
+    for actor in actors:
+        actor.start()
+
+    metrics = MetricsLogger(METRICS_PATH, METRICS_INTERVAL)
+    timer = metrics.timer
+    episode = 0
+    steps = updates = 0
+    trainable_steps = 0  # Transitions ingested once the buffer was large enough to train on
+    try:
+        while episode < num_episodes:
+            # Block for data only while the buffer is too small to train on
+            with timer.phase('drain'):
+                messages = drain(transition_queue, block=len(replay_buffer) < BATCH_SIZE)
+            if not messages and not any(actor.is_alive() for actor in actors):
+                raise RuntimeError("All actor processes exited")
+
+            for actor_id, states, actions, rewards, next_states, dones, finished_rewards in messages:
+                with timer.phase('replay_push'):
+                    replay_buffer.push_batch(states, actions, rewards, next_states, dones)
+                steps += len(actions)
+                if len(replay_buffer) >= BATCH_SIZE:
+                    trainable_steps += len(actions)
+                for total_reward in finished_rewards:
+                    episode += 1
+
+                    # Update the target network periodically
+                    if episode % TARGET_UPDATE_FREQ == 0:
+                        with timer.phase('target_sync'):
+                            target_net.load_state_dict(policy_net.state_dict())
+
+                    # Logging
+                    print(f"Episode {episode}/{num_episodes}, Total Reward: {total_reward:.1f}, Actor: {actor_id}")
+
+            # Train at a fixed replay ratio, so more actors mean more updates rather than fewer per sample
+            for _ in range(trainable_steps // ACTOR_TRANSITIONS_PER_UPDATE - updates):
+                learn_from_replay(policy_net, target_net, optimizer, criterion, replay_buffer, timer)
+                updates += 1
+                if updates % ACTOR_SYNC_INTERVAL == 0:
+                    with timer.phase('weights_sync'), weights_lock:
+                        shared_net.load_state_dict(policy_net.state_dict())
+                        weights_version.value += 1
+
+            metrics.maybe_log(episode, steps, updates, replay_buffer)
+    finally:
+        metrics.maybe_log(episode, steps, updates, replay_buffer, force=True)
+        metrics.close()
+        stop_event.set()
+        for actor in actors:
+            actor.join(timeout=5)
+            if actor.is_alive():
+                actor.terminate()
+
+    replay_buffer.flush()
+    save_model(policy_net)
+    return policy_net
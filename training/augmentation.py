@@ -0,0 +1,63 @@
+# training/augmentation.py
+
+from functools import lru_cache
+
+import numpy as np
+
+NUM_SYMMETRIES = 8
+
+
+@lru_cache(maxsize=None)
+def symmetry_tables(board_size):
+    """
+    Permutation tables for the 8 rotations and reflections of the board.
+
+    Returns (cell_sources, action_targets):
+    - cell_sources[k] (cells,) gives, for each cell of the transformed board,
+      the cell of the original board it is copied from;
+    - action_targets[k] (actions,) maps an encode_action index on the
+      original board to the index of the same move on the transformed board.
+    Index 0 is the identity. SOS scoring looks at all 8 directions, so every
+    transformed game is an equally valid game with the same rewards.
+    """
+    cells = np.arange(board_size * board_size).reshape(board_size, board_size)
+    cell_sources = []
+    for flipped in (cells, cells.T):
+        for k in range(4):
+            cell_sources.append(np.rot90(flipped, k).reshape(-1))
+    cell_sources = np.array(cell_sources)
+
+    cell_targets = np.argsort(cell_sources, axis=1)
+    action_targets = np.repeat(cell_targets * 2, 2, axis=1)
+    action_targets[:, 1::2] += 1
+    return cell_sources, action_targets
+
+
+def transform(states, actions, next_states, symmetries):
+    """Apply symmetry symmetries[i] to transition i; boards are (batch, n, n)."""
+    batch_size, board_size = states.shape[0], states.shape[1]
+    cell_sources, action_targets = symmetry_tables(board_size)
+    sources = cell_sources[symmetries]
+    flat_shape = (batch_size, board_size * board_size)
+    states = np.take_along_axis(states.reshape(flat_shape), sources, axis=1).reshape(states.shape)
+    next_states = np.take_along_axis(next_states.reshape(flat_shape), sources, axis=1).reshape(next_states.shape)
+    return states, action_targets[symmetries, actions], next_states
+
+
+def augment_batch(batch, rng=np.random):
+    """Map every transition of a sampled batch through its own random symmetry."""
+    states, actions, rewards, next_states, dones = batch
+    symmetries = rng.randint(0, NUM_SYMMETRIES, size=len(actions))
+    states, actions, next_states = transform(states, actions, next_states, symmetries)
+    return states, actions, rewards, next_states, dones
+
+
+def symmetric_copies(states, actions, rewards, next_states, dones):
+    """All 8 symmetric versions of a batch of transitions (8x as many rows)."""
+    symmetries = np.repeat(np.arange(NUM_SYMMETRIES), len(actions))
+
+    def tile(column):
+        return np.concatenate([np.asarray(column)] * NUM_SYMMETRIES)
+
+    states, actions, next_states = transform(tile(states), tile(actions), tile(next_states), symmetries)
+    return states, actions, tile(rewards), next_states, tile(dones)
@@ -0,0 +1,125 @@
+# training/checkpoint.py
+
+import copy
+import os
+import queue
+import random
+import threading
+
+import numpy as np
+import torch
+
+
+def clone_state_dict(module):
+    """Detached CPU copy of a module's parameters and buffers."""
+    return {name: tensor.detach().cpu().clone() for name, tensor in module.state_dict().items()}
+
+
+def capture_training_state(policy_net, target_net, optimizer, env, replay_buffer, epsilon, episode,
+                           episode_rewards, early_stopping=None, include_replay=False):
+    """
+    Snapshot everything train() needs to continue exactly where it stopped.
+
+    All tensors and arrays are copied, so the snapshot can be written to disk
+    by another thread while training keeps mutating the live objects.
+    """
+    return {
+        'policy_net': clone_state_dict(policy_net),
+        'target_net': clone_state_dict(target_net),
+        'optimizer': copy.deepcopy(optimizer.state_dict()),
+        'env': env.state_dict(),
+        'replay_buffer': replay_buffer.state_dict() if include_replay else None,
+        'epsilon': epsilon,
+        'episode': episode,
+        'episode_rewards': np.array(episode_rewards),
+        'early_stopping': early_stopping.state_dict() if early_stopping is not None else None,
+        'rng': {
+            'python': random.getstate(),
+            'numpy': np.random.get_state(),
+            'torch': torch.get_rng_state(),
+        },
+    }
+
+
+def restore_training_state(checkpoint, policy_net, target_net, optimizer, env, replay_buffer, early_stopping=None):
+    """Load a snapshot from capture_training_state back into the live objects."""
+    policy_net.load_state_dict(checkpoint['policy_net'])
+    target_net.load_state_dict(checkpoint['target_net'])
+    optimizer.load_state_dict(checkpoint['optimizer'])
+    env.load_state_dict(checkpoint['env'])
+    if checkpoint['replay_buffer'] is not None:
+        replay_buffer.load_state_dict(checkpoint['replay_buffer'])
+    if early_stopping is not None and checkpoint.get('early_stopping') is not None:
+        early_stopping.load_state_dict(checkpoint['early_stopping'])
+    random.setstate(checkpoint['rng']['python'])
+    np.random.set_state(checkpoint['rng']['numpy'])
+    torch.set_rng_state(checkpoint['rng']['torch'])
+
+
+def write_checkpoint(snapshot, path):
+    """Write a snapshot atomically: a crash mid-write leaves the previous checkpoint intact."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    torch.save(snapshot, path + '.tmp')
+    os.replace(path + '.tmp', path)
+
+
+def load_checkpoint(path):
+    # Checkpoints hold NumPy arrays and RNG states, not just tensors
+    return torch.load(path, map_location='cpu', weights_only=False)
+
+
+class CheckpointWriter:
+    """
+    Writes checkpoints on a background thread.
+
+    save() never waits for the disk: if the previous snapshot is still being
+    written, the one queued behind it is replaced by the newer snapshot. If
+    a write fails, the thread stops and the error is raised by the next
+    save() or by close().
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.pending = queue.Queue(maxsize=1)
+        self.error = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while True:
+            snapshot = self.pending.get()
+            if snapshot is None:
+                break
+            try:
+                write_checkpoint(snapshot, self.path)
+            except Exception as error:
+                self.error = error
+                break
+
+    def _raise_error(self):
+        if self.error is not None:
+            raise RuntimeError(f"Writing checkpoint {self.path} failed") from self.error
+
+    def save(self, snapshot):
+        self._raise_error()
+        while True:
+            try:
+                self.pending.put_nowait(snapshot)
+                return
+            except queue.Full:
+                try:
+                    self.pending.get_nowait()  # Drop the stale snapshot
+                except queue.Empty:
+                    pass
+
+    def close(self):
+        """Wait for the pending checkpoint to be written and stop the thread."""
+        # A writer that died on an error never takes the sentinel, so only offer it while it runs
+        while self.thread.is_alive():
+            try:
+                self.pending.put(None, timeout=0.1)
+                break
+            except queue.Full:
+                pass
+        self.thread.join()
+        self._raise_error()
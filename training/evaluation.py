@@ -0,0 +1,284 @@
+# training/evaluation.py
+
+import json
+import math
+import os
+import queue
+
+import numpy as np
+import torch
+import torch.multiprocessing as mp
+
+from config.game_config import *
+from game.vector_env import SOSVectorEnv
+from models.dq_network import DQNetworkCNN
+from training.policy import masked_argmax, masked_random, select_actions
+
+
+def wilson_interval(successes, trials, z=1.96):
+    """Wilson score interval for a binomial proportion (95% by default)."""
+    if trials == 0:
+        return 0.0, 1.0
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    centre = (p + z * z / (2 * trials)) / denominator
+    half_width = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    return max(0.0, centre - half_width), min(1.0, centre + half_width)
+
+
+def mean_interval(values, z=1.96):
+    """Mean with a normal-approximation confidence interval."""
+    values = np.asarray(values, dtype=np.float64)
+    mean = float(values.mean())
+    if len(values) < 2:
+        return mean, (mean, mean)
+    half_width = z * float(values.std(ddof=1)) / math.sqrt(len(values))
+    return mean, (mean - half_width, mean + half_width)
+
+
+def opponent_actions(opponent, env, masks, generator):
+    """
+    Moves of a fixed baseline opponent for every game.
+
+    'random' plays a uniformly random legal move, 'greedy' the legal move
+    that completes the most SOS lines right now (ties broken at random).
+    """
+    masks = torch.from_numpy(masks)
+    if opponent == 'random':
+        return masked_random(masks, generator).numpy()
+    if opponent == 'greedy':
+        points = torch.from_numpy(env.action_points()).float()
+        return masked_argmax(points + 0.5 * torch.rand(masks.shape, generator=generator), masks).numpy()
+    raise ValueError(f"Unknown opponent: {opponent!r}")
+
+
+def summarize(margins):
+    """Win/draw/loss counts, win rate and score margin, with 95% intervals."""
+    margins = np.asarray(margins)
+    games = len(margins)
+    wins = int((margins > 0).sum())
+    draws = int((margins == 0).sum())
+    margin, margin_ci = mean_interval(margins)
+    return {
+        'games': games,
+        'wins': wins,
+        'draws': draws,
+        'losses': games - wins - draws,
+        'win_rate': wins / games,
+        'win_rate_ci': wilson_interval(wins, games),
+        'margin': margin,
+        'margin_ci': margin_ci,
+    }
+
+
+def play_match(policy_net, opponent, num_games=EVAL_GAMES, board_size=BOARD_SIZE, seed=EVAL_SEED):
+    """
+    Play num_games games of the greedy policy against a baseline opponent.
+
+    All games are stepped together, so each move of the policy is one
+    batched forward pass. The policy moves first in the even games and
+    second in the odd ones. Returns summarize() of the final score margins
+    (policy score minus opponent score).
+    """
+    env = SOSVectorEnv(num_games, board_size)
+    generator = torch.Generator().manual_seed(seed)
+    agent_seat = np.arange(num_games) % 2
+    finished = np.zeros(num_games, dtype=bool)
+    final_scores = np.zeros((num_games, 2), dtype=np.int64)
+
+    states = env.reset()
+    while not finished.all():
+        masks = env.legal_action_mask()
+        actions = opponent_actions(opponent, env, masks, generator)
+        agent_turn = env.current_player == agent_seat
+        if agent_turn.any():
+            actions[agent_turn] = select_actions(policy_net, states[agent_turn], masks[agent_turn]).numpy()
+        states, _, dones, info = env.step(actions)
+
+        # Finished games are reset by the env; only their first result counts
+        first_finish = dones & ~finished
+        final_scores[first_finish] = info['final_scores'][first_finish]
+        finished |= dones
+
+    games = np.arange(num_games)
+    return summarize(final_scores[games, agent_seat] - final_scores[games, 1 - agent_seat])
+
+
+def evaluate(policy_net, opponents=EVAL_OPPONENTS, num_games=EVAL_GAMES, board_size=BOARD_SIZE, seed=EVAL_SEED):
+    """{opponent: play_match result} for every baseline opponent."""
+    policy_net.eval()
+    return {opponent: play_match(policy_net, opponent, num_games, board_size, seed) for opponent in opponents}
+
+
+def format_results(results):
+    return ", ".join(
+        f"vs {opponent}: win {result['win_rate']:.1%} "
+        f"[{result['win_rate_ci'][0]:.1%}, {result['win_rate_ci'][1]:.1%}], "
+        f"margin {result['margin']:+.2f} ± {result['margin'] - result['margin_ci'][0]:.2f}"
+        for opponent, result in results.items()
+    )
+
+
+class EarlyStopping:
+    """
+    Signals a plateau: the metric has not improved by more than min_delta
+    over its best value for `patience` consecutive evaluations.
+    """
+
+    def __init__(self, patience=EARLY_STOP_PATIENCE, min_delta=EARLY_STOP_MIN_DELTA):
+        self.patience = patience
+        self.min_delta = min_delta
+        self.best = None
+        self.stale = 0
+
+    def update(self, value):
+        """Record one evaluation; returns True when training should stop."""
+        if self.best is None or value > self.best + self.min_delta:
+            self.best = value
+            self.stale = 0
+        else:
+            self.stale += 1
+        return self.patience > 0 and self.stale >= self.patience
+
+    def state_dict(self):
+        return {'best': self.best, 'stale': self.stale}
+
+    def load_state_dict(self, state):
+        self.best = state['best']
+        self.stale = state['stale']
+
+
+def evaluation_worker(requests, results, board_size, num_games, opponents, seed):
+    """Evaluate every (episode, state_dict) request until a None arrives."""
+    torch.set_num_threads(1)  # Leave the cores to the trainer
+    policy_net = DQNetworkCNN(board_size * board_size * 2, board_size)
+    while True:
+        request = requests.get()
+        if request is None:
+            break
+        episode, state_dict = request
+        policy_net.load_state_dict(state_dict)
+        results.put((episode, evaluate(policy_net, opponents, num_games, board_size, seed)))
+
+
+class BackgroundEvaluator:
+    """
+    Evaluates policy snapshots in a separate process.
+
+    submit() never waits: if the previous snapshot is still being evaluated,
+    the one queued behind it is replaced by the newer snapshot. poll()
+    returns the evaluations finished since the last call and appends them to
+    `path` as JSON lines; wait() does the same once every submitted snapshot
+    has been evaluated, for callers that need results at fixed points. The
+    process is started on the first submit().
+    """
+
+    def __init__(self, path=EVAL_PATH, board_size=BOARD_SIZE, num_games=EVAL_GAMES, opponents=EVAL_OPPONENTS,
+                 seed=EVAL_SEED):
+        self.path = path
+        self.args = (board_size, num_games, tuple(opponents), seed)
+        self.ctx = mp.get_context('spawn')
+        self.process = None
+        self.pending = set()  # Episodes submitted and not yet returned
+
+    def _start(self):
+        self.requests = self.ctx.Queue(maxsize=1)
+        self.results = self.ctx.Queue()
+        self.process = self.ctx.Process(target=evaluation_worker, args=(self.requests, self.results, *self.args),
+                                        daemon=True)
+        self.process.start()
+
+    def submit(self, episode, state_dict):
+        if self.process is None:
+            self._start()
+        self.pending.add(episode)
+        while True:
+            try:
+                self.requests.put_nowait((episode, state_dict))
+                return
+            except queue.Full:
+                try:
+                    stale_episode, _ = self.requests.get_nowait()  # Drop the stale snapshot
+                    self.pending.discard(stale_episode)
+                except queue.Empty:
+                    pass
+
+    def _record(self, finished):
+        for episode, _ in finished:
+            self.pending.discard(episode)
+        if finished:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(self.path, 'a') as f:
+                for episode, results in finished:
+                    f.write(json.dumps({'episode': episode, 'results': results}) + '\n')
+
+    def poll(self):
+        """[(episode, results)] for evaluations finished since the last call."""
+        finished = []
+        if self.process is None:
+            return finished
+        while True:
+            try:
+                finished.append(self.results.get_nowait())
+            except queue.Empty:
+                break
+        if not finished and self.process.exitcode not in (None, 0):
+            raise RuntimeError(f"Evaluation process exited with code {self.process.exitcode}")
+        self._record(finished)
+        return finished
+
+    def wait(self):
+        """[(episode, results)] like poll(), after blocking until every submitted snapshot is evaluated."""
+        finished = []
+        while self.pending:
+            try:
+                episode, results = self.results.get(timeout=0.1)
+            except queue.Empty:
+                if not self.process.is_alive():
+                    raise RuntimeError(f"Evaluation process exited with code {self.process.exitcode}")
+                continue
+            self.pending.discard(episode)
+            finished.append((episode, results))
+        self._record(finished)
+        return finished
+
+    def close(self):
+        """
+        Finish the evaluations in progress and queued, then stop the process.
+        The queued snapshot is the latest one and may not have been picked up
+        yet by a worker that is still starting, so it is not dropped.
+        """
+        if self.process is None:
+            return []
+        # Collect results while waiting, so a large result never blocks the worker's exit
+        finished = []
+        stopping = False
+        while self.process.is_alive():
+            if not stopping:
+                try:
+                    self.requests.put(None, timeout=0.1)
+                    stopping = True
+                except queue.Full:
+                    pass
+            self.process.join(timeout=0.1)
+            finished.extend(self.poll())
+        finished.extend(self.poll())
+        self.process = None
+        self.pending.clear()
+        return finished
+
+
+if __name__ == '__main__':
+    import argparse
+
+    from models.export import load_inference_model
+
+    parser = argparse.ArgumentParser(description='Evaluate a trained SOS policy against baseline opponents.')
+    parser.add_argument('model', nargs='?', default='outputs/models/sos_dqn.pth',
+                        help='State dict (.pth) or exported TorchScript model')
+    parser.add_argument('--games', type=int, default=EVAL_GAMES, help='Games per opponent')
+    parser.add_argument('--seed', type=int, default=EVAL_SEED)
+    args = parser.parse_args()
+
+    policy_net = load_inference_model(args.model)
+    print(format_results(evaluate(policy_net, num_games=args.games, seed=args.seed)))
@@ -0,0 +1,182 @@
+# training/metrics.py
+
+import cProfile
+import json
+import os
+import resource
+import time
+from collections import defaultdict
+
+import torch
+
+
+class _Phase:
+    """Reusable context manager that adds its elapsed time to one PhaseTimer entry."""
+
+    __slots__ = ('timer', 'name', 'start')
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.timer.totals[self.name] += time.perf_counter() - self.start
+        self.timer.counts[self.name] += 1
+
+
+class PhaseTimer:
+    """
+    Accumulates wall-clock time per named phase of the training loop.
+
+        with timer.phase('env_step'):
+            env.step(actions)
+
+    Context managers are cached per phase name, so timing a phase costs two
+    perf_counter calls and no allocation.
+    """
+
+    def __init__(self):
+        self.totals = defaultdict(float)
+        self.counts = defaultdict(int)
+        self._phases = {}
+
+    def phase(self, name):
+        phase = self._phases.get(name)
+        if phase is None:
+            phase = self._phases[name] = _Phase(self, name)
+        return phase
+
+    def reset(self):
+        self.totals.clear()
+        self.counts.clear()
+
+
+class _NullPhase:
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc):
+        pass
+
+
+class NullTimer:
+    """Stand-in for PhaseTimer when nothing is measured."""
+
+    _phase = _NullPhase()
+
+    def phase(self, name):
+        return self._phase
+
+
+NULL_TIMER = NullTimer()
+
+
+class MetricsLogger:
+    """
+    Turns phase timings and counters into rolling rates, appended as one JSON
+    object per line to `path` at most every `interval` seconds.
+
+    Each record holds the counters, steps/s and updates/s over the last
+    window, seconds spent per phase in that window, the replay buffer size
+    and storage bytes, and the process's peak resident memory.
+    """
+
+    def __init__(self, path, interval):
+        self.path = path
+        self.interval = interval
+        self.timer = PhaseTimer()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.file = open(path, 'a')
+        self.last_time = time.perf_counter()
+        self.last_steps = 0
+        self.last_updates = 0
+
+    def maybe_log(self, episode, steps, updates, replay_buffer, force=False):
+        now = time.perf_counter()
+        elapsed = now - self.last_time
+        if elapsed < self.interval and not force:
+            return None
+        record = {
+            'time': time.time(),
+            'episode': episode,
+            'steps': steps,
+            'updates': updates,
+            'steps_per_sec': (steps - self.last_steps) / elapsed if elapsed > 0 else 0.0,
+            'updates_per_sec': (updates - self.last_updates) / elapsed if elapsed > 0 else 0.0,
+            'phase_seconds': dict(self.timer.totals),
+            'replay_size': len(replay_buffer),
+            'replay_bytes': replay_buffer.nbytes,
+            'max_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        }
+        self.file.write(json.dumps(record) + '\n')
+        self.file.flush()
+        self.timer.reset()
+        self.last_time = now
+        self.last_steps = steps
+        self.last_updates = updates
+        return record
+
+    def close(self):
+        self.file.close()
+
+
+class IterationProfiler:
+    """
+    Opt-in profiler around a window of training iterations.
+
+    mode is None (off), 'torch' (torch.profiler, Chrome trace) or 'cprofile'
+    (pstats dump). Call step() once per iteration; profiling runs for
+    `iterations` iterations starting at iteration `start` and the trace is
+    written to `directory`.
+    """
+
+    def __init__(self, mode, start, iterations, directory):
+        if mode not in (None, 'torch', 'cprofile'):
+            raise ValueError(f"Unknown profiler mode: {mode!r}")
+        self.mode = mode
+        self.start = start
+        self.stop = start + iterations
+        self.directory = directory
+        self.iteration = 0
+        self.profiler = None
+        self.trace_path = None
+
+    def step(self):
+        if self.mode is None:
+            return
+        if self.iteration == self.start:
+            self._begin()
+        self.iteration += 1
+        if self.iteration == self.stop:
+            self._end()
+
+    def _begin(self):
+        if self.mode == 'torch':
+            self.profiler = torch.profiler.profile(activities=[torch.profiler.ProfilerActivity.CPU],
+                                                   record_shapes=True)
+            self.profiler.__enter__()
+        else:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def _end(self):
+        if self.profiler is None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        if self.mode == 'torch':
+            self.profiler.__exit__(None, None, None)
+            self.trace_path = os.path.join(self.directory, 'train_trace.json')
+            self.profiler.export_chrome_trace(self.trace_path)
+        else:
+            self.profiler.disable()
+            self.trace_path = os.path.join(self.directory, 'train.prof')
+            self.profiler.dump_stats(self.trace_path)
+        self.profiler = None
+        print(f"Profile of iterations {self.start}-{self.stop - 1} written to {self.trace_path}")
+
+    def close(self):
+        """Finish a window cut short by the end of training."""
+        self._end()
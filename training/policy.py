@@ -0,0 +1,37 @@
+# training/policy.py
+
+import torch
+
+
+def masked_argmax(q_values, masks):
+    """Index of the best legal action in every row of a (batch, actions) Q-value tensor."""
+    return q_values.masked_fill(~masks, float('-inf')).argmax(dim=1)
+
+
+def masked_random(masks, generator=None):
+    """A uniformly random legal action for every row of a boolean (batch, actions) mask."""
+    scores = torch.rand(masks.shape, generator=generator)
+    return scores.masked_fill(~masks, -1.0).argmax(dim=1)
+
+
+def select_actions(policy_net, states, masks, epsilon=0.0, generator=None):
+    """
+    Epsilon-greedy action indices (encode_action order) for a batch of states.
+
+    states is (batch, board_size, board_size) float32 and masks (batch,
+    actions) bool, as tensors or NumPy arrays (wrapped without copying).
+    With epsilon <= 0 this is the greedy policy used for evaluation and
+    play, and draws no random numbers. The network is skipped when every
+    row explores.
+    """
+    masks = torch.as_tensor(masks)
+    if epsilon <= 0:
+        with torch.no_grad():
+            return masked_argmax(policy_net(torch.as_tensor(states)), masks)
+    explore = torch.rand(len(masks), generator=generator) < epsilon
+    actions = masked_random(masks, generator)
+    if not explore.all():
+        with torch.no_grad():
+            q_values = policy_net(torch.as_tensor(states))
+        actions = torch.where(explore, actions, masked_argmax(q_values, masks))
+    return actions
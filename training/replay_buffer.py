@@ -1,19 +1,303 @@
 # training/replay_buffer.py
 
-import random
-from collections import deque
+import json
+import os
 import numpy as np
+from config.game_config import (AUGMENT_SYMMETRIES, BOARD_SIZE, MEMORY_SIZE, PER_ALPHA, PER_BETA_INCREMENT,
+                                PER_BETA_START, PER_EPSILON, PRIORITIZED_REPLAY, REPLAY_BACKEND, REPLAY_DIR,
+                                REPLAY_DISK_SIZE)
+from training.augmentation import augment_batch, symmetric_copies
 
 
 class ReplayBuffer:
-    def __init__(self, capacity):
-        self.memory = deque(maxlen=capacity)
+    """
+    Fixed-capacity ring buffer with one preallocated NumPy column per field.
+
+    Boards are stored as uint8 (0 empty, 1 S, 2 O), actions as int16,
+    rewards as float32 and dones as bool. sample() gathers a batch with one
+    fancy index per column and returns contiguous arrays that train_batch
+    wraps with torch.from_numpy. Indices are drawn with replacement.
+
+    augment adds dihedral symmetry augmentation: 'sample' maps each sampled
+    transition through a random rotation/reflection, 'push' stores all 8
+    symmetric copies of every pushed transition.
+    """
+
+    def __init__(self, capacity, board_size=BOARD_SIZE, augment=None):
+        if augment not in (None, 'sample', 'push'):
+            raise ValueError(f"Unknown augmentation mode: {augment!r}")
+        self.capacity = capacity
+        self.board_size = board_size
+        self.augment = augment
+        board_shape = (capacity, board_size, board_size)
+        self.states = self._allocate('states', board_shape, np.uint8)
+        self.actions = self._allocate('actions', (capacity,), np.int16)
+        self.rewards = self._allocate('rewards', (capacity,), np.float32)
+        self.next_states = self._allocate('next_states', board_shape, np.uint8)
+        self.dones = self._allocate('dones', (capacity,), bool)
+        self.position = 0
+        self.size = 0
+
+    def _allocate(self, name, shape, dtype):
+        """Storage for one column; subclasses may place it elsewhere."""
+        return np.zeros(shape, dtype=dtype)
 
     def push(self, state, action, reward, next_state, done):
-        self.memory.append((state, action, reward, next_state, done))
+        """Store one transition; returns the slot it was written to."""
+        if self.augment == 'push':
+            return self.push_batch(np.asarray(state)[None], [action], [reward], np.asarray(next_state)[None], [done])
+        index = self.position
+        self.states[index] = state
+        self.actions[index] = action
+        self.rewards[index] = reward
+        self.next_states[index] = next_state
+        self.dones[index] = done
+        self.position = (index + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        return index
+
+    def push_batch(self, states, actions, rewards, next_states, dones):
+        """Store a batch of transitions given as arrays; returns their slots."""
+        if self.augment == 'push':
+            states, actions, rewards, next_states, dones = symmetric_copies(
+                states, actions, rewards, next_states, dones)
+        indices = (self.position + np.arange(len(actions))) % self.capacity
+        self.states[indices] = states
+        self.actions[indices] = actions
+        self.rewards[indices] = rewards
+        self.next_states[indices] = next_states
+        self.dones[indices] = dones
+        self.position = (self.position + len(actions)) % self.capacity
+        self.size = min(self.size + len(actions), self.capacity)
+        return indices
 
     def sample(self, batch_size):
-        return random.sample(self.memory, batch_size)
+        return self.gather(np.random.randint(0, self.size, size=batch_size))
+
+    def gather(self, indices):
+        """(states, actions, rewards, next_states, dones) arrays for the given slots."""
+        batch = (self.states[indices].astype(np.float32),
+                 self.actions[indices].astype(np.int64),
+                 self.rewards[indices],
+                 self.next_states[indices].astype(np.float32),
+                 self.dones[indices].astype(np.float32))
+        if self.augment == 'sample':
+            batch = augment_batch(batch)
+        return batch
+
+    COLUMNS = ('states', 'actions', 'rewards', 'next_states', 'dones')
+
+    def state_dict(self):
+        """Copy of the stored experiences, for checkpoints."""
+        state = {name: getattr(self, name)[:self.size].copy() for name in self.COLUMNS}
+        state.update(position=self.position, size=self.size)
+        return state
+
+    def load_state_dict(self, state):
+        for name in self.COLUMNS:
+            getattr(self, name)[:state['size']] = state[name]
+        self.position = state['position']
+        self.size = state['size']
+
+    def flush(self):
+        """Persist the buffer, for backends that have somewhere to persist it."""
+
+    @property
+    def nbytes(self):
+        """Bytes allocated for the stored columns (on disk for the memmap backend)."""
+        return sum(getattr(self, name).nbytes for name in self.COLUMNS)
 
     def __len__(self):
-        return len(self.memory)
+        return self.size
+
+
+class MemmapReplayBuffer(ReplayBuffer):
+    """
+    ReplayBuffer whose columns are memory-mapped .npy files in `directory`.
+
+    Only the pages holding sampled rows are read, so the capacity is bounded
+    by disk rather than RAM. flush() records the write position next to the
+    data; opening the same directory again resumes from the stored
+    experiences (warm start). Opening it with a different capacity or board
+    size raises ValueError rather than overwriting them.
+
+    state_dict() flushes, so the files on disk match the position it returns.
+    Resuming from it is exact until the ring wraps: rows pushed after the
+    snapshot overwrite the oldest experiences in place.
+    """
+
+    META_FILE = 'meta.json'
+
+    def __init__(self, capacity, board_size=BOARD_SIZE, directory=REPLAY_DIR, augment=None):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        meta = self._read_meta()
+        if meta is not None and (meta['capacity'], meta['board_size']) != (capacity, board_size):
+            raise ValueError(
+                f"{directory} holds a replay buffer of capacity {meta['capacity']} and board size "
+                f"{meta['board_size']}, not {capacity} and {board_size}; open it with those or delete it to start over")
+        self.resumed = meta is not None
+        super(MemmapReplayBuffer, self).__init__(capacity, board_size, augment)
+        if self.resumed:
+            self.position = meta['position']
+            self.size = meta['size']
+
+    def _allocate(self, name, shape, dtype):
+        path = os.path.join(self.directory, name + '.npy')
+        if self.resumed:
+            return np.lib.format.open_memmap(path, mode='r+')
+        return np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=shape)
+
+    def _read_meta(self):
+        path = os.path.join(self.directory, self.META_FILE)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def state_dict(self):
+        # The experiences already live on disk; checkpoints only record how far they go
+        self.flush()
+        return {'position': self.position, 'size': self.size}
+
+    def load_state_dict(self, state):
+        self.position = state['position']
+        self.size = state['size']
+
+    def sample(self, batch_size):
+        # Sorted indices read the file front to back
+        indices = np.sort(np.random.randint(0, self.size, size=batch_size))
+        return self.gather(indices)
+
+    def flush(self):
+        for name in self.COLUMNS:
+            getattr(self, name).flush()
+        meta = {'capacity': self.capacity, 'board_size': self.board_size,
+                'position': self.position, 'size': self.size}
+        path = os.path.join(self.directory, self.META_FILE)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(meta, f)
+        os.replace(path + '.tmp', path)
+
+
+class SumTree:
+    """
+    Binary sum-tree over `capacity` priorities, stored in one flat NumPy array.
+
+    Node i has children 2i and 2i + 1, the root is node 1 and the leaves
+    start at `self.leaf_offset`. Updates and lookups are vectorized over a
+    whole batch and cost O(log n) per element.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.leaf_offset = 1 << max(capacity - 1, 1).bit_length()
+        self.depth = self.leaf_offset.bit_length() - 1
+        self.tree = np.zeros(2 * self.leaf_offset, dtype=np.float64)
+
+    def total(self):
+        return self.tree[1]
+
+    def priorities(self, indices):
+        return self.tree[np.asarray(indices) + self.leaf_offset]
+
+    def update(self, indices, priorities):
+        nodes = np.asarray(indices, dtype=np.int64) + self.leaf_offset
+        self.tree[nodes] = priorities
+        for _ in range(self.depth):
+            nodes = np.unique(nodes // 2)
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+
+    def find(self, values):
+        """Leaf indices whose cumulative priority range contains each value."""
+        values = np.array(values, dtype=np.float64)
+        nodes = np.ones(len(values), dtype=np.int64)
+        for _ in range(self.depth):
+            left = 2 * nodes
+            left_sums = self.tree[left]
+            go_right = values >= left_sums
+            values -= np.where(go_right, left_sums, 0.0)
+            nodes = left + go_right
+        return nodes - self.leaf_offset
+
+
+class PrioritizedReplayBuffer(ReplayBuffer):
+    """
+    Proportional prioritized replay (Schaul et al., 2016) backed by a SumTree.
+
+    sample() returns (batch, indices, weights); pass the TD errors returned
+    by train_batch back through update_priorities(indices, td_errors).
+    """
+
+    def __init__(self, capacity, board_size=BOARD_SIZE, augment=None, alpha=PER_ALPHA, beta=PER_BETA_START,
+                 beta_increment=PER_BETA_INCREMENT, epsilon=PER_EPSILON):
+        super(PrioritizedReplayBuffer, self).__init__(capacity, board_size, augment)
+        self.alpha = alpha
+        self.beta = beta
+        self.beta_increment = beta_increment
+        self.epsilon = epsilon
+        self.tree = SumTree(capacity)
+        self.max_priority = 1.0
+
+    def push(self, state, action, reward, next_state, done):
+        index = super(PrioritizedReplayBuffer, self).push(state, action, reward, next_state, done)
+        # New experiences get the highest priority seen so far, so each is replayed at least once
+        self.tree.update(np.atleast_1d(index), self.max_priority ** self.alpha)
+        return index
+
+    def push_batch(self, states, actions, rewards, next_states, dones):
+        indices = super(PrioritizedReplayBuffer, self).push_batch(states, actions, rewards, next_states, dones)
+        self.tree.update(indices, np.full(len(indices), self.max_priority ** self.alpha))
+        return indices
+
+    def sample(self, batch_size):
+        total = self.tree.total()
+        # One draw from each of batch_size equal slices of the priority mass
+        values = (np.arange(batch_size) + np.random.rand(batch_size)) * (total / batch_size)
+        indices = np.minimum(self.tree.find(values), self.size - 1)
+
+        probabilities = self.tree.priorities(indices) / total
+        weights = (self.size * probabilities) ** -self.beta
+        weights = (weights / weights.max()).astype(np.float32)
+        self.beta = min(1.0, self.beta + self.beta_increment)
+
+        return self.gather(indices), indices, weights
+
+    def state_dict(self):
+        state = super(PrioritizedReplayBuffer, self).state_dict()
+        state.update(tree=self.tree.tree.copy(), max_priority=self.max_priority, beta=self.beta)
+        return state
+
+    @property
+    def nbytes(self):
+        return super(PrioritizedReplayBuffer, self).nbytes + self.tree.tree.nbytes
+
+    def load_state_dict(self, state):
+        super(PrioritizedReplayBuffer, self).load_state_dict(state)
+        self.tree.tree[:] = state['tree']
+        self.max_priority = state['max_priority']
+        self.beta = state['beta']
+
+    def update_priorities(self, indices, td_errors):
+        priorities = np.abs(td_errors) + self.epsilon
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+        self.tree.update(indices, priorities ** self.alpha)
+
+
+def make_replay_buffer(capacity=None, prioritized=PRIORITIZED_REPLAY, backend=REPLAY_BACKEND,
+                       augment=AUGMENT_SYMMETRIES):
+    """
+    Create the replay buffer selected in the config. capacity defaults to
+    REPLAY_DISK_SIZE for the memmap backend and MEMORY_SIZE otherwise.
+    """
+    if backend == 'memmap':
+        if prioritized:
+            raise ValueError("Prioritized replay is not available with the memmap backend")
+        return MemmapReplayBuffer(REPLAY_DISK_SIZE if capacity is None else capacity, augment=augment)
+    if backend != 'memory':
+        raise ValueError(f"Unknown replay backend: {backend!r}")
+    if capacity is None:
+        capacity = MEMORY_SIZE
+    if prioritized:
+        return PrioritizedReplayBuffer(capacity, augment=augment)
+    return ReplayBuffer(capacity, augment=augment)
@@ -3,24 +3,42 @@ import torch
 import torch.nn as nn
 import torch.optim as optim
 import numpy as np
-from game.game_env import SOSGameEnv
+from game.vector_env import SOSVectorEnv
 from models.dq_network import DQNetworkCNN
-from training.replay_buffer import ReplayBuffer
+from training.checkpoint import (CheckpointWriter, capture_training_state, clone_state_dict, load_checkpoint,
+                                 restore_training_state)
+from training.evaluation import BackgroundEvaluator, EarlyStopping, format_results
+from training.metrics import NULL_TIMER, IterationProfiler, MetricsLogger
+from training.policy import masked_random, select_actions
+from training.replay_buffer import PrioritizedReplayBuffer, make_replay_buffer
 from config.game_config import *
 
-import random
 
+def train(resume=False, checkpoint_path=CHECKPOINT_PATH, profile=PROFILE_MODE):
+    """
+    Train the DQN agent with NUM_ENVS games played in lockstep.
 
-def train():
-    # Initialize the game environment
-    env = SOSGameEnv()
+    A checkpoint is handed to a background writer every CHECKPOINT_EVERY
+    episodes and at the end; with resume=True training continues from the
+    checkpoint at checkpoint_path if there is one.
+
+    Time spent per phase and the step/update rates are appended to
+    METRICS_PATH every METRICS_INTERVAL seconds; profile ('torch' or
+    'cprofile') additionally profiles PROFILE_ITERATIONS iterations.
+
+    Every EVAL_EVERY episodes the policy weights are handed to a background
+    evaluation process; training stops early once the win rate against
+    EARLY_STOP_OPPONENT has not improved for EARLY_STOP_PATIENCE evaluations.
+    """
+    # Initialize the vectorized game environment
+    env = SOSVectorEnv(NUM_ENVS)
 
     # Action space size
-    action_size = env.board_size * env.board_size * 2  # Positions * Letters ('S' or 'O')
+    action_size = env.action_size  # Positions * Letters ('S' or 'O')
 
     # Initialize the networks
-    policy_net = DQNetworkCNN(action_size)
-    target_net = DQNetworkCNN(action_size)
+    policy_net = DQNetworkCNN(action_size, env.board_size)
+    target_net = DQNetworkCNN(action_size, env.board_size)
     target_net.load_state_dict(policy_net.state_dict())
     target_net.eval()
 
@@ -29,62 +47,115 @@ def train():
     criterion = nn.MSELoss()
 
     # Replay buffer
-    replay_buffer = ReplayBuffer(MEMORY_SIZE)
+    replay_buffer = make_replay_buffer()
 
     # Epsilon-greedy strategy
     epsilon = EPSILON_START
 
-    # Training loop
-    for episode in range(NUM_EPISODES):
-        state = env.reset()  # Reset the environment
-        total_reward = 0
-
-        for t in range(MAX_STEPS):
-            # Select action using epsilon-greedy strategy
-            if np.random.rand() <= epsilon:
-                action_index = random_action(env)
-            else:
-                state_tensor = torch.FloatTensor(state).unsqueeze(0)
-                with torch.no_grad():
-                    q_values = policy_net(state_tensor)
-                valid_actions = env.available_actions()
-                if valid_actions:
-                    valid_action_indices = [encode_action(a, env.board_size) for a in valid_actions]
-                    q_values_valid = q_values[0, valid_action_indices]
-                    max_q_index = torch.argmax(q_values_valid).item()
-                    action_index = valid_action_indices[max_q_index]
-                else:
-                    break  # No valid actions available
-
-            # Decode action and execute
-            row, col, letter = decode_action(action_index, env.board_size)
-            next_state, reward, done, info = env.step((row, col, letter))
-            total_reward += reward
-
-            # Store experience in replay buffer
-            replay_buffer.push(state, action_index, reward, next_state, done)
-            state = next_state
-
-            # Train the network if enough experiences are in the buffer
-            if len(replay_buffer) >= BATCH_SIZE:
-                batch = replay_buffer.sample(BATCH_SIZE)
-                train_batch(policy_net, target_net, optimizer, criterion, batch)
-
-            if done:
+    states = env.reset()
+    episode_rewards = np.zeros(NUM_ENVS)
+    episode = 0
+    early_stopping = EarlyStopping(EARLY_STOP_PATIENCE, EARLY_STOP_MIN_DELTA)
+
+    if resume and os.path.exists(checkpoint_path):
+        checkpoint = load_checkpoint(checkpoint_path)
+        restore_training_state(checkpoint, policy_net, target_net, optimizer, env, replay_buffer, early_stopping)
+        epsilon = checkpoint['epsilon']
+        episode = checkpoint['episode']
+        episode_rewards = checkpoint['episode_rewards']
+        states = env.get_state()
+        print(f"Resumed from {checkpoint_path} at episode {episode}")
+
+    def snapshot():
+        return capture_training_state(policy_net, target_net, optimizer, env, replay_buffer, epsilon,
+                                      episode, episode_rewards, early_stopping, include_replay=CHECKPOINT_REPLAY)
+
+    checkpoint_writer = CheckpointWriter(checkpoint_path)
+    last_checkpoint = episode
+
+    metrics = MetricsLogger(METRICS_PATH, METRICS_INTERVAL)
+    timer = metrics.timer
+    profiler = IterationProfiler(profile, PROFILE_START, PROFILE_ITERATIONS, PROFILE_DIR)
+    steps = updates = 0
+
+    evaluator = BackgroundEvaluator(EVAL_PATH, env.board_size, EVAL_GAMES, EVAL_OPPONENTS, EVAL_SEED)
+    stop = False
+
+    def log_evaluations(finished):
+        nonlocal stop
+        for evaluated_episode, results in finished:
+            print(f"Evaluation at episode {evaluated_episode}: {format_results(results)}")
+            if EARLY_STOP_OPPONENT in results and early_stopping.update(results[EARLY_STOP_OPPONENT]['win_rate']):
+                stop = True
+
+    # Training loop: every iteration advances all NUM_ENVS games by one move
+    while episode < NUM_EPISODES and not stop:
+        # Select actions for all games with a single forward pass
+        with timer.phase('action_selection'):
+            actions = select_actions(policy_net, states, env.legal_action_mask(), epsilon).numpy()
+        with timer.phase('env_step'):
+            next_states, rewards, dones, info = env.step(actions)
+        episode_rewards += rewards
+        steps += NUM_ENVS
+
+        # Store experiences in replay buffer (finished games report their final board)
+        with timer.phase('replay_push'):
+            replay_buffer.push_batch(states, actions, rewards, info['final_state'], dones)
+        states = next_states
+
+        # Train the network if enough experiences are in the buffer
+        if len(replay_buffer) >= BATCH_SIZE:
+            learn_from_replay(policy_net, target_net, optimizer, criterion, replay_buffer, timer)
+            updates += 1
+
+        for i in np.flatnonzero(dones):
+            episode += 1
+
+            # Update epsilon
+            epsilon = max(EPSILON_MIN, epsilon * EPSILON_DECAY)
+
+            # Update the target network periodically
+            if episode % TARGET_UPDATE_FREQ == 0:
+                with timer.phase('target_sync'):
+                    target_net.load_state_dict(policy_net.state_dict())
+
+            # Hand the current weights to the evaluation process. The previous evaluation is
+            # applied first, so early stopping does not depend on how fast the evaluator runs.
+            if EVAL_EVERY > 0 and episode % EVAL_EVERY == 0:
+                log_evaluations(evaluator.wait())
+                evaluator.submit(episode, clone_state_dict(policy_net))
+
+            # Logging
+            print(f"Episode {episode}/{NUM_EPISODES}, Total Reward: {episode_rewards[i]:.1f}, Epsilon: {epsilon:.4f}")
+            episode_rewards[i] = 0
+            if episode >= NUM_EPISODES:
                 break
 
-        # Update epsilon
-        epsilon = max(EPSILON_MIN, epsilon * EPSILON_DECAY)
-
-        # Update the target network periodically
-        if (episode + 1) % TARGET_UPDATE_FREQ == 0:
-            target_net.load_state_dict(policy_net.state_dict())
-
-        # Logging
-        print(f"Episode {episode + 1}/{NUM_EPISODES}, Total Reward: {total_reward}, Epsilon: {epsilon:.4f}")
-
+        metrics.maybe_log(episode, steps, updates, replay_buffer)
+        profiler.step()
+
+        # Checkpoint between moves, never in the middle of one
+        if episode - last_checkpoint >= CHECKPOINT_EVERY:
+            log_evaluations(evaluator.wait())  # The checkpoint's early-stopping state covers every submission
+            checkpoint_writer.save(snapshot())
+            last_checkpoint = episode
+
+    if stop:
+        print(f"Stopping early at episode {episode}: no win-rate gain against {EARLY_STOP_OPPONENT} "
+              f"in {early_stopping.patience} evaluations (best {early_stopping.best:.1%})")
+    log_evaluations(evaluator.close())
+    profiler.close()
+    metrics.maybe_log(episode, steps, updates, replay_buffer, force=True)
+    metrics.close()
+    checkpoint_writer.save(snapshot())
+    checkpoint_writer.close()
+    replay_buffer.flush()
+    save_model(policy_net)
+
+
+def save_model(policy_net, model_dir='outputs/models'):
+    """Save the trained policy weights to model_dir/sos_dqn.pth."""
     # Ensure the output directory exists
-    model_dir = 'outputs/models'
     os.makedirs(model_dir, exist_ok=True)
 
     # Save the trained model
@@ -94,9 +165,7 @@ def train():
 
 def random_action(env):
     """Select a random valid action from the environment."""
-    actions = env.available_actions()
-    action = random.choice(actions)
-    return encode_action(action, env.board_size)
+    return masked_random(torch.from_numpy(env.legal_mask).unsqueeze(0)).item()
 
 
 def encode_action(action, board_size):
@@ -117,16 +186,39 @@ def decode_action(action_index, board_size):
     return row, col, letter
 
 
-def train_batch(policy_net, target_net, optimizer, criterion, batch):
-    """Train the policy network using a batch of experiences."""
-    states, actions, rewards, next_states, dones = zip(*batch)
-
-    # Convert lists of NumPy arrays to tensors
-    states = torch.FloatTensor(np.array(states))
-    actions = torch.LongTensor(actions).unsqueeze(1)
-    rewards = torch.FloatTensor(rewards).unsqueeze(1)
-    next_states = torch.FloatTensor(np.array(next_states))
-    dones = torch.FloatTensor(dones).unsqueeze(1)
+def learn_from_replay(policy_net, target_net, optimizer, criterion, replay_buffer, timer=NULL_TIMER):
+    """Sample a batch, take one optimization step and refresh priorities if the buffer keeps them."""
+    if isinstance(replay_buffer, PrioritizedReplayBuffer):
+        with timer.phase('replay_sample'):
+            batch, indices, weights = replay_buffer.sample(BATCH_SIZE)
+        with timer.phase('train_batch'):
+            td_errors = train_batch(policy_net, target_net, optimizer, criterion, batch, weights)
+        with timer.phase('replay_update'):
+            replay_buffer.update_priorities(indices, td_errors)
+    else:
+        with timer.phase('replay_sample'):
+            batch = replay_buffer.sample(BATCH_SIZE)
+        with timer.phase('train_batch'):
+            train_batch(policy_net, target_net, optimizer, criterion, batch)
+
+
+def train_batch(policy_net, target_net, optimizer, criterion, batch, weights=None):
+    """
+    Train the policy network using a batch of experiences, given as the
+    (states, actions, rewards, next_states, dones) arrays from ReplayBuffer.sample.
+
+    With importance-sampling weights (prioritized replay) the squared TD
+    errors are weighted per sample instead of going through criterion.
+    Returns the TD errors of the batch as a NumPy array.
+    """
+    states, actions, rewards, next_states, dones = batch
+
+    # Wrap the contiguous batch arrays from the replay buffer as tensors (no copy)
+    states = torch.from_numpy(states)
+    actions = torch.from_numpy(actions).unsqueeze(1)
+    rewards = torch.from_numpy(rewards).unsqueeze(1)
+    next_states = torch.from_numpy(next_states)
+    dones = torch.from_numpy(dones).unsqueeze(1)
 
     # Compute Q-values for the current states and selected actions
     q_values = policy_net(states).gather(1, actions)
@@ -137,13 +229,36 @@ def train_batch(policy_net, target_net, optimizer, criterion, batch):
         target_q_values = rewards + (GAMMA * max_next_q_values * (1 - dones))
 
     # Compute loss
-    loss = criterion(q_values, target_q_values)
+    td_errors = target_q_values - q_values
+    if weights is None:
+        loss = criterion(q_values, target_q_values)
+    else:
+        loss = (torch.from_numpy(weights).unsqueeze(1) * td_errors ** 2).mean()
 
     # Backpropagation and optimization
     optimizer.zero_grad()
     loss.backward()
     optimizer.step()
 
+    return td_errors.detach().squeeze(1).numpy()
+
 
 if __name__ == '__main__':
-    train()
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Train the SOS DQN agent.')
+    parser.add_argument('--actors', type=int, default=NUM_ACTORS,
+                        help='Number of self-play worker processes (0 trains in a single process)')
+    parser.add_argument('--resume', action='store_true',
+                        help=f'Continue from the last checkpoint in {CHECKPOINT_PATH}')
+    parser.add_argument('--profile', choices=('torch', 'cprofile'), default=PROFILE_MODE,
+                        help=f'Profile {PROFILE_ITERATIONS} training iterations into {PROFILE_DIR}')
+    args = parser.parse_args()
+
+    if args.actors > 0:
+        if args.resume or args.profile:
+            parser.error('--resume and --profile are only supported in single-process training')
+        from training.actors import train_with_actors
+        train_with_actors(args.actors)
+    else:
+        train(resume=args.resume, profile=args.profile)
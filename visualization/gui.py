@@ -1,14 +1,15 @@
 import tkinter as tk
 from tkinter import simpledialog  # Import simpledialog explicitly
 
-from models.dq_network import DQNetworkCNN
+from models.export import load_inference_model
+from models.inference_server import InferenceClient
 from game.game_env import SOSGameEnv
-from training.train import decode_action, encode_action
-import torch
+from training.policy import select_actions
+from training.train import decode_action
 
 
 class SOSGameGUI:
-    def __init__(self, root):
+    def __init__(self, root, client=None):
         self.root = root
         self.root.title("SOS Game")
 
@@ -16,11 +17,11 @@ class SOSGameGUI:
         self.env = SOSGameEnv()
         self.board_size = self.env.board_size
 
-        # Load the trained agent
-        action_size = self.board_size * self.board_size * 2
-        self.policy_net = DQNetworkCNN(action_size)
-        self.policy_net.load_state_dict(torch.load('../training/outputs/models/sos_dqn.pth'))
-        self.policy_net.eval()
+        # Load the trained agent, unless moves come from a shared inference server
+        # (an exported .pt artifact from models/export.py is loaded the same way)
+        self.client = client
+        if client is None:
+            self.policy_net = load_inference_model('../training/outputs/models/sos_dqn.pth', self.board_size)
 
         # Create the game board (grid of buttons)
         self.buttons = [[None for _ in range(self.board_size)] for _ in range(self.board_size)]
@@ -81,20 +82,15 @@ class SOSGameGUI:
 
     def agent_move(self):
         """Handle the agent's move."""
-        state_tensor = torch.FloatTensor(self.env.get_state()).unsqueeze(0)
-        with torch.no_grad():
-            q_values = self.policy_net(state_tensor)
-
         # Determine valid actions
-        valid_actions = self.env.available_actions()
-        if not valid_actions:
+        if not self.env.legal_mask.any():
             self.end_game()
             return
 
-        valid_action_indices = [encode_action(a, self.board_size) for a in valid_actions]
-        q_values_valid = q_values[0, valid_action_indices]
-        max_q_index = torch.argmax(q_values_valid).item()
-        action_index = valid_action_indices[max_q_index]
+        if self.client is not None:
+            action_index = self.client.best_action(self.env.observation, self.env.legal_mask)
+        else:
+            action_index = select_actions(self.policy_net, self.env.observation[None], self.env.legal_mask[None]).item()
         row, col, letter = decode_action(action_index, self.board_size)
 
         # Perform the agent's move
@@ -122,6 +118,18 @@ class SOSGameGUI:
 
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Play SOS against the trained agent.')
+    parser.add_argument('--server', metavar='HOST:PORT',
+                        help='Get agent moves from a running models.inference_server')
+    args = parser.parse_args()
+
+    client = None
+    if args.server:
+        host, port = args.server.rsplit(':', 1)
+        client = InferenceClient(host, int(port))
+
     root = tk.Tk()
-    app = SOSGameGUI(root)
+    app = SOSGameGUI(root, client)
     root.mainloop()